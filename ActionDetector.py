@@ -0,0 +1,120 @@
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+
+
+class ActionDetector:
+    """Détection temporelle des actions techniques sur un flux vidéo.
+
+    - un seul modèle d'arrière-plan MOG2, conservé d'une frame à l'autre, sur des frames réduites ;
+    - la vitesse des poignets (normalisée par la largeur d'épaules) est suivie frame à frame ;
+    - une action commence quand un poignet accélère au-delà de `speed_on` dans une zone de
+      mouvement (premier plan) et se termine quand sa vitesse retombe sous `speed_off` ou sous
+      `dip` x le pic de l'action (creux de vitesse entre deux gestes enchaînés) ;
+    - sans landmarks, les épisodes de mouvement du premier plan servent de repli.
+
+    `actions_per_minute` (fenêtre glissante) est l'indicateur de répétitivité.
+    """
+
+    def __init__(self, scale=0.25, history=500, var_threshold=16, speed_on=1.5, speed_off=0.6,
+                 dip=0.5, motion_on=0.02, motion_off=0.005, min_gap=0.25, window=60.0, alpha=0.5):
+        self.scale = scale
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(history=history, varThreshold=var_threshold,
+                                                                detectShadows=False)
+        self.speed_on = speed_on  # Largeurs d'épaules par seconde
+        self.speed_off = speed_off
+        self.dip = dip
+        self.motion_on = motion_on  # Fraction de pixels en mouvement autour du poignet
+        self.motion_off = motion_off
+        self.min_gap = min_gap  # Délai minimal (s) entre deux débuts d'action d'un même poignet
+        self.window = window
+        self.alpha = alpha  # Lissage de la vitesse
+        self.reset()
+
+    def reset(self):
+        self.total_actions = 0
+        self.action_times = deque()  # Débuts d'action dans la fenêtre glissante
+        self.previous = None  # (timestamp, positions des poignets normalisées)
+        self.speed = np.zeros(2, dtype=np.float32)
+        self.active = np.zeros(2, dtype=bool)  # Action en cours par poignet
+        self.peak = np.zeros(2, dtype=np.float32)  # Pic de vitesse de l'action en cours
+        self.last_start = np.full(2, -np.inf)
+        self.motion_active = False
+        self.started = None
+
+    def update(self, img, landmarks=None, timestamp=None):
+        """Traite une frame ; landmarks : LandmarkArray (ou None si aucune personne)"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        first = self.started is None
+        if first:
+            self.started = timestamp
+        small = cv2.resize(img, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        fg_mask = self.bg_subtractor.apply(small)
+        if first:
+            fg_mask[:] = 0  # La première frame initialise l'arrière-plan : MOG2 la marque entièrement en mouvement
+        moving = fg_mask > 200
+        motion = float(moving.mean())
+
+        new_actions = 0
+        if landmarks:
+            new_actions = self._update_wrists(landmarks, moving, timestamp)
+        else:
+            self.previous = None
+            self.speed[:] = 0
+            self.active[:] = False
+            # Repli sans squelette : un épisode de mouvement du premier plan = une action
+            if not self.motion_active and motion > self.motion_on:
+                self.motion_active = True
+                new_actions = 1
+            elif self.motion_active and motion < self.motion_off:
+                self.motion_active = False
+
+        for _ in range(new_actions):
+            self.action_times.append(timestamp)
+        self.total_actions += new_actions
+        while self.action_times and self.action_times[0] < timestamp - self.window:
+            self.action_times.popleft()
+
+        return {"actions": self.total_actions, "new_actions": new_actions,
+                "actions_per_minute": self.actionsPerMinute(timestamp), "motion": motion,
+                "wrist_speed": self.speed.tolist(), "fg_mask": fg_mask}
+
+    def _update_wrists(self, landmarks, moving, timestamp):
+        wrists = landmarks.xy[[LEFT_WRIST, RIGHT_WRIST]].copy()
+        shoulder_width = max(float(np.linalg.norm(landmarks.xy[LEFT_SHOULDER] - landmarks.xy[RIGHT_SHOULDER])), 1e-3)
+        if self.previous is None:
+            self.previous = (timestamp, wrists)
+            return 0
+        t0, previous = self.previous
+        dt = max(timestamp - t0, 1e-3)
+        raw = np.linalg.norm(wrists - previous, axis=1) / shoulder_width / dt
+        self.speed = self.speed + self.alpha * (raw - self.speed)
+        self.previous = (timestamp, wrists)
+
+        # Mouvement du premier plan dans un voisinage de chaque poignet (frame réduite)
+        h, w = moving.shape
+        radius = max(int(shoulder_width * w * 0.5), 2)
+        centers = (wrists * (w, h)).astype(int)
+        near_motion = np.array([moving[max(cy - radius, 0):cy + radius, max(cx - radius, 0):cx + radius].mean()
+                                if 0 <= cx < w and 0 <= cy < h else 0.0
+                                for cx, cy in centers])
+
+        starts = (~self.active & (self.speed > self.speed_on) & (near_motion > self.motion_on)
+                  & (timestamp - self.last_start >= self.min_gap))
+        self.active |= starts
+        self.peak = np.where(self.active, np.maximum(self.peak, self.speed), 0)
+        self.active &= (self.speed > self.speed_off) & (self.speed > self.dip * self.peak)
+        self.last_start[starts] = timestamp
+        return int(starts.sum())
+
+    def actionsPerMinute(self, timestamp=None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        elapsed = min(timestamp - self.started, self.window) if self.started is not None else 0
+        if elapsed <= 0:
+            return 0.0
+        return len(self.action_times) * 60.0 / max(elapsed, 1.0)
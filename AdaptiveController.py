@@ -0,0 +1,165 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from Metrics import get_logger
+
+log = get_logger("AdaptiveController")
+
+
+def build_levels(min_complexity=0, max_complexity=2):
+    """Échelle de qualité, du plus économique au plus complet.
+
+    pose_every / hands_every / face_every : le modèle tourne une frame sur N (0 = jamais).
+    """
+    levels = [{"complexity": min_complexity, "pose_every": 3, "hands_every": 3, "face_every": 0},
+              {"complexity": min_complexity, "pose_every": 2, "hands_every": 2, "face_every": 10}]
+    for complexity in range(min_complexity, max_complexity + 1):
+        levels.append({"complexity": complexity, "pose_every": 1, "hands_every": 2, "face_every": 5})
+        levels.append({"complexity": complexity, "pose_every": 1, "hands_every": 1, "face_every": 1})
+    return levels
+
+
+class AdaptiveController:
+    """Choisit à chaque frame quels modèles exécuter pour tenir un budget de temps.
+
+    Les temps de chaque étape (pose par complexité, visage, mains) sont mesurés et lissés.
+    Le niveau de qualité ne descend que si le coût estimé dépasse le budget pendant `hold_frames`
+    frames, et ne remonte que s'il reste sous `upgrade_margin` x budget pendant autant de frames :
+    cette hystérésis empêche les oscillations. Des échecs de détection répétés font monter la
+    complexité (sans jamais revenir à 0 comme l'ancien updateComplexityOnDetection).
+    Les frames sans inférence de pose (réutilisée ou extrapolée) ne comptent ni comme réussite
+    ni comme échec ; l'extrapolation s'arrête `max_extrapolation` secondes après la dernière
+    détection réelle.
+    """
+
+    def __init__(self, target_fps=15, budget_ms=None, min_complexity=0, max_complexity=2, complexity=None,
+                 upgrade_margin=0.7, hold_frames=15, failure_threshold=3, alpha=0.2, max_extrapolation=0.5):
+        self.budget_ms = budget_ms if budget_ms is not None else 1000.0 / target_fps
+        self.levels = build_levels(min_complexity, max_complexity)
+        # On démarre au niveau le plus complet (pour la complexité demandée, si elle est fournie)
+        self.level = max(i for i, config in enumerate(self.levels)
+                         if complexity is None or config["complexity"] == complexity)
+        self.upgrade_margin = upgrade_margin
+        self.hold_frames = hold_frames
+        self.failure_threshold = failure_threshold
+        self.alpha = alpha  # Coefficient de lissage exponentiel des temps mesurés
+        self.max_extrapolation = max_extrapolation
+        self.timings = {}  # étape -> temps moyen (ms)
+        self.frame_index = 0
+        self.over_budget = 0  # Frames consécutives au-dessus du budget
+        self.under_budget = 0  # Frames consécutives nettement sous le budget
+        self.failures = 0
+        self.history = []  # Deux dernières poses observées : [(timestamp, tableau (33, 4))]
+
+    @property
+    def complexity(self):
+        return self.levels[self.level]["complexity"]
+
+    @contextmanager
+    def timer(self, stage):
+        """Mesure la durée d'une étape : with controller.timer("hands"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def record(self, stage, elapsed_ms):
+        previous = self.timings.get(stage)
+        self.timings[stage] = elapsed_ms if previous is None else previous + self.alpha * (elapsed_ms - previous)
+
+    def estimate(self, level):
+        """Coût moyen estimé par frame (ms) pour un niveau de qualité"""
+        config = self.levels[level]
+        cost = self.timings.get(f"pose_{config['complexity']}", self.timings.get("pose", 0.0)) / config["pose_every"]
+        for stage in ("hands", "face"):
+            every = config[f"{stage}_every"]
+            if every:
+                cost += self.timings.get(stage, 0.0) / every
+        return cost
+
+    def plan(self):
+        """Décision pour la frame courante.
+
+        pose : "run", "interpolate" (extrapolation des deux dernières poses) ou "reuse"
+        """
+        config = self.levels[self.level]
+        i = self.frame_index
+        self.frame_index += 1
+        if i % config["pose_every"] == 0:
+            pose = "run"
+        else:
+            pose = "interpolate" if len(self.history) == 2 else "reuse"
+        return {
+            "pose": pose,
+            "complexity": config["complexity"],
+            "hands": bool(config["hands_every"]) and i % config["hands_every"] == 0,
+            "face": bool(config["face_every"]) and i % config["face_every"] == 0,
+        }
+
+    def report(self, detection_success, frame_ms=None):
+        """Retour d'information après une frame : ajuste le niveau avec hystérésis.
+
+        detection_success=None : la pose n'a pas tourné sur cette frame (compteur d'échecs inchangé).
+        """
+        if detection_success:
+            self.failures = 0
+        elif detection_success is not None:
+            self.failures += 1
+
+        cost = frame_ms if frame_ms is not None else self.estimate(self.level)
+        if cost > self.budget_ms:
+            self.over_budget += 1
+            self.under_budget = 0
+        elif self.level + 1 < len(self.levels) and self.estimate(self.level + 1) < self.budget_ms * self.upgrade_margin:
+            self.under_budget += 1
+            self.over_budget = 0
+        else:
+            self.over_budget = self.under_budget = 0
+
+        if self.over_budget >= self.hold_frames and self.level > 0:
+            self.setLevel(self.level - 1)
+        elif self.under_budget >= self.hold_frames:
+            self.setLevel(self.level + 1)
+        elif self.failures >= self.failure_threshold:
+            # Personne non trouvée : monter d'un cran de complexité si le budget le permet
+            higher = [i for i, config in enumerate(self.levels)
+                      if config["complexity"] > self.complexity and self.estimate(i) <= self.budget_ms]
+            if higher:
+                self.setLevel(higher[0])
+            self.failures = 0
+        return self.complexity
+
+    def setLevel(self, level):
+        if level != self.level:
+            log.info("Niveau de qualité %d -> %d (%s), coût estimé %.1f ms pour un budget de %.1f ms",
+                     self.level, level, self.levels[level], self.estimate(level), self.budget_ms)
+        self.level = level
+        self.over_budget = self.under_budget = 0
+
+    def observe(self, landmarks, timestamp=None):
+        """Mémorise une pose réellement calculée (tableau (33, 4)) pour l'interpolation"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self.history = (self.history + [(timestamp, np.array(landmarks, dtype=np.float32))])[-2:]
+
+    def forget(self):
+        """Personne perdue : plus aucune pose à extrapoler"""
+        self.history = []
+
+    def predict(self, timestamp=None):
+        """Pose estimée pour une frame sautée : extrapolation linéaire des deux dernières poses.
+
+        None si aucune pose récente (dernière détection réelle plus vieille que max_extrapolation).
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if not self.history or timestamp - self.history[-1][0] > self.max_extrapolation:
+            return None
+        if len(self.history) == 1:
+            return self.history[-1][1].copy()
+        (t0, p0), (t1, p1) = self.history
+        ratio = (timestamp - t1) / max(t1 - t0, 1e-6)
+        predicted = p1.copy()
+        predicted[:, :3] += (p1[:, :3] - p0[:, :3]) * min(ratio, 1.0)  # Extrapolation bornée à un intervalle
+        return predicted
@@ -0,0 +1,74 @@
+import numpy as np
+
+from Landmarks import landmarks as LANDMARK_TRIPLETS
+
+
+def angle_between(a, b, c, use_z=False):
+    """Angle (en degrés, entre 0 et 180) au sommet b formé par les points a, b et c.
+
+    Les points peuvent être des tableaux (..., D) : le calcul est vectorisé.
+    C'est la convention unique utilisée par tout le module (angle intérieur de l'articulation).
+    """
+    dims = 3 if use_z else 2
+    a = np.asarray(a, dtype=np.float32)[..., :dims]
+    b = np.asarray(b, dtype=np.float32)[..., :dims]
+    c = np.asarray(c, dtype=np.float32)[..., :dims]
+    return _interior_angle(a - b, c - b)
+
+
+def _interior_angle(v1, v2):
+    dot = np.sum(v1 * v2, axis=-1)
+    if v1.shape[-1] == 2:
+        cross = np.abs(v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0])
+    else:
+        cross = np.linalg.norm(np.cross(v1, v2), axis=-1)
+    # atan2(|v1 x v2|, v1 . v2) reste précis même pour des angles proches de 0 ou 180
+    return np.degrees(np.arctan2(cross, dot))
+
+
+class AngleEngine:
+    """Calcule tous les angles articulaires de `Landmarks.py` en un seul appel NumPy.
+
+    La table des triplets est compilée une seule fois en tableau d'indices (K, 3).
+    `compute` accepte une frame (33, D) ou un lot de frames (N, 33, D).
+    """
+
+    def __init__(self, triplets=None, use_z=False):
+        triplets = LANDMARK_TRIPLETS if triplets is None else triplets
+        self.names = list(triplets)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.triplets = np.array([triplets[name] for name in self.names], dtype=np.intp)  # (K, 3)
+        self.use_z = use_z
+
+    def compute(self, points, scale=None, visibility=None, min_visibility=None):
+        """Retourne les angles (..., K) en degrés pour des points (..., 33, D).
+
+        scale : facteurs (w, h[, w]) pour passer des coordonnées normalisées aux pixels,
+                sans quoi les angles seraient déformés par le rapport largeur/hauteur.
+        visibility / min_visibility : les angles dont un des points est peu visible valent NaN.
+        """
+        dims = 3 if self.use_z else 2
+        points = np.asarray(points, dtype=np.float32)[..., :dims]
+        if scale is not None:
+            points = points * np.asarray(scale, dtype=np.float32)[:dims]
+        joints = points[..., self.triplets, :]  # (..., K, 3, D) : une seule indexation
+        angles = _interior_angle(joints[..., 0, :] - joints[..., 1, :],
+                                 joints[..., 2, :] - joints[..., 1, :])
+        if visibility is not None and min_visibility is not None:
+            hidden = (np.asarray(visibility)[..., self.triplets] < min_visibility).any(axis=-1)
+            angles = np.where(hidden, np.nan, angles)
+        return angles
+
+    def computeLandmarks(self, landmarks, img_shape=None, min_visibility=None):
+        """Angles d'une frame à partir d'un LandmarkArray"""
+        if img_shape is None:
+            scale = None
+        else:
+            h, w = img_shape[:2]
+            scale = (w, h, w)  # z Mediapipe est à la même échelle que x
+        return self.compute(landmarks.xyz, scale=scale,
+                            visibility=landmarks.visibility, min_visibility=min_visibility)
+
+    def asDict(self, angles):
+        """Convertit un vecteur d'angles (K,) en dictionnaire nom -> angle"""
+        return dict(zip(self.names, np.asarray(angles).tolist()))
@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+
+def contour_boxes(contours):
+    """Boîtes englobantes (n, 4) au format x0, y0, x1, y1"""
+    if not len(contours):
+        return np.zeros((0, 4), dtype=np.int64)
+    boxes = np.array([cv2.boundingRect(contour) for contour in contours], dtype=np.int64)
+    boxes[:, 2:] += boxes[:, :2]
+    return boxes
+
+
+def candidate_pairs(boxes, margin, cell_size):
+    """Paires de boîtes voisines via une grille uniforme (index spatial).
+
+    Chaque boîte, élargie de `margin`, est inscrite dans les cellules qu'elle recouvre : seules
+    les boîtes partageant une cellule sont comparées, au lieu de toutes les paires.
+    """
+    grid = defaultdict(list)
+    cells = np.floor_divide(boxes + (-margin, -margin, margin, margin), cell_size)
+    for i, (cx0, cy0, cx1, cy1) in enumerate(cells.tolist()):
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                grid[(cx, cy)].append(i)
+    pairs = set()
+    for members in grid.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+    if not pairs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    pairs = np.array(sorted(pairs), dtype=np.int64)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def merge_regions(contours, iou_threshold=0.1, distance=50, cell_size=None):
+    """Fusionne les détections qui se recouvrent (IoU) ou sont à moins de `distance` pixels.
+
+    Retourne une liste de régions {"box": (x0, y0, x1, y1), "contour": enveloppe convexe,
+    "members": indices des contours d'origine}.
+    """
+    contours = list(contours)
+    boxes = contour_boxes(contours)
+    if len(boxes) == 0:
+        return []
+    if cell_size is None:
+        # Cellules de la taille d'une boîte typique : chaque boîte ne couvre que quelques cellules
+        sizes = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        cell_size = max(int(np.median(sizes)) + distance, 1)
+
+    first, second = candidate_pairs(boxes, distance // 2 + 1, cell_size)
+    a, b = boxes[first], boxes[second]
+    # Distance entre boîtes (0 si elles se touchent) et IoU, calculées pour toutes les paires d'un coup
+    gap_x = np.maximum(0, np.maximum(a[:, 0], b[:, 0]) - np.minimum(a[:, 2], b[:, 2]))
+    gap_y = np.maximum(0, np.maximum(a[:, 1], b[:, 1]) - np.minimum(a[:, 3], b[:, 3]))
+    inter_w = np.maximum(0, np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0]))
+    inter_h = np.maximum(0, np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1]))
+    inter = inter_w * inter_h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    iou = inter / np.maximum(area_a + area_b - inter, 1)
+    close = (iou >= iou_threshold) | (np.hypot(gap_x, gap_y) <= distance)
+
+    parent = list(range(len(boxes)))
+    for i, j in zip(first[close].tolist(), second[close].tolist()):
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    groups = defaultdict(list)
+    for i in range(len(boxes)):
+        groups[_find(parent, i)].append(i)
+
+    regions = []
+    for members in groups.values():
+        group_boxes = boxes[members]
+        box = (int(group_boxes[:, 0].min()), int(group_boxes[:, 1].min()),
+               int(group_boxes[:, 2].max()), int(group_boxes[:, 3].max()))
+        if len(members) == 1:
+            contour = contours[members[0]]
+        else:
+            contour = cv2.convexHull(np.vstack([contours[i] for i in members]))
+        regions.append({"box": box, "contour": contour, "members": members})
+    return regions
+
+
+def merge_contours(contours, iou_threshold=0.1, distance=50, cell_size=None):
+    """Comme merge_regions, mais ne retourne que les contours fusionnés"""
+    return [region["contour"] for region in merge_regions(contours, iou_threshold, distance, cell_size)]
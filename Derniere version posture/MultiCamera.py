@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+import cv2
+
+# Modules partagés à la racine du dépôt (Metrics, SharedFrameRing...) ; ce dossier n'est pas un paquet
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+import PoseModule as pm  # Détecteur de ce dossier (placé avant la racine dans le chemin d'import)
+from Metrics import get_logger
+from SharedFrameRing import SharedFrameRing
+
+log = get_logger("MultiCamera")
+
+# États de santé d'une caméra (partagés entre processus via multiprocessing.Value)
+STARTING, RUNNING, RECONNECTING, FAILED, STOPPED = range(5)
+STATE_NAMES = {STARTING: "starting", RUNNING: "running", RECONNECTING: "reconnecting",
+               FAILED: "failed", STOPPED: "stopped"}
+
+
+def camera_worker(name, primary_source, backup_source, results, state, heartbeat, stop_event,
+                  detector_kwargs, max_retries, retry_delay, ring=None):
+    """Processus dédié à une caméra : capture + poseDetector propre à ce processus.
+
+    Avec un anneau de frames partagé (`ring`), chaque frame y est écrite une seule fois et le
+    numéro transmis avec les landmarks est celui de la frame dans l'anneau.
+    """
+    detector = pm.poseDetector(**detector_kwargs)
+    sources = [primary_source] if backup_source is None else [primary_source, backup_source]
+    current = 0  # Index de la source utilisée (principale puis secours, en alternance)
+    failures = 0  # Échecs consécutifs (ouverture ou lecture) sans aucune frame lue
+    seq = 0
+
+    while not stop_event.is_set():
+        source = sources[current]
+        cap, failed = pm.open_camera(source)
+        if not failed:
+            state.value = RUNNING
+            while not stop_event.is_set():
+                success, img = cap.read()
+                if not success or img is None:
+                    log.warning("[%s] Lost video source %s, reconnecting.", name, source)
+                    break
+                failures = 0  # La source fournit bien des frames
+                heartbeat.value = time.monotonic()
+                if ring is not None:
+                    if img.shape != ring.shape:
+                        img = cv2.resize(img, (ring.shape[1], ring.shape[0]))
+                    seq = ring.write(img)
+                else:
+                    seq += 1
+                detector.findPose(img, draw=False)
+                lmList = detector.lmList  # Déjà calculés par findPose
+                try:
+                    # Seuls les landmarks transitent entre processus, jamais l'image
+                    results.put_nowait((name, seq, time.time(), detector.complexity, lmList))
+                except queue.Full:
+                    pass  # Le consommateur est en retard : on garde le rythme de la caméra
+            cap.release()
+            if stop_event.is_set():
+                break
+
+        # Ouverture impossible ou plus aucune frame (ex. fin d'un fichier vidéo) : on bascule
+        # sur l'autre source après une pause, jusqu'à max_retries échecs consécutifs
+        failures += 1
+        current = (current + 1) % len(sources)
+        state.value = RECONNECTING
+        if max_retries is not None and failures > max_retries:
+            log.error("[%s] Giving up after %d failed attempts.", name, failures)
+            state.value = FAILED
+            return
+        time.sleep(retry_delay)
+
+    state.value = STOPPED
+
+
+class MultiCameraRunner:
+    """Lance un processus par caméra, chacun avec sa propre instance de poseDetector.
+
+    cameras : {nom: (source_principale, source_de_secours)}. Les résultats remontent dans une
+    file partagée ; `health()` donne l'état et l'âge de la dernière frame de chaque caméra.
+    Un processus mort est relancé automatiquement par `supervise()`.
+
+    Avec `frame_shape` (h, w, c), chaque caméra publie aussi ses frames dans un anneau en mémoire
+    partagée (SharedFrameRing) : `frame(nom, seq)` les prête sans copie aux consommateurs
+    (enregistrement, affichage) ; l'anneau survit aux redémarrages du processus de caméra.
+    """
+
+    def __init__(self, cameras, detector_kwargs=None, queue_size=64, max_retries=None, retry_delay=2.0,
+                 frame_shape=None, ring_slots=8):
+        self.cameras = cameras
+        self.detector_kwargs = detector_kwargs or {}
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.ctx = multiprocessing.get_context("spawn")  # Pas de fork d'un processus contenant des graphes Mediapipe
+        self.results = self.ctx.Queue(maxsize=queue_size)
+        self.stop_event = self.ctx.Event()
+        self.states = {name: self.ctx.Value("i", STARTING) for name in cameras}
+        self.heartbeats = {name: self.ctx.Value("d", 0.0) for name in cameras}
+        self.rings = {name: SharedFrameRing(frame_shape, slots=ring_slots, cond=self.ctx.Condition())
+                      for name in cameras} if frame_shape is not None else {}
+        self.processes = {}
+
+    def _spawn(self, name):
+        primary_source, backup_source = self.cameras[name]
+        self.states[name].value = STARTING
+        process = self.ctx.Process(target=camera_worker, name=f"camera-{name}", daemon=True,
+                                   args=(name, primary_source, backup_source, self.results,
+                                         self.states[name], self.heartbeats[name], self.stop_event,
+                                         self.detector_kwargs, self.max_retries, self.retry_delay,
+                                         self.rings.get(name)))
+        process.start()
+        self.processes[name] = process
+
+    def start(self):
+        for name in self.cameras:
+            self._spawn(name)
+        return self
+
+    def supervise(self):
+        """Relance les processus de caméra qui se sont arrêtés anormalement"""
+        for name, process in self.processes.items():
+            if not process.is_alive() and not self.stop_event.is_set() and self.states[name].value != FAILED:
+                log.warning("[%s] Worker exited (code %s), restarting.", name, process.exitcode)
+                self._spawn(name)
+
+    def get(self, timeout=1.0):
+        """Retourne le prochain résultat (nom, seq, timestamp, complexité, lmList) ou None"""
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def frame(self, name, seq=None):
+        """Prête la frame `seq` de la caméra (par défaut la plus récente) : FrameLease ou None"""
+        ring = self.rings.get(name)
+        return ring.read(seq) if ring is not None else None
+
+    def health(self):
+        now = time.monotonic()
+        return {name: {"state": STATE_NAMES[self.states[name].value],
+                       "last_frame_age": now - self.heartbeats[name].value if self.heartbeats[name].value else None,
+                       "alive": self.processes[name].is_alive() if name in self.processes else False}
+                for name in self.cameras}
+
+    def stop(self):
+        self.stop_event.set()
+        for process in self.processes.values():
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for ring in self.rings.values():
+            ring.close()
+        self.rings = {}
+
+
+if __name__ == "__main__":
+    from Metrics import configure_logging
+    configure_logging()
+    # Exemple : trois caméras de la cabine, la caméra de face ayant une source de secours
+    runner = MultiCameraRunner({"front": (0, 3), "left": (1, None), "right": (2, None)},
+                               frame_shape=(480, 640, 3)).start()
+    try:
+        last_report = time.monotonic()
+        while True:
+            item = runner.get()
+            if item is not None:
+                name, seq, timestamp, complexity, lmList = item
+                print(f"[{name}] frame {seq}: {len(lmList)} landmarks (complexity {complexity})")
+                lease = runner.frame(name, seq)
+                if lease is not None:
+                    with lease:
+                        cv2.imshow(name, lease.frame)  # Affichage sans copie depuis la mémoire partagée
+                    cv2.waitKey(1)
+            if time.monotonic() - last_report > 5:
+                runner.supervise()
+                print(runner.health())
+                last_report = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.stop()
+        cv2.destroyAllWindows()
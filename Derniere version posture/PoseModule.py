@@ -1,9 +1,19 @@
+import os
+import sys
 import cv2
 import mediapipe as mp
 import math
 
+# Modules partagés placés à la racine du dépôt (ModelPool, ...)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Metrics import get_logger
+from ModelPool import ModelPool
+
+log = get_logger(__name__)
+
 class poseDetector():
-    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=0.5, trackCon=0.5, complexity=1):
+    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=0.5, trackCon=0.5, complexity=1,
+                 max_models=3, idle_timeout=60):
         self.mode = mode
         self.upBody = upBody
         self.smooth = smooth
@@ -12,18 +22,28 @@ class poseDetector():
         self.complexity = complexity
         self.mpDraw = mp.solutions.drawing_utils
         self.mpPose = mp.solutions.pose
-        self.pose = None
+        # Each complexity level is built once and kept warm; unused graphs are released after idle_timeout
+        self.pose_pool = ModelPool(self.build_pose, max_models=max_models, idle_timeout=idle_timeout)
         self.init_pose()
 
-    def init_pose(self):
-        self.pose = self.mpPose.Pose(
+    def build_pose(self, complexity):
+        log.info("Building pose model with complexity %d", complexity)
+        return self.mpPose.Pose(
             static_image_mode=self.mode,
-            model_complexity=self.complexity,
+            model_complexity=complexity,
             smooth_landmarks=self.smooth,
             enable_segmentation=self.upBody,
             min_detection_confidence=self.detectionCon,
             min_tracking_confidence=self.trackCon)
-        print(f"Model complexity set to {self.complexity}")
+
+    @property
+    def pose(self):
+        # Fetched through the pool on every frame so the model in use never looks idle
+        return self.pose_pool.get(self.complexity)
+
+    def init_pose(self):
+        self.pose_pool.get(self.complexity)
+        log.debug("Model complexity set to %d", self.complexity)
 
     def findAngle(self, img, p1, p2, p3, draw=True):
         if p1 >= len(self.lmList) or p2 >= len(self.lmList) or p3 >= len(self.lmList):
@@ -40,8 +60,7 @@ class poseDetector():
         if angle > 180:
             angle = 360 - angle
 
-        # Print angle in console
-        print(f"Angle between {p1}, {p2}, {p3}: {angle:.2f} degrees")
+        log.debug("Angle between %d, %d, %d: %.2f degrees", p1, p2, p3, angle)
 
         # Draw the angle on the image
         if draw:
@@ -54,7 +73,7 @@ class poseDetector():
 
         return angle
 
-    def adjust_complexity_based_on_quality(self, landmarks, img):
+    def adjust_complexity_based_on_quality(self, landmarks, img, draw=True):
         original_complexity = self.complexity
         image_quality = self.assess_image_quality(img)
         landmark_count = len(landmarks)
@@ -67,8 +86,9 @@ class poseDetector():
             self.init_pose()
 
         if self.complexity != original_complexity:
-            print(f"Complexity adjusted from {original_complexity} to {self.complexity}")
-            cv2.putText(img, f'Complexity: {self.complexity}', (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            log.info("Complexity adjusted from %d to %d", original_complexity, self.complexity)
+            if draw:
+                cv2.putText(img, f'Complexity: {self.complexity}', (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
 
     def assess_image_quality(self, img):
         gray_image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -76,6 +96,7 @@ class poseDetector():
         return image_variance
 
     def findPose(self, img, draw=True):
+        """Pose, landmarks (self.lmList) et angles du haut du corps ; draw=False ne modifie pas l'image"""
         imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         self.results = self.pose.process(imgRGB)
         if self.results.pose_landmarks and draw:
@@ -83,27 +104,27 @@ class poseDetector():
         landmarks = self.findPosition(img, False)
 
         # Ajuster la complexité du modèle en fonction de la qualité et du nombre de landmarks
-        self.adjust_complexity_based_on_quality(landmarks, img)
+        self.adjust_complexity_based_on_quality(landmarks, img, draw)
 
         # Calculer et afficher les angles pour les parties du haut du corps
         if len(landmarks) > 0:
             # Angle Tête -> Épaule gauche -> Coude gauche
-            self.findAngle(img, 0, 11, 13)  # Nez (0), épaule gauche (11), coude gauche (13)
+            self.findAngle(img, 0, 11, 13, draw)  # Nez (0), épaule gauche (11), coude gauche (13)
             
             # Angle Tête -> Épaule droite -> Coude droit
-            self.findAngle(img, 0, 12, 14)  # Nez (0), épaule droite (12), coude droit (14)
+            self.findAngle(img, 0, 12, 14, draw)  # Nez (0), épaule droite (12), coude droit (14)
             
             # Angle Épaule gauche -> Coude gauche -> Poignet gauche
-            self.findAngle(img, 11, 13, 15)  # Épaule gauche (11), coude gauche (13), poignet gauche (15)
+            self.findAngle(img, 11, 13, 15, draw)  # Épaule gauche (11), coude gauche (13), poignet gauche (15)
             
             # Angle Épaule droite -> Coude droit -> Poignet droit
-            self.findAngle(img, 12, 14, 16)  # Épaule droite (12), coude droit (14), poignet droit (16)
+            self.findAngle(img, 12, 14, 16, draw)  # Épaule droite (12), coude droit (14), poignet droit (16)
             
             # Angle Épaule gauche -> Hanche gauche -> Genou gauche
-            self.findAngle(img, 11, 23, 25)  # Épaule gauche (11), hanche gauche (23), genou gauche (25)
+            self.findAngle(img, 11, 23, 25, draw)  # Épaule gauche (11), hanche gauche (23), genou gauche (25)
             
             # Angle Épaule droite -> Hanche droite -> Genou droit
-            self.findAngle(img, 12, 24, 26)  # Épaule droite (12), hanche droite (24), genou droit (26)
+            self.findAngle(img, 12, 24, 26, draw)  # Épaule droite (12), hanche droite (24), genou droit (26)
 
         return img
 
@@ -122,14 +143,14 @@ class poseDetector():
 def open_camera(source):
     cap = cv2.VideoCapture(source)
     if not cap.isOpened():
-        print(f"Failed to open video source {source}")
+        log.warning("Failed to open video source %s", source)
         return None, True
     return cap, False
 
 def init_video_capture(primary_source, backup_source=None):
     cap, failed = open_camera(primary_source)
     if failed and backup_source:
-        print("Primary source failed, trying backup source.")
+        log.warning("Primary source failed, trying backup source.")
         cap, failed = open_camera(backup_source)
     if failed:
         return None
@@ -1,37 +1,80 @@
-import PoseModule as pm
+import PoseModule as pm  # Ajoute aussi la racine du dépôt au chemin d'import
 import cv2
+import os
 import time
+from AngleEngine import AngleEngine
+from LandmarkArray import LandmarkArray
+from Metrics import Metrics, PrometheusExporter, configure_logging, get_logger
+from MotionGate import MotionGate
+import Overlay
+from Pipeline import PosePipeline
+from ResultsStore import ResultsWriter
 
+configure_logging()
+log = get_logger("Posture")
 detector = pm.poseDetector()
 cap = pm.init_video_capture(0)
 
-pTime = 0
-while cap:
-    success, img = cap.read()
-    if not success or img is None:
-        print("Failed to capture image, exiting.")
-        break
+# Résultats par frame enregistrés en binaire (lecture : ResultsStore.ResultsReader)
+store = ResultsWriter(time.strftime("posture_%Y%m%d_%H%M%S.bin"))
+landmarks = LandmarkArray()
+angle_engine = AngleEngine()
+# Opérateur immobile ou cabine vide : la pose n'est pas recalculée tant que la scène ne bouge pas
+gate = MotionGate()
+lmList = []
+
+
+def infer(img):
+    # Worker d'inférence : la capture continue pendant ce temps dans son propre thread
+    global lmList
+    if not gate.check(img):
+        # Scène inchangée : résultats précédents réutilisés (et toujours enregistrés)
+        if landmarks:
+            Overlay.drawPose(img, landmarks.pixels)
+            store.append(landmarks=landmarks.data, angles=angle_engine.computeLandmarks(landmarks, img.shape))
+        return lmList
 
     img = detector.findPose(img)
-    
-    # Optionally: draw and analyze the pose landmarks
     lmList = detector.findPosition(img)
+    gate.report(detector.results.pose_landmarks)
 
-    if lmList:
-        print(lmList)
-    
-    # Display FPS
-    cTime = time.time()
-    fps = 1 / (cTime - pTime)
-    pTime = cTime
+    if detector.results.pose_landmarks:
+        landmarks.fill(detector.results.pose_landmarks.landmark, img.shape)
+        store.append(landmarks=landmarks.data, angles=angle_engine.computeLandmarks(landmarks, img.shape))
+    else:
+        landmarks.clear()
+    return lmList
 
-    cv2.putText(img, f'FPS : {int(fps)}', (20, 20), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+
+def render(img, lmList, stats):
+    # Display FPS and capture-to-display latency
+    cv2.putText(img, f'FPS : {int(stats["fps"])}', (20, 20), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+    cv2.putText(img, f'Latency : {int(stats["latency_ms"])} ms', (20, 45), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
 
     # Show the frame with landmarks and angles
     cv2.imshow("Pose Detection", img)
 
-    if cv2.waitKey(10) & 0xFF == ord('q'):
-        break
+    return not (cv2.waitKey(1) & 0xFF == ord('q'))
+
 
-cap.release()
+if cap:
+    # Métriques du pipeline (inférence, latence, frames jetées) sur http://127.0.0.1:<port>/metrics,
+    # seulement si POSTURE_METRICS_PORT est défini (ex. POSTURE_METRICS_PORT=9464)
+    metrics = Metrics()
+    exporter = None
+    metrics_port = os.environ.get("POSTURE_METRICS_PORT")
+    if metrics_port:
+        try:
+            exporter = PrometheusExporter(metrics, port=int(metrics_port))
+            exporter.start()
+        except (OSError, ValueError) as e:
+            log.warning("Métriques Prometheus désactivées (port %s) : %s", metrics_port, e)
+            exporter = None
+    try:
+        PosePipeline(cap, infer, render, metrics=metrics).run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        cap.release()
+store.close()
 cv2.destroyAllWindows()
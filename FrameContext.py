@@ -0,0 +1,34 @@
+import cv2
+
+
+class FrameContext:
+    """Frame partagée entre les modèles : la conversion BGR -> RGB n'est faite qu'une fois.
+
+    Le buffer RGB est marqué en lecture seule, ce qui permet à Mediapipe de l'utiliser
+    sans copie interne. Les dessins éventuels se font sur `bgr`, jamais sur `rgb`.
+    """
+
+    def __init__(self, bgr):
+        self.bgr = bgr
+        self._rgb = None
+
+    @classmethod
+    def of(cls, img):
+        """Retourne img s'il s'agit déjà d'un FrameContext, sinon l'enveloppe"""
+        return img if isinstance(img, cls) else cls(img)
+
+    @property
+    def rgb(self):
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+            self._rgb.flags.writeable = False
+        return self._rgb
+
+    @property
+    def converted(self):
+        """Vrai si la conversion RGB a déjà été faite"""
+        return self._rgb is not None
+
+    @property
+    def shape(self):
+        return self.bgr.shape
@@ -0,0 +1,156 @@
+import numpy as np
+
+# Types de prise
+OPEN, PINCH, POWER = 0, 1, 2
+GRIP_NAMES = {OPEN: "Main ouverte", PINCH: "Pince", POWER: "Prise de force"}
+
+# Chaînes d'articulations Mediapipe Hands (poignet puis les 4 points de chaque doigt)
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP = 0, 4, 8, 9
+FINGERS = np.array([[0, 1, 2, 3, 4],       # pouce
+                    [0, 5, 6, 7, 8],       # index
+                    [0, 9, 10, 11, 12],    # majeur
+                    [0, 13, 14, 15, 16],   # annulaire
+                    [0, 17, 18, 19, 20]])  # auriculaire
+
+
+def as_points3d(hands, scale=None):
+    """Mains (..., 21, 2|3) en tableau float32 (..., 21, 3), z = 0 pour des points 2D.
+
+    scale : (w, h, w) pour passer de coordonnées normalisées à des pixels ; sans cela, les
+    angles et distances dépendent du rapport largeur/hauteur de l'image.
+    """
+    hands = np.asarray(hands, dtype=np.float32)
+    if hands.shape[-1] == 2:
+        hands = np.concatenate([hands, np.zeros(hands.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+    if scale is not None:
+        hands = hands * np.asarray(scale, dtype=np.float32)
+    return hands
+
+
+def finger_flexion(hands):
+    """Flexion de chaque doigt (degrés) pour des mains (..., 21, 3) en coordonnées isotropes (pixels).
+
+    Somme des angles entre os consécutifs d'un doigt (0 = doigt tendu) : ne dépend que des
+    positions relatives des articulations, donc ni de la rotation ni de la position de la main.
+    Retourne (..., 5) dans l'ordre pouce, index, majeur, annulaire, auriculaire.
+    """
+    hands = as_points3d(hands)
+    bones = np.diff(hands[..., FINGERS, :], axis=-2)  # (..., 5, 4, 3)
+    u, v = bones[..., :-1, :], bones[..., 1:, :]
+    cross = np.linalg.norm(np.cross(u, v), axis=-1)
+    dot = np.sum(u * v, axis=-1)
+    return np.degrees(np.arctan2(cross, dot)).sum(axis=-1)
+
+
+def pinch_ratio(hands):
+    """Distance pouce-index rapportée à la taille de la paume (poignet -> base du majeur), (...,)"""
+    hands = as_points3d(hands)
+    palm = np.linalg.norm(hands[..., MIDDLE_MCP, :] - hands[..., WRIST, :], axis=-1)
+    gap = np.linalg.norm(hands[..., THUMB_TIP, :] - hands[..., INDEX_TIP, :], axis=-1)
+    return gap / np.maximum(palm, 1e-6)
+
+
+def classify_grips(hands, power_flexion=150.0, pinch_threshold=0.25, scale=None):
+    """Type de prise (OPEN, PINCH, POWER) pour des mains (H, 21, 3), en une passe vectorisée.
+
+    Coordonnées normalisées : passer scale=(w, h, w) pour que la classification ne dépende pas
+    de l'orientation de la main sur une image non carrée.
+
+    - prise de force : les quatre doigts longs sont fléchis (flexion moyenne > power_flexion) ;
+    - pince : pouce et index se touchent (pinch_ratio < pinch_threshold) ;
+    - sinon main ouverte.
+    Retourne (grips (H,), flexion (H, 5), pinch (H,)).
+    """
+    hands = as_points3d(hands, scale)
+    flexion = finger_flexion(hands)
+    pinch = pinch_ratio(hands)
+    grips = np.select([flexion[..., 1:].mean(axis=-1) > power_flexion, pinch < pinch_threshold],
+                      [POWER, PINCH], OPEN).astype(np.int8)
+    return grips, flexion, pinch
+
+
+def unique_hands(hands, min_distance=0.25):
+    """Indices des mains distinctes : deux sous-images voisines peuvent détecter la même main.
+
+    Deux détections sont la même main si leurs articulations sont en moyenne à moins de
+    `min_distance` x la taille de la paume l'une de l'autre.
+    """
+    palm = np.linalg.norm(hands[:, MIDDLE_MCP, :2] - hands[:, WRIST, :2], axis=-1)
+    keep = []
+    for i in range(len(hands)):
+        if all(np.linalg.norm(hands[i, :, :2] - hands[j, :, :2], axis=-1).mean() > min_distance * palm[i]
+               for j in keep):
+            keep.append(i)
+    return keep
+
+
+class HandTracker:
+    """Identifiants stables des mains d'une frame à l'autre.
+
+    Association gloutonne par distance entre poignets (coordonnées normalisées) : la paire la plus
+    proche est associée en premier. Une piste non revue pendant `max_missed` frames est oubliée.
+    """
+
+    def __init__(self, max_distance=0.15, max_missed=10):
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.tracks = {}  # id -> {"wrist": (2,), "missed": int}
+        self.next_id = 0
+
+    def reset(self):
+        self.tracks = {}
+
+    def update(self, wrists):
+        """Associe les poignets (H, 2) aux pistes existantes ; retourne les identifiants (H,)"""
+        wrists = np.asarray(wrists, dtype=np.float32).reshape(-1, 2)
+        ids = np.full(len(wrists), -1, dtype=np.int64)
+        track_ids = list(self.tracks)
+        if track_ids and len(wrists):
+            previous = np.array([self.tracks[i]["wrist"] for i in track_ids])
+            distances = np.linalg.norm(wrists[:, None] - previous[None], axis=-1)
+            for flat in np.argsort(distances, axis=None):
+                hand, track = np.unravel_index(flat, distances.shape)
+                if distances[hand, track] > self.max_distance:
+                    break
+                if ids[hand] < 0 and track_ids[track] not in ids:
+                    ids[hand] = track_ids[track]
+
+        for track_id in track_ids:
+            if track_id not in ids:
+                self.tracks[track_id]["missed"] += 1
+                if self.tracks[track_id]["missed"] > self.max_missed:
+                    del self.tracks[track_id]
+        for hand, wrist in enumerate(wrists):
+            if ids[hand] < 0:
+                ids[hand] = self.next_id
+                self.next_id += 1
+            self.tracks[int(ids[hand])] = {"wrist": wrist, "missed": 0}
+        return ids
+
+
+class HandAnalyzer:
+    """Analyse de toutes les mains d'une frame : identifiant de suivi et type de prise"""
+
+    def __init__(self, power_flexion=150.0, pinch_threshold=0.25, tracker=None):
+        self.power_flexion = power_flexion
+        self.pinch_threshold = pinch_threshold
+        self.tracker = tracker if tracker is not None else HandTracker()
+
+    def analyze(self, hands, img_shape):
+        """hands : mains (H, 21, 3) en coordonnées normalisées plein cadre.
+
+        Retourne une liste de dictionnaires (une entrée par main, doublons retirés).
+        """
+        hands = np.asarray(hands, dtype=np.float32).reshape(-1, 21, 3)
+        h, w = img_shape[:2]
+        scale = (w, h, w)  # Coordonnées isotropes : même résultat quelle que soit l'orientation
+        hands = hands[unique_hands(as_points3d(hands, scale))]
+        ids = self.tracker.update(hands[:, WRIST, :2])
+        if not len(hands):
+            return []
+        grips, flexion, pinch = classify_grips(hands, self.power_flexion, self.pinch_threshold, scale)
+        pixels = (hands[..., :2] * (w, h)).astype(np.int32)
+        return [{"id": int(ids[i]), "landmarks": hands[i], "pixels": pixels[i],
+                 "grip": int(grips[i]), "grip_name": GRIP_NAMES[int(grips[i])],
+                 "flexion": flexion[i], "pinch": float(pinch[i]), "grasping": bool(grips[i] != OPEN)}
+                for i in range(len(hands))]
@@ -0,0 +1,125 @@
+from itertools import chain
+from types import SimpleNamespace
+
+import numpy as np
+
+from RoiTracker import to_full_frame
+
+NUM_LANDMARKS = 33  # Nombre de points de repère du modèle de pose Mediapipe
+
+
+def as_pose_results(values):
+    """Objet au format d'un résultat Mediapipe (pose_landmarks.landmark) à partir d'un tableau (33, 4).
+
+    values=None donne un résultat sans personne (pose_landmarks=None).
+    """
+    if values is None:
+        return SimpleNamespace(pose_landmarks=None)
+    points = [SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v)) for x, y, z, v in values]
+    return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=points))
+
+
+class LandmarkArray:
+    """Points de repère d'une frame stockés dans un tableau (33, 4) float32 préalloué.
+
+    Colonnes : x, y (normalisés entre 0 et 1), z (profondeur relative), visibility.
+    Le même tableau est réutilisé d'une frame à l'autre ; `lmList` fournit une vue
+    compatible avec l'ancien format [id, cx, cy].
+    """
+
+    def __init__(self, num_landmarks=NUM_LANDMARKS):
+        self.num_landmarks = num_landmarks
+        self.data = np.zeros((num_landmarks, 4), dtype=np.float32)
+        self.pixels = np.zeros((num_landmarks, 2), dtype=np.int32)  # Coordonnées (cx, cy) en pixels
+        self.valid = False
+        self.lmList = LandmarkListView(self)
+
+    def fill(self, landmarks, img_shape, box=None):
+        """Remplit le tableau à partir des landmarks Mediapipe en une seule conversion.
+
+        box : région (x0, y0, x1, y1) sur laquelle le modèle a tourné ; les coordonnées
+        sont alors ramenées dans le repère de l'image entière.
+        """
+        if not landmarks:
+            self.valid = False
+            return self
+        flat = np.fromiter(chain.from_iterable((lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks),
+                           dtype=np.float32, count=4 * self.num_landmarks)
+        self.data.reshape(-1)[:] = flat
+        if box is not None:
+            to_full_frame(self.data, box, img_shape)
+        self.valid = True
+        self.updatePixels(img_shape)
+        return self
+
+    def fillArray(self, values, img_shape):
+        """Remplit le tableau à partir d'un tableau (33, 3) ou (33, 4) déjà calculé"""
+        values = np.asarray(values, dtype=np.float32)
+        self.data[:, :values.shape[1]] = values
+        if values.shape[1] < 4:
+            self.data[:, 3] = 1.0  # Visibilité inconnue : considérée comme visible
+        self.valid = True
+        self.updatePixels(img_shape)
+        return self
+
+    def updatePixels(self, img_shape):
+        """Convertit les coordonnées normalisées en pixels pour toute la frame d'un coup"""
+        h, w = img_shape[:2]
+        # astype tronque vers zéro, comme int() dans l'ancienne boucle
+        np.multiply(self.data[:, :2], (w, h), out=self.pixels, casting="unsafe")
+
+    def clear(self):
+        self.valid = False
+
+    @property
+    def xy(self):
+        return self.data[:, :2]
+
+    @property
+    def xyz(self):
+        return self.data[:, :3]
+
+    @property
+    def visibility(self):
+        return self.data[:, 3]
+
+    def __len__(self):
+        return self.num_landmarks if self.valid else 0
+
+    def __bool__(self):
+        return self.valid
+
+
+class LandmarkListView:
+    """Vue compatible avec l'ancien `lmList` : lmList[i] == [i, cx, cy].
+
+    La vue suit le tableau réutilisé : la frame suivante la réécrit. list(vue) en fait une copie.
+    """
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def __bool__(self):
+        return self.landmarks.valid
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if not -len(self) <= index < len(self):
+            raise IndexError("landmark index out of range")
+        index %= len(self)
+        cx, cy = self.landmarks.pixels[index].tolist()
+        return [index, cx, cy]
+
+    def __iter__(self):
+        for index, (cx, cy) in enumerate(self.landmarks.pixels[:len(self)].tolist()):
+            yield [index, cx, cy]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,105 @@
+import time
+
+import numpy as np
+
+
+def smoothing_factor(dt, cutoff):
+    """Coefficient du filtre passe-bas exponentiel pour une fréquence de coupure (Hz)"""
+    r = 2 * np.pi * cutoff * dt
+    return r / (r + 1)
+
+
+class OneEuroFilter:
+    """Filtre One-Euro sur les 33 landmarks d'une frame, en une mise à jour vectorisée.
+
+    La fréquence de coupure augmente avec la vitesse de chaque coordonnée : fort lissage à
+    l'arrêt (le tremblement disparaît), peu de retard pendant les mouvements rapides.
+    Coordonnées normalisées (x, y, z) filtrées ; la visibilité est transmise telle quelle.
+
+    Sans détection (frame sautée, personne perdue un instant), `predict` prolonge le dernier
+    mouvement pendant au plus `max_gap` secondes ; au-delà, le filtre repart de zéro.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self.x = None  # Dernières positions filtrées (33, 3)
+        self.dx = None  # Dernières vitesses filtrées (33, 3)
+        self.visibility = None
+        self.t = None
+
+    def update(self, points, timestamp=None):
+        """Filtre une frame (33, 3) ou (33, 4) ; retourne un tableau (33, 4)"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        points = np.asarray(points, dtype=np.float32)
+        x = points[:, :3]
+        visibility = points[:, 3] if points.shape[1] > 3 else np.ones(len(points), dtype=np.float32)
+        if self.x is None or timestamp - self.t > self.max_gap:
+            self.x, self.dx = x.copy(), np.zeros_like(x)
+        else:
+            dt = max(timestamp - self.t, 1e-6)
+            dx = (x - self.x) / dt
+            self.dx += smoothing_factor(dt, self.d_cutoff) * (dx - self.dx)
+            cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+            self.x += smoothing_factor(dt, cutoff) * (x - self.x)
+        self.visibility = visibility.copy()
+        self.t = timestamp
+        return np.column_stack([self.x, self.visibility])
+
+    def predict(self, timestamp=None):
+        """Position extrapolée (33, 4) pendant une courte absence de détection, sinon None"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if self.x is None or timestamp - self.t > self.max_gap:
+            self.reset()
+            return None
+        return np.column_stack([self.x + self.dx * (timestamp - self.t), self.visibility])
+
+
+def fill_gaps(points, timestamps, valid=None, max_gap=0.5):
+    """Interpolation linéaire des trous courts d'une session (N, 33, D), sans boucle par frame.
+
+    Les frames invalides (NaN ou valid=False) encadrées par deux frames valides distantes d'au
+    plus `max_gap` secondes sont interpolées. Retourne (points complétés, masque de validité).
+    """
+    points = np.array(points, dtype=np.float32)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if valid is None:
+        valid = ~np.isnan(points).any(axis=(-1, -2))
+    valid = np.asarray(valid, dtype=bool)
+    n = len(points)
+    index = np.arange(n)
+    previous = np.maximum.accumulate(np.where(valid, index, -1))
+    following = np.minimum.accumulate(np.where(valid, index, n)[::-1])[::-1]
+    gap = ~valid & (previous >= 0) & (following < n)
+    gap[gap] &= timestamps[following[gap]] - timestamps[previous[gap]] <= max_gap
+    if gap.any():
+        t0, t1 = timestamps[previous[gap]], timestamps[following[gap]]
+        weight = ((timestamps[gap] - t0) / (t1 - t0)).astype(np.float32)[:, None, None]
+        start, end = points[previous[gap]], points[following[gap]]
+        points[gap] = start + weight * (end - start)
+    return points, valid | gap
+
+
+def filter_session(points, timestamps, valid=None, max_gap=0.5, **filter_kwargs):
+    """Lissage hors ligne d'une session enregistrée (N, 33, D), sans retard de phase.
+
+    Les trous courts sont d'abord interpolés (fill_gaps), puis chaque segment continu est filtré
+    dans les deux sens (One-Euro avant et arrière) et les deux passes sont moyennées.
+    Retourne (points lissés, masque de validité) ; les frames sans données restent NaN.
+    """
+    points, valid = fill_gaps(points, timestamps, valid, max_gap)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    smoothed = np.full(points.shape[:-1] + (4,), np.nan, dtype=np.float32)
+    # Segments continus de frames valides : [start, end)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], valid.astype(np.int8), [0]])))
+    for start, end in zip(edges[::2], edges[1::2]):
+        forward, backward = OneEuroFilter(**filter_kwargs), OneEuroFilter(**filter_kwargs)
+        ahead = np.array([forward.update(points[i], timestamps[i]) for i in range(start, end)])
+        behind = np.array([backward.update(points[i], -timestamps[i]) for i in range(end - 1, start - 1, -1)])
+        smoothed[start:end] = (ahead + behind[::-1]) / 2
+    return smoothed, valid
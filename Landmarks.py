@@ -13,11 +13,7 @@ landmarks = {
         "head_tilt": [1, 0, 4],        # Inclinaison de la tête (entre les yeux et le nez)
         "head_nod": [0, 5, 6],         # Mouvement de tête de haut en bas (nez, oeil droit, oeil gauche)
         "head_turn": [7, 0, 8],        # Rotation de la tête (oreille gauche, nez, oreille droite)
-        # Corps
-        "left_elbow": [11, 13, 15],    # Épaule gauche, coude gauche, poignet gauche
-        "right_elbow": [12, 14, 16],   # Épaule droite, coude droit, poignet droit
-        "left_shoulder": [23, 11, 13], # Hanche gauche, épaule gauche, coude gauche
-        "right_shoulder": [24, 12, 14],# Hanche droite, épaule droite, coude droit
+        # Jambes
         "left_knee": [23, 25, 27],     # Hanche gauche, genou gauche, cheville gauche
         "right_knee": [24, 26, 28],    # Hanche droite, genou droit, cheville droite
         "left_hip": [11, 23, 25],      # Épaule gauche, hanche gauche, genou gauche
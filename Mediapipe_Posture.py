@@ -1,38 +1,39 @@
 import PoseModule as pm
 import cv2
+import sys
+from FrameContext import FrameContext
+from Metrics import configure_logging
+from ResultCache import ResultCache
+
+configure_logging()  # Messages du détecteur ; configure_logging(None) pour les couper
 
 # Chargement de l'image
-<<<<<<< HEAD
-jpg = '/home/pc-camera/Bureau/Cameras/03_Code_MiniPC/images/02.jpg'
+# Chemin de l'image en argument (pour un dossier ou une vidéo entière : batch_analyze.py)
+jpg = sys.argv[1] if len(sys.argv) > 1 else '/home/pc-camera/Bureau/Cameras/03_Code_MiniPC/images/02.jpg'
 img = cv2.imread(jpg)
 
 # Initialisation du détecteur de pose avec détection de visage/personne et main (grasping)
-=======
-jpg = '/home/pc-camera/Bureau/Cameras/03_Code_MiniPC/07.jpg'
-img = cv2.imread(jpg)
-
-# Initialisation du détecteur de pose avec détection de visage/personne et main
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
-detector = pm.poseDetector()
+# Résultats mis en cache sur disque : relancer le script sur la même image n'exécute aucun modèle
+# Les trois complexités sont essayées en parallèle : une image sans personne ne les paie plus en série
+detector = pm.poseDetector(result_cache=ResultCache(), parallel_search=True)
 
 # Vérification que l'image a été correctement chargée
 if img is not None:
+    # Conversion BGR -> RGB faite une seule fois et partagée par les trois modèles
+    frame = FrameContext(img)
+
     # Étape 1 : Effectuer le traitement avec le modèle de complexité
-    detection_success, img = detector.tryDifferentComplexities(img)
+    detection_success, _ = detector.tryDifferentComplexities(frame)
 
     # Si une personne est détectée, afficher les angles du corps
     if detection_success:
-<<<<<<< HEAD
         if detector.lmList:  # On vérifie que des landmarks sont présents
             detector.displayBodyAngles(img)
         else:
             print("Aucun point de repère (landmarks) détecté pour afficher les angles.")
-=======
-        detector.displayBodyAngles(img)
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
 
     # Étape 2 : Effectuer la détection de visage après le traitement du modèle de complexité
-    face_detected, img = detector.faceDetector(img)
+    face_detected, _ = detector.faceDetector(frame)
 
     # Si un visage est détecté, afficher le carré et la probabilité
     if face_detected:
@@ -41,7 +42,7 @@ if img is not None:
         print("Aucun visage détecté après le traitement du modèle de complexité.")
 
     # Étape 3 : Détection de la prise en main (grasping) après la détection de visage
-    grasping_detected, img = detector.detectGrasping(img)
+    grasping_detected, _ = detector.detectGrasping(frame)
 
     if grasping_detected:
         print("Prise en main détectée.")
@@ -0,0 +1,192 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+LOGGER_NAME = "posture"  # Logger parent de tous les modules (PoseModule, Pipeline...)
+
+
+def get_logger(name):
+    """Logger d'un module, rattaché au logger parent `posture`"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message ; les champs passés dans extra={"fields": {...}} sont inclus"""
+
+    def format(self, record):
+        entry = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "message": record.getMessage()}
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level=logging.INFO, structured=False, stream=None):
+    """Configure les logs de tous les modules ; level=None les coupe entièrement"""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = False
+    if level is None:
+        # Niveau hérité par tous les loggers des modules ; NullHandler évite le repli de logging
+        logger.setLevel(logging.CRITICAL + 1)
+        logger.addHandler(logging.NullHandler())
+        return logger
+    logger.setLevel(level)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter() if structured else logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+class Metrics:
+    """Chronomètres et compteurs du pipeline, avec des sinks enfichables.
+
+    - `timer(name)` mesure une étape (perf_counter_ns, monotone et haute résolution) ;
+    - `increment(name)` incrémente un compteur (reconstructions de modèle, frames jetées, échecs...) ;
+    - chaque mesure est aussi transmise aux sinks (objets avec `observe(name, seconds)` et
+      `increment(name, value)`), par exemple LogSink ou un exportateur externe.
+
+    Les durées récentes (`window` dernières par étape) servent aux quantiles de `snapshot()`.
+    """
+
+    def __init__(self, sinks=(), enabled=True, window=1024):
+        self.enabled = enabled
+        self.sinks = list(sinks)
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = defaultdict(float)
+            self.timings = defaultdict(lambda: {"count": 0, "sum": 0.0, "max": 0.0,
+                                                "recent": deque(maxlen=self.window)})
+
+    def addSink(self, sink):
+        self.sinks.append(sink)
+
+    def timer(self, name):
+        """Contexte chronométrant une étape (sans effet si les métriques sont désactivées)"""
+        return self._timer(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _timer(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter_ns() - start) / 1e9)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            timing = self.timings[name]
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+            timing["recent"].append(seconds)
+        for sink in self.sinks:
+            sink.observe(name, seconds)
+
+    def increment(self, name, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] += value
+        for sink in self.sinks:
+            sink.increment(name, value)
+
+    def snapshot(self):
+        """Copie des compteurs et statistiques par étape (secondes ; quantiles sur la fenêtre récente)"""
+        with self.lock:
+            counters = dict(self.counters)
+            timings = {name: (t["count"], t["sum"], t["max"], np.array(t["recent"]))
+                       for name, t in self.timings.items()}
+        stages = {}
+        for name, (count, total, peak, recent) in timings.items():
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99]) if len(recent) else (0.0, 0.0, 0.0)
+            stages[name] = {"count": count, "sum": total, "mean": total / max(count, 1), "max": peak,
+                            "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        return {"counters": counters, "stages": stages}
+
+    def prometheus(self, prefix=LOGGER_NAME):
+        """Texte au format d'exposition Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for name, stats in sorted(snapshot["stages"].items()):
+            label = f'stage="{name}"'
+            for quantile in ("p50", "p95", "p99"):
+                lines.append(f'{metric}{{{label},quantile="0.{quantile[1:]}"}} {stats[quantile]:.6g}')
+            lines.append(f"{metric}_sum{{{label}}} {stats['sum']:.6g}")
+            lines.append(f"{metric}_count{{{label}}} {stats['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+class LogSink:
+    """Sink écrivant chaque mesure en log structuré (niveau DEBUG par défaut)"""
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or get_logger("metrics")
+        self.level = level
+
+    def observe(self, name, seconds):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s %.3f ms", name, seconds * 1000,
+                            extra={"fields": {"stage": name, "ms": round(seconds * 1000, 3)}})
+
+    def increment(self, name, value):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s +%g", name, value, extra={"fields": {"counter": name, "value": value}})
+
+
+class PrometheusExporter(threading.Thread):
+    """Point d'accès HTTP local (/metrics) servant `metrics.prometheus()`"""
+
+    def __init__(self, metrics, port=9100, host="127.0.0.1"):
+        super().__init__(daemon=True)
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = exporter.metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.metrics = metrics
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.server.server_address[1]
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ModelPool:
+    """Garde en mémoire des modèles Mediapipe déjà construits, indexés par clé (ex. complexité).
+
+    Un modèle est construit une seule fois via `factory(key)` puis réutilisé.
+    Les modèles inutilisés sont libérés selon une politique LRU (`max_models`)
+    et/ou après `idle_timeout` secondes sans utilisation.
+    """
+
+    def __init__(self, factory, max_models=3, idle_timeout=None):
+        self.factory = factory
+        self.max_models = max_models
+        self.idle_timeout = idle_timeout
+        self.models = OrderedDict()  # clé -> (modèle, dernier accès)
+        self.builds = 0  # Nombre de constructions de modèles (coûteuses)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Retourne le modèle associé à la clé, en le construisant si nécessaire"""
+        with self.lock:
+            now = time.monotonic()
+            self._evict_idle(now, keep=key)
+            if key in self.models:
+                model, _ = self.models.pop(key)
+            else:
+                model = self.factory(key)
+                self.builds += 1
+            self.models[key] = (model, now)  # Placé en fin de liste = le plus récent
+            self._evict_lru(keep=key)
+            return model
+
+    def warm(self, keys):
+        """Construit à l'avance les modèles pour les clés données"""
+        for key in keys:
+            self.get(key)
+
+    def release(self, key):
+        """Libère explicitement le modèle associé à la clé"""
+        with self.lock:
+            entry = self.models.pop(key, None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def close(self):
+        """Libère tous les modèles du pool"""
+        with self.lock:
+            entries = list(self.models.values())
+            self.models.clear()
+        for model, _ in entries:
+            self._close(model)
+
+    def __contains__(self, key):
+        return key in self.models
+
+    def __len__(self):
+        return len(self.models)
+
+    def _evict_idle(self, now, keep=None):
+        if self.idle_timeout is None:
+            return
+        for key in [k for k, (_, last) in self.models.items() if k != keep and now - last > self.idle_timeout]:
+            self._close(self.models.pop(key)[0])
+
+    def _evict_lru(self, keep=None):
+        if self.max_models is None:
+            return
+        while len(self.models) > self.max_models:
+            oldest = next(iter(self.models))
+            if oldest == keep:
+                break
+            self._close(self.models.pop(oldest)[0])
+
+    @staticmethod
+    def _close(model):
+        close = getattr(model, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,81 @@
+import time
+
+import cv2
+
+RUN, REUSE, SKIP = "run", "reuse", "skip"
+
+
+class MotionGate:
+    """Filtre d'entrée peu coûteux, appelé avant tout modèle : inutile de relancer la pose sur une
+    scène immobile.
+
+    Le mouvement est mesuré sur une image réduite en niveaux de gris, soit par un modèle
+    d'arrière-plan MOG2 persistant (method="mog2"), soit par différence avec la frame précédente
+    (method="diff"). Décisions :
+    - RUN : la scène bouge (ou premier passage) -> les modèles tournent ;
+    - REUSE : scène immobile avec une personne -> résultats précédents réutilisés, avec un
+      rafraîchissement au moins toutes les `max_reuse` secondes ;
+    - SKIP : scène immobile et vide -> vérification de présence seulement toutes les
+      `empty_interval` secondes.
+    """
+
+    def __init__(self, scale=0.125, method="mog2", history=300, var_threshold=16, diff_threshold=15,
+                 motion_threshold=0.002, max_reuse=2.0, empty_interval=1.0):
+        if method not in ("mog2", "diff"):
+            raise ValueError(f"Méthode inconnue : {method}")
+        self.scale = scale
+        self.method = method
+        self.history = history
+        self.var_threshold = var_threshold
+        self.diff_threshold = diff_threshold
+        self.motion_threshold = motion_threshold  # Fraction de pixels en mouvement
+        self.max_reuse = max_reuse
+        self.empty_interval = empty_interval
+        self.counts = {RUN: 0, REUSE: 0, SKIP: 0}
+        self.reset()
+
+    def reset(self):
+        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(history=self.history, varThreshold=self.var_threshold,
+                                                                detectShadows=False)
+        self.previous = None
+        self.motion = 1.0
+        self.person = False  # Présence d'une personne lors du dernier passage des modèles
+        self.last_run = None
+        self.decision = RUN
+
+    def measure(self, img):
+        """Fraction de pixels en mouvement sur l'image réduite"""
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if self.method == "mog2":
+            moving = self.bg_subtractor.apply(small) > 200
+        else:
+            moving = None if self.previous is None else cv2.absdiff(small, self.previous) > self.diff_threshold
+            self.previous = small
+        self.motion = 1.0 if moving is None else float(moving.mean())
+        return self.motion
+
+    def check(self, img, timestamp=None):
+        """Retourne True si les modèles doivent tourner sur cette frame (décision dans self.decision)"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self.measure(img)
+        if self.last_run is None or self.motion > self.motion_threshold:
+            self.decision = RUN
+        elif self.person:
+            self.decision = RUN if timestamp - self.last_run >= self.max_reuse else REUSE
+        else:
+            self.decision = RUN if timestamp - self.last_run >= self.empty_interval else SKIP
+        if self.decision == RUN:
+            self.last_run = timestamp
+        self.counts[self.decision] += 1
+        return self.decision == RUN
+
+    def report(self, person_found):
+        """Résultat du passage des modèles (personne trouvée ou non)"""
+        self.person = bool(person_found)
+
+    @property
+    def skippedRatio(self):
+        """Part des frames traitées sans exécuter les modèles"""
+        total = sum(self.counts.values())
+        return (self.counts[REUSE] + self.counts[SKIP]) / total if total else 0.0
@@ -0,0 +1,221 @@
+import time
+
+from FrameContext import FrameContext
+from LandmarkArray import LandmarkArray
+from Metrics import get_logger
+from ModelPool import ModelPool
+from RiskEngine import RiskEngine
+from RoiTracker import RoiTracker, box_area, crop
+
+log = get_logger("MultiPersonTracker")
+
+
+def iou(a, b):
+    """Intersection sur union de deux boîtes (x0, y0, x1, y1)"""
+    inter_w = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    inter_h = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = inter_w * inter_h
+    return inter / max(box_area(a) + box_area(b) - inter, 1)
+
+
+def person_box_from_face(bbox, img_shape):
+    """Boîte probable du corps (x0, y0, x1, y1) à partir d'une boîte de visage (x, y, w, h)"""
+    h, w = img_shape[:2]
+    x, y, fw, fh = bbox
+    cx = x + fw / 2
+    box = (int(max(cx - 2.5 * fw, 0)), int(max(y - 0.5 * fh, 0)),
+           int(min(cx + 2.5 * fw, w)), int(min(y + 8 * fh, h)))
+    if box[2] - box[0] < 2 or box[3] - box[1] < 2:
+        return None
+    return box
+
+
+class OperatorTrack:
+    """État d'un opérateur suivi : région, landmarks, angles et statistiques d'exposition propres"""
+
+    def __init__(self, track_id, box, angle_names, min_visibility=0.5):
+        self.id = track_id
+        self.roi = RoiTracker(min_visibility=min_visibility)
+        self.roi.box = box
+        self.landmarks = LandmarkArray()
+        self.risk = RiskEngine(angle_names)
+        self.angles = None
+        self.zones = None
+        self.missed = 0  # Frames consécutives sans pose dans la région
+        self.age = 0
+
+    @property
+    def box(self):
+        return self.roi.box
+
+
+class MultiPersonTracker:
+    """Mode multi-personnes : un squelette par opérateur, avec un identifiant stable.
+
+    - des propositions de boîtes (visages détectés par le modèle de visage du détecteur, ou
+      `proposer(rgb)` fourni) ne sont calculées que toutes les `detect_every` frames, ou dès
+      qu'un opérateur est perdu : pas de re-détection plein cadre à chaque frame ;
+    - chaque piste a son propre modèle de pose (pool indexé par identifiant, suivi temporel
+      Mediapipe conservé) qui ne traite que la région de l'opérateur : coût linéaire en nombre
+      de personnes ;
+    - les propositions sont associées aux pistes par IoU, ou parce que leur centre tombe dans
+      la région d'une piste ; les autres créent de nouvelles pistes.
+    Angles, zones de risque et statistiques d'exposition sont tenus par opérateur.
+    """
+
+    def __init__(self, detector, max_people=4, detect_every=15, iou_threshold=0.3, max_missed=5,
+                 complexity=None, min_visibility=0.5, proposer=None):
+        self.detector = detector
+        self.max_people = max_people
+        self.detect_every = detect_every
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.complexity = detector.model_complexity if complexity is None else complexity
+        self.min_visibility = min_visibility
+        self.proposer = proposer
+        # Un modèle de pose par opérateur (l'état de suivi de Mediapipe est propre à chaque personne)
+        self.pose_pool = ModelPool(lambda track_id: detector.buildPoseModel(self.complexity), max_models=max_people)
+        self.tracks = {}
+        self.finished = {}  # Statistiques des opérateurs qui ne sont plus suivis, par identifiant
+        self.next_id = 0
+        self.frame_index = 0
+        self.force_detect = True
+
+    def reset(self):
+        self.pose_pool.close()
+        self.tracks = {}
+        self.force_detect = True
+
+    def close(self):
+        self.reset()
+
+    def propose(self, frame):
+        """Boîtes de personnes candidates (x0, y0, x1, y1) sur l'image entière"""
+        rgb = self.detector.frameRGB(frame)
+        if self.proposer is not None:
+            return list(self.proposer(rgb))
+        h, w = frame.shape[:2]
+        with self.detector.metrics.timer("process.face"):
+            results = self.detector.face_detection.process(rgb)
+        boxes = []
+        for detection in results.detections or []:
+            bboxC = detection.location_data.relative_bounding_box
+            box = person_box_from_face((bboxC.xmin * w, bboxC.ymin * h, bboxC.width * w, bboxC.height * h),
+                                       frame.shape)
+            if box is not None:
+                boxes.append(box)
+        return boxes
+
+    def associate(self, proposals):
+        """Crée une piste pour chaque proposition qui ne correspond à aucun opérateur suivi"""
+        for box in proposals:
+            cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+            matched = any(iou(box, track.box) >= self.iou_threshold
+                          or (track.box[0] <= cx <= track.box[2] and track.box[1] <= cy <= track.box[3])
+                          for track in self.tracks.values() if track.box is not None)
+            if not matched and len(self.tracks) < self.max_people:
+                track = OperatorTrack(self.next_id, box, self.detector.angle_engine.names, self.min_visibility)
+                self.tracks[track.id] = track
+                self.next_id += 1
+                log.info("Nouvel opérateur %d", track.id)
+
+    def update(self, img, timestamp=None):
+        """Traite une frame ; retourne une liste de résultats, un par opérateur suivi"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        frame = FrameContext.of(img)
+        if self.force_detect or not self.tracks or self.frame_index % self.detect_every == 0:
+            self.associate(self.propose(frame))
+            self.force_detect = False
+        self.frame_index += 1
+
+        rgb = self.detector.frameRGB(frame)
+        operators = []
+        for track in list(self.tracks.values()):
+            track.age += 1
+            if self.process(track, rgb, frame.shape):
+                track.missed = 0
+                track.angles = self.detector.angle_engine.computeLandmarks(track.landmarks, frame.shape)
+                track.zones = track.risk.update(track.angles, timestamp)
+                operators.append({"id": track.id, "box": track.box, "landmarks": track.landmarks.data.copy(),
+                                  "pixels": track.landmarks.pixels.copy(), "angles": track.angles,
+                                  "zones": track.zones})
+            else:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    self.drop(track)
+        self.suppressDuplicates()
+        return operators
+
+    def process(self, track, rgb, img_shape):
+        """Pose de l'opérateur dans sa région ; retourne False si personne n'y est trouvé"""
+        if track.box is None:
+            return False
+        with self.detector.metrics.timer(f"process.pose_{self.complexity}"):
+            results = self.pose_pool.get(track.id).process(crop(rgb, track.box))
+        if not results.pose_landmarks:
+            track.landmarks.clear()
+            return False
+        track.landmarks.fill(results.pose_landmarks.landmark, img_shape, track.box)
+        box = track.box
+        if track.roi.update(track.landmarks, img_shape) is None:
+            track.roi.box = box  # Landmarks trop peu visibles : on garde la région précédente
+        return True
+
+    def drop(self, track):
+        log.info("Opérateur %d perdu", track.id)
+        del self.tracks[track.id]
+        if track.risk.frames:
+            self.finished[track.id] = track.risk.summary()
+        self.pose_pool.release(track.id)
+        self.force_detect = True  # Nouvelle détection à la frame suivante
+
+    def suppressDuplicates(self):
+        """Deux pistes sur la même personne (régions presque confondues) : la plus récente est retirée"""
+        tracks = sorted(self.tracks.values(), key=lambda track: -track.age)
+        for i, older in enumerate(tracks):
+            for newer in tracks[i + 1:]:
+                if newer.id in self.tracks and older.id in self.tracks and older.box is not None \
+                        and newer.box is not None and iou(older.box, newer.box) > 0.7:
+                    self.drop(newer)
+
+    def summaries(self):
+        """Statistiques d'exposition (RiskEngine.summary) par identifiant d'opérateur, suivis ou non"""
+        summaries = dict(self.finished)
+        summaries.update({track_id: track.risk.summary() for track_id, track in self.tracks.items()})
+        return summaries
+
+
+if __name__ == "__main__":
+    import cv2
+
+    import PoseModule as pm
+    import Overlay
+    from Metrics import configure_logging
+    from ResultsStore import ResultsWriter
+
+    # Exemple : deux opérateurs dans la même cabine ; une ligne de résultats par opérateur et par frame
+    configure_logging()
+    detector = pm.poseDetector(capabilities=(pm.POSE, pm.FACE))
+    tracker = MultiPersonTracker(detector)
+    store = ResultsWriter(time.strftime("operators_%Y%m%d_%H%M%S.bin"), angle_names=detector.angle_engine.names)
+    cap = cv2.VideoCapture(0)
+    frame_number = 0
+    while cap.isOpened():
+        success, img = cap.read()
+        if not success:
+            break
+        frame_number += 1
+        timestamp = time.time()
+        operators = tracker.update(img, timestamp)
+        for operator in operators:
+            store.append(timestamp, frame_number, operator["landmarks"], operator["angles"], operator["zones"],
+                         source=operator["id"])
+        Overlay.drawOperators(img, operators)
+        cv2.imshow("Operators", img)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    cap.release()
+    store.close()
+    for operator_id, summary in tracker.summaries().items():
+        print(f"Opérateur {operator_id} : {summary}")
+    cv2.destroyAllWindows()
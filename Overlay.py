@@ -0,0 +1,87 @@
+import cv2
+
+
+def connections(name):
+    """Connexions du squelette "pose" ou "hands" ; import différé de mediapipe.solutions"""
+    import mediapipe as mp
+    if name == "pose":
+        return mp.solutions.pose.POSE_CONNECTIONS
+    return mp.solutions.hands.HAND_CONNECTIONS
+
+
+def drawPose(img, pixels, color=(255, 0, 0)):
+    """Dessine le squelette de pose à partir d'un tableau (33, 2) de pixels"""
+    points = [tuple(p) for p in pixels.tolist()]
+    for start, end in connections("pose"):
+        cv2.line(img, points[start], points[end], (255, 255, 255), 2)
+    for point in points:
+        cv2.circle(img, point, 5, color, cv2.FILLED)
+    return img
+
+
+def drawAngles(img, pixels, angles, angle_engine, names=("left_elbow", "right_elbow")):
+    """Dessine les angles demandés (segments, sommet et valeur)"""
+    for angle_name in names:
+        i = angle_engine.index[angle_name]
+        if angles[i] != angles[i]:  # NaN : articulation non visible
+            continue
+        (x1, y1), (x2, y2), (x3, y3) = pixels[angle_engine.triplets[i]].tolist()
+        cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 2)
+        cv2.line(img, (x3, y3), (x2, y2), (255, 0, 255), 2)
+        for point in ((x1, y1), (x2, y2), (x3, y3)):
+            cv2.circle(img, point, 5, (255, 0, 255), cv2.FILLED)
+        cv2.putText(img, f"{angle_name}: {int(angles[i])}°", (x2 - 10, y2 - 10),
+                    cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 0), 2)
+    return img
+
+
+def drawFaces(img, faces):
+    """Dessine un carré et la probabilité pour chaque visage"""
+    for face in faces:
+        x, y, w, h = face["bbox"]
+        cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(img, f"{int(face['score'] * 100)}% Face", (x, y - 10),
+                    cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+    return img
+
+
+def drawHands(img, hands):
+    """Dessine les mains détectées et signale la prise en main (grasping)"""
+    for hand in hands:
+        points = [tuple(p) for p in hand["pixels"].tolist()]
+        for start, end in connections("hands"):
+            cv2.line(img, points[start], points[end], (255, 255, 255), 2)
+        for point in points:
+            cv2.circle(img, point, 3, (0, 0, 255), cv2.FILLED)
+        if "grip_name" in hand:
+            x, y = points[0]
+            cv2.putText(img, f"#{hand['id']} {hand['grip_name']}", (x + 10, y + 20),
+                        cv2.FONT_HERSHEY_PLAIN, 1.5, (0, 255, 255), 2)
+    if any(hand["grasping"] for hand in hands):
+        cv2.putText(img, "Grasping Detected", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+    return img
+
+
+def drawOperators(img, operators):
+    """Dessine la région, le squelette et l'identifiant de chaque opérateur (MultiPersonTracker)"""
+    for operator in operators:
+        x0, y0, x1, y1 = operator["box"]
+        cv2.rectangle(img, (x0, y0), (x1, y1), (0, 255, 255), 2)
+        cv2.putText(img, f"Opérateur {operator['id']}", (x0, max(y0 - 10, 15)),
+                    cv2.FONT_HERSHEY_PLAIN, 1.5, (0, 255, 255), 2)
+        drawPose(img, operator["pixels"])
+    return img
+
+
+def drawResults(img, result, angle_engine=None, angle_names=("left_elbow", "right_elbow")):
+    """Étape de rendu séparée : dessine un résultat de poseDetector.analyze sur l'image.
+
+    À appeler uniquement pour les frames réellement affichées ou enregistrées.
+    """
+    if result["pixels"] is not None:
+        drawPose(img, result["pixels"])
+        if angle_engine is not None and result["angles"] is not None:
+            drawAngles(img, result["pixels"], result["angles"], angle_engine, angle_names)
+    drawFaces(img, result["faces"])
+    drawHands(img, result["hands"])
+    return img
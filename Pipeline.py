@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+
+from Metrics import get_logger
+
+log = get_logger("Pipeline")
+
+
+def put_latest(q, item):
+    """Ajoute un élément à une file bornée en jetant le plus ancien si elle est pleine.
+
+    Retourne le nombre d'éléments jetés.
+    """
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class FrameGrabber(threading.Thread):
+    """Thread de capture : lit la caméra en continu et ne garde que la frame la plus récente.
+
+    Les frames non consommées à temps sont simplement écrasées, ce qui évite l'accumulation
+    dans le buffer du pilote lorsque l'inférence est plus lente que la caméra.
+    """
+
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.cond = threading.Condition()
+        self.frame = None
+        self.seq = 0  # Numéro de la dernière frame capturée
+        self.last_read = 0  # Numéro de la dernière frame remise au consommateur
+        self.timestamp = 0.0
+        self.failed = False
+        self.running = True
+
+    def run(self):
+        while self.running:
+            success, img = self.cap.read()
+            with self.cond:
+                if not success or img is None:
+                    self.failed = True
+                    self.cond.notify_all()
+                    return
+                self.frame, self.timestamp = img, time.monotonic()
+                self.seq += 1
+                self.cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """Attend une frame plus récente que la dernière lue ; retourne (seq, timestamp, frame)"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq != self.last_read or self.failed or not self.running, timeout)
+            if self.seq == self.last_read:
+                return None
+            self.last_read = self.seq
+            return self.seq, self.timestamp, self.frame
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+
+class PosePipeline:
+    """Pipeline capture -> inférence -> affichage sur trois étages.
+
+    - capture : FrameGrabber (thread dédié, frame la plus récente uniquement)
+    - inférence : thread de travail appelant `infer(frame)`
+    - affichage/enregistrement : `render(frame, result, stats)` dans le thread appelant `run()`
+      (cv2.imshow doit rester dans le thread principal). `render` retourne False pour arrêter.
+
+    Les étages communiquent par des files bornées qui jettent les éléments les plus anciens :
+    la latence reste stable même si l'inférence est plus lente que la caméra.
+    Avec `metrics` (Metrics), les durées d'inférence, latences et frames jetées y sont aussi publiées.
+    Une exception levée par `infer` arrête le thread d'inférence et est relancée par `run()`.
+    """
+
+    def __init__(self, cap, infer, render, queue_size=2, metrics=None):
+        self.grabber = FrameGrabber(cap)
+        self.infer = infer
+        self.render = render
+        self.results = queue.Queue(maxsize=queue_size)
+        self.metrics = metrics
+        self.reported_drops = 0
+        self.running = False
+        self.worker = threading.Thread(target=self._inference_loop, daemon=True)
+        self.stats = {"captured": 0, "inferred": 0, "rendered": 0, "dropped": 0,
+                      "inference_ms": 0.0, "latency_ms": 0.0, "fps": 0.0}
+
+    def _inference_loop(self):
+        while self.running:
+            item = self.grabber.read(timeout=0.5)
+            if item is None:
+                if self.grabber.failed:
+                    put_latest(self.results, None)  # Signale la fin du flux à l'étage d'affichage
+                    return
+                continue
+            seq, timestamp, frame = item
+            start = time.monotonic()
+            try:
+                result = self.infer(frame)
+            except Exception as e:
+                log.exception("Inference failed on frame %d", seq)
+                put_latest(self.results, e)  # Transmise à run(), qui la relance
+                return
+            self.stats["inference_ms"] = (time.monotonic() - start) * 1000
+            self.stats["inferred"] += 1
+            dropped = put_latest(self.results, (seq, timestamp, frame, result))
+            if self.metrics is not None:
+                self.metrics.observe("inference", self.stats["inference_ms"] / 1000)
+                self.metrics.increment("frames_dropped", dropped)  # Résultats non affichés à temps
+
+    def run(self):
+        """Démarre les étages et exécute l'affichage jusqu'à l'arrêt"""
+        self.running = True
+        self.grabber.start()
+        self.worker.start()
+        pTime = time.monotonic()
+        try:
+            while self.running:
+                try:
+                    item = self.results.get(timeout=0.5)
+                except queue.Empty:
+                    if not self.worker.is_alive():
+                        log.error("Inference thread stopped, exiting.")
+                        break
+                    continue
+                if item is None:
+                    log.warning("Failed to capture image, exiting.")
+                    break
+                if isinstance(item, Exception):
+                    raise RuntimeError("Échec de l'inférence") from item
+                seq, timestamp, frame, result = item
+                cTime = time.monotonic()
+                self.stats["fps"] = 1 / max(cTime - pTime, 1e-6)
+                pTime = cTime
+                self.stats["latency_ms"] = (cTime - timestamp) * 1000
+                self.stats["captured"] = self.grabber.seq
+                dropped = self.grabber.seq - self.stats["inferred"]  # Frames écrasées avant inférence
+                if self.metrics is not None:
+                    self.metrics.observe("latency", self.stats["latency_ms"] / 1000)
+                    if dropped > self.reported_drops:
+                        self.metrics.increment("frames_dropped", dropped - self.reported_drops)
+                        self.reported_drops = dropped
+                self.stats["dropped"] = dropped
+                self.stats["rendered"] += 1
+                if self.render(frame, result, self.stats) is False:
+                    break
+        finally:
+            self.stop()
+
+    def stop(self):
+        self.running = False
+        self.grabber.stop()
+        if self.worker.is_alive() and self.worker is not threading.current_thread():
+            self.worker.join(timeout=1.0)
@@ -1,10 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
 import cv2
-import mediapipe as mp
-import math
+import numpy as np
+
+from AdaptiveController import AdaptiveController
+from AngleEngine import AngleEngine, angle_between
+from ContourMerge import merge_contours
+from FrameContext import FrameContext
+from HandAnalyzer import HandAnalyzer, classify_grips, OPEN
+from LandmarkArray import LandmarkArray, as_pose_results
+from Metrics import Metrics, get_logger
+from ModelPool import ModelPool
+from ResultCache import mediapipe_version
+from Rula import RulaScorer
+from RoiTracker import RoiTracker, crop, to_full_frame
+import Overlay
+
+log = get_logger("PoseModule")
+
+# Capacités de détection déclarées à la création du détecteur
+POSE, FACE, HANDS = "pose", "face", "hands"
+ALL_CAPABILITIES = (POSE, FACE, HANDS)
+
+# Critère de choix de la recherche de complexité parallèle
+BY_DETECTION, BY_VISIBILITY = "detection", "visibility"
+
+
+def mediapipe_solutions():
+    """Import différé de mediapipe.solutions : coûteux, il n'a lieu qu'à la construction d'un modèle"""
+    import mediapipe as mp
+    return mp.solutions
 
 class poseDetector:
-    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=0.5, trackCon=0.5):
+    def __init__(self, mode=False, upBody=False, smooth=True, detectionCon=0.5, trackCon=0.5,
+                 max_models=3, idle_timeout=None, preload=False, headless=False, use_roi=False,
+                 controller=None, metrics=None, capabilities=ALL_CAPABILITIES, warmup=False,
+                 landmark_filter=None, motion_gate=None, result_cache=None, parallel_search=False,
+                 search_by=BY_DETECTION):
+        """capabilities : modèles utilisables, ex. (POSE,) ou (POSE, HANDS). Chaque modèle n'est
+        construit qu'au premier usage ; warmup=True les construit dans un thread d'arrière-plan.
+        landmark_filter : filtre temporel des landmarks (ex. LandmarkFilter.OneEuroFilter) pour
+        les flux vidéo ; il comble aussi les frames sans détection pendant un court instant.
+        motion_gate : MotionGate.MotionGate ; sur une scène immobile, analyze() et
+        tryDifferentComplexities réutilisent les résultats précédents sans lancer les modèles.
+        result_cache : ResultCache.ResultCache pour les images fixes ; une image déjà analysée
+        (même contenu, mêmes réglages) ne relance ni la recherche de complexité ni les passes
+        visage, mains et contours qui suivent sur la même image.
+        parallel_search : tryDifferentComplexities lance toutes les complexités en même temps
+        (un modèle préchauffé par complexité) ; search_by=BY_VISIBILITY garde alors la complexité
+        dont les landmarks sont les plus visibles plutôt que la moins coûteuse qui détecte.
+        """
+        unknown = set(capabilities) - set(ALL_CAPABILITIES)
+        if unknown:
+            raise ValueError(f"Capacités inconnues : {sorted(unknown)}")
+        if search_by not in (BY_DETECTION, BY_VISIBILITY):
+            raise ValueError(f"Critère de recherche inconnu : {search_by}")
+        self.capabilities = tuple(capabilities)
         self.mode = mode
+        self.headless = headless  # Mode sans rendu : aucune méthode ne modifie l'image
         self.upBody = upBody
         self.smooth = smooth
         self.detectionCon = detectionCon
@@ -12,243 +67,660 @@ class poseDetector:
         self.model_complexity = 0  # Complexité initiale
         self.max_complexity = 2  # Complexité maximale
         self.min_complexity = 0  # Complexité minimale
-        self.pose = None
-        self.updatePoseModel()  # Initialisation du modèle avec complexité initiale
-<<<<<<< HEAD
-        self.lmList = []
-=======
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
-
+        self.parallel_search = parallel_search
+        self.search_by = search_by
+        complexity_count = self.max_complexity - self.min_complexity + 1
+        if parallel_search and max_models is not None and max_models < complexity_count:
+            # Le pool libérerait un modèle encore utilisé par une tentative en cours
+            raise ValueError(f"parallel_search demande max_models >= {complexity_count}")
+        self.search_pool = None  # Threads de la recherche parallèle, créés au premier usage
+        self.search_locks = {c: threading.Lock() for c in range(self.min_complexity, self.max_complexity + 1)}
+        # Chronomètres par étape et compteurs (reconstructions de modèle, échecs de détection...)
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Pool de modèles de pose : chaque complexité n'est construite qu'une fois
+        self.pose_pool = ModelPool(self.buildPoseModel, max_models=max_models, idle_timeout=idle_timeout)
+        # Modèles de visage et de mains (plein cadre), construits au premier usage
+        self.models = {}
+        self.build_lock = threading.Lock()
+        # Un modèle à une main par poignet pour les sous-images (le suivi de chaque main reste stable)
+        self.wrist_hands = ModelPool(self.buildWristHandModel, max_models=2)
+        self.landmarks = LandmarkArray()  # Tableau (33, 4) réutilisé à chaque frame
+        self.lmList = self.landmarks.lmList  # Vue compatible [id, cx, cy]
+        self.landmark_filter = landmark_filter
+        self.landmarks_predicted = False  # Vrai si les landmarks viennent du filtre, sans détection
+        self.angle_engine = AngleEngine()  # Tous les angles de Landmarks.py en un appel
+        self.rula = RulaScorer()  # Score postural RULA par indexation de tables
+        self.angles = None
+        self.faces = []  # [{"bbox": (x, y, w, h), "score": float}]
+        # [{"id": int, "landmarks": (21, 3), "pixels": (21, 2), "grip": int, "grasping": bool, ...}]
+        self.hands_state = []
+        self.hand_analyzer = HandAnalyzer()  # Type de prise et identifiant de suivi de chaque main
+        # Région d'intérêt suivie à partir des landmarks de la frame précédente
+        self.roi = RoiTracker() if use_roi else None
+        self.wrist_regions = self.roi if self.roi is not None else RoiTracker()  # Boîtes autour des poignets pour le modèle de main
+        self.pose_box = None  # Boîte réellement traitée par le modèle de pose (None = image entière)
+        # Contrôleur adaptatif (AdaptiveController) : modèles à exécuter selon le budget de temps
+        self.controller = controller
+        self.motion_gate = motion_gate
+        self.result_cache = result_cache
+        self.still = None  # (image, clé de cache) de la dernière image passée à tryDifferentComplexities
+
+        # Tous les niveaux de complexité dès le départ (pas de latence lors d'un changement)
+        complexities = range(self.min_complexity, self.max_complexity + 1) if preload else None
+        self.warmup_thread = None
+        if warmup:
+            self.warmup_thread = threading.Thread(target=self.warmUp, args=(complexities,), daemon=True)
+            self.warmup_thread.start()
+        elif preload:
+            self.warmUp(complexities)
+
+    def warmUp(self, complexities=None):
+        """Construit à l'avance les modèles déclarés (par défaut : pose à la complexité actuelle,
+        ou à toutes les complexités avec la recherche parallèle)"""
+        if complexities is None and self.parallel_search:
+            complexities = range(self.min_complexity, self.max_complexity + 1)
         try:
-            # Détection de visage (face detection)
-            self.mpFace = mp.solutions.face_detection
-            self.face_detection = self.mpFace.FaceDetection(min_detection_confidence=self.detectionCon)
-
-            # Détection des mains (hand detection)
-            self.mpHands = mp.solutions.hands
-            self.hands = self.mpHands.Hands(static_image_mode=self.mode,
-                                            max_num_hands=2,
-                                            min_detection_confidence=self.detectionCon,
-                                            min_tracking_confidence=self.trackCon)
-
+            if POSE in self.capabilities:
+                self.pose_pool.warm(complexities or [self.model_complexity])
+            if FACE in self.capabilities:
+                self.subModel(FACE, self.buildFaceModel)
+            if HANDS in self.capabilities:
+                self.subModel(HANDS, self.buildHandsModel)
         except Exception as e:
-            print(f"Erreur lors de l'initialisation de Mediapipe: {e}")
-            raise
-
-<<<<<<< HEAD
-=======
-        self.lmList = []
+            log.error("Erreur lors de l'initialisation de Mediapipe: %s", e)
+            if threading.current_thread() is not self.warmup_thread:
+                raise
+
+    def waitReady(self, timeout=None):
+        """Attend la fin du préchauffage ; retourne False s'il est encore en cours"""
+        if self.warmup_thread is not None:
+            self.warmup_thread.join(timeout)
+            return not self.warmup_thread.is_alive()
+        return True
+
+    def requireCapability(self, capability):
+        if capability not in self.capabilities:
+            raise RuntimeError(f"Capacité '{capability}' non déclarée (capabilities={self.capabilities})")
+
+    def subModel(self, name, factory):
+        """Modèle construit au premier usage (une seule fois, même avec le thread de préchauffage)"""
+        model = self.models.get(name)
+        if model is None:
+            with self.build_lock:
+                model = self.models.get(name)
+                if model is None:
+                    model = self.models[name] = factory()
+        return model
+
+    @property
+    def pose(self):
+        """Modèle de pose de la complexité actuelle (construit au premier usage)"""
+        return self.pose_pool.get(self.model_complexity)
+
+    @property
+    def face_detection(self):
+        return self.subModel(FACE, self.buildFaceModel)
+
+    @property
+    def hands(self):
+        return self.subModel(HANDS, self.buildHandsModel)
 
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
     def updatePoseModel(self):
-        """Créer un nouveau modèle de pose avec la complexité actuelle"""
-        print(f"Création d'un nouveau modèle avec complexité: {self.model_complexity}")
-        self.pose = mp.solutions.pose.Pose(static_image_mode=self.mode,
-                                           model_complexity=self.model_complexity,
-                                           smooth_landmarks=self.smooth,
-                                           enable_segmentation=self.upBody,
-                                           min_detection_confidence=self.detectionCon,
-                                           min_tracking_confidence=self.trackCon)
+        """Sélectionner le modèle de pose de la complexité actuelle (construit une seule fois)"""
+        return self.pose
+
+    def buildPoseModel(self, complexity):
+        """Créer un nouveau modèle de pose avec la complexité donnée"""
+        self.requireCapability(POSE)
+        log.info("Création d'un nouveau modèle avec complexité: %d", complexity)
+        self.metrics.increment("model_builds")
+        return mediapipe_solutions().pose.Pose(static_image_mode=self.mode,
+                                               model_complexity=complexity,
+                                               smooth_landmarks=self.smooth,
+                                               enable_segmentation=self.upBody,
+                                               min_detection_confidence=self.detectionCon,
+                                               min_tracking_confidence=self.trackCon)
+
+    def buildFaceModel(self):
+        """Créer le modèle de détection de visage (face detection)"""
+        self.requireCapability(FACE)
+        log.info("Création du modèle de détection de visage")
+        self.metrics.increment("model_builds")
+        return mediapipe_solutions().face_detection.FaceDetection(min_detection_confidence=self.detectionCon)
+
+    def buildHandsModel(self):
+        """Créer le modèle de détection des mains (hand detection) sur l'image entière"""
+        self.requireCapability(HANDS)
+        log.info("Création du modèle de détection des mains")
+        self.metrics.increment("model_builds")
+        return mediapipe_solutions().hands.Hands(static_image_mode=self.mode,
+                                                 max_num_hands=2,
+                                                 min_detection_confidence=self.detectionCon,
+                                                 min_tracking_confidence=self.trackCon)
+
+    def buildWristHandModel(self, side):
+        """Créer un modèle de main dédié à la sous-image d'un poignet"""
+        self.requireCapability(HANDS)
+        log.info("Création d'un modèle de main pour le poignet %s", side)
+        self.metrics.increment("model_builds")
+        return mediapipe_solutions().hands.Hands(static_image_mode=self.mode,
+                                                 max_num_hands=1,
+                                                 min_detection_confidence=self.detectionCon,
+                                                 min_tracking_confidence=self.trackCon)
+
+    def close(self):
+        """Libère tous les modèles construits"""
+        if self.search_pool is not None:
+            self.search_pool.shutdown(wait=True, cancel_futures=True)  # Aucune tentative en cours sur un modèle fermé
+            self.search_pool = None
+        self.pose_pool.close()
+        self.wrist_hands.close()
+        with self.build_lock:
+            models, self.models = list(self.models.values()), {}
+        for model in models:
+            model.close()
 
     def findPose(self, img, draw=True):
-<<<<<<< HEAD
-        """Applique la détection de pose"""
-=======
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.pose.process(imgRGB)
+        """Applique la détection de pose (img : image BGR ou FrameContext partagé)"""
+        frame = FrameContext.of(img)
+        self.still = None  # Nouvelle inférence : les sections en cache ne correspondent plus forcément à l'image
+        rgb = self.frameRGB(frame)
+        if self.roi is None:
+            self.pose_box = None
+            self.results = self.processPose(rgb)
+        else:
+            # Inférence sur la région suivie ; si la personne est perdue, retour au plein cadre
+            imgRGB, self.pose_box = self.roi.cropPose(rgb)
+            self.results = self.processPose(imgRGB)
+            processed = imgRGB.shape[0] * imgRGB.shape[1]
+            if self.pose_box is not None and not self.results.pose_landmarks:
+                self.roi.reset()
+                imgRGB, self.pose_box = self.roi.cropPose(rgb)
+                self.results = self.processPose(imgRGB)
+                processed += imgRGB.shape[0] * imgRGB.shape[1]
+            self.roi.account(rgb.shape, processed)
 
         if self.results.pose_landmarks:
-            if draw:
-                mp.solutions.drawing_utils.draw_landmarks(img, self.results.pose_landmarks, mp.solutions.pose.POSE_CONNECTIONS)
+            if draw and not self.headless:
+                if self.pose_box is None:
+                    with self.metrics.timer("draw"):
+                        solutions = mediapipe_solutions()
+                        solutions.drawing_utils.draw_landmarks(frame.bgr, self.results.pose_landmarks, solutions.pose.POSE_CONNECTIONS)
+                else:
+                    # Landmarks ramenés en coordonnées plein cadre (sans filtre ni suivi : updateLandmarks s'en charge)
+                    self.landmarks.fill(self.results.pose_landmarks.landmark, frame.shape, self.pose_box)
+                    with self.metrics.timer("draw"):
+                        Overlay.drawPose(frame.bgr, self.landmarks.pixels)
         return img
 
+    def frameRGB(self, frame):
+        """Image RGB d'un FrameContext (conversion chronométrée, faite une seule fois par frame)"""
+        if frame.converted:
+            return frame.rgb
+        with self.metrics.timer("color_conversion"):
+            return frame.rgb
+
+    def processPose(self, imgRGB):
+        with self.metrics.timer(f"process.pose_{self.model_complexity}"):
+            return self.pose.process(imgRGB)
+
     def findPosition(self, img, draw=True):
-<<<<<<< HEAD
-        """Récupérer la position des landmarks détectés dans l'image"""
-=======
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
-        self.lmList = []
+        """Récupérer la position des landmarks détectés dans l'image.
+
+        Retourne une copie [[id, cx, cy], ...] qui peut être conservée d'une frame à l'autre ;
+        self.lmList est une vue sur le tableau réutilisé, réécrite à chaque frame.
+        """
+        self.updateLandmarks(img, draw)
+        return list(self.lmList)
+
+    def updateLandmarks(self, img, draw=True):
+        """Remplit self.landmarks à partir des derniers résultats de pose, sans copie en liste"""
+        self.landmarks_predicted = False
         if self.results.pose_landmarks:
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
-<<<<<<< HEAD
-                cx, cy, cz = int(lm.x * w), int(lm.y * h), lm.z  # Coordonnées 3D (x, y, z)
-                self.lmList.append([id, cx, cy, cz])
-=======
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lmList.append([id, cx, cy])
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
-                if draw:
-                    cv2.circle(img, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
-        return self.lmList
+            with self.metrics.timer("landmarks"):
+                self.landmarks.fill(self.results.pose_landmarks.landmark, img.shape, self.pose_box)
+                if self.landmark_filter is not None:
+                    self.landmarks.fillArray(self.landmark_filter.update(self.landmarks.data), img.shape)
+            if draw:
+                self.drawPosition(img)
+        else:
+            self.metrics.increment("detection_failures")
+            predicted = self.landmark_filter.predict() if self.landmark_filter is not None else None
+            if predicted is not None:
+                # Trou court : dernier mouvement prolongé au lieu de perdre la frame
+                self.landmarks.fillArray(predicted, img.shape)
+                self.landmarks_predicted = True
+            else:
+                self.landmarks.clear()
+        if self.roi is not None:
+            self.roi.update(self.landmarks, img.shape)
+
+    def drawPosition(self, img):
+        if self.headless:
+            return
+        with self.metrics.timer("draw"):
+            bgr = FrameContext.of(img).bgr
+            for cx, cy in self.landmarks.pixels.tolist():
+                cv2.circle(bgr, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
 
     def tryDifferentComplexities(self, img):
         """Essaie différentes valeurs de complexité jusqu'à trouver la meilleure"""
+        frame = FrameContext.of(img)  # Partagé par toutes les tentatives : une seule conversion RGB
+        if self.motion_gate is not None and not self.gateCheck(frame):
+            # Scène immobile : résultat précédent, sans remonter les complexités sur une frame vide
+            return bool(self.lmList), img
+        # Le cache disque passe après le filtre de mouvement : aucun hachage sur une frame filtrée
+        search = self.cachedSearch if self.result_cache is not None else self.searchComplexities
+        found, _ = search(frame)
+        if self.motion_gate is not None:
+            self.motion_gate.report(found)
+        return found, img
+
+    def cacheConfig(self):
+        """Réglages qui influencent les résultats sur une image fixe (partie de la clé du cache)"""
+        return {"mode": self.mode, "upBody": self.upBody, "smooth": self.smooth,
+                "detectionCon": self.detectionCon, "trackCon": self.trackCon,
+                "complexities": [self.min_complexity, self.max_complexity], "roi": self.roi is not None,
+                "filter": self.landmark_filter is not None, "mediapipe": mediapipe_version(),
+                "power_flexion": self.hand_analyzer.power_flexion,
+                "pinch_threshold": self.hand_analyzer.pinch_threshold}
+
+    def cachedSearch(self, img):
+        """searchComplexities à travers le cache disque : une image déjà analysée ne lance aucun modèle"""
+        frame = FrameContext.of(img)
+        with self.metrics.timer("cache_key"):
+            key = self.result_cache.key(frame.bgr, self.cacheConfig())  # Avant tout dessin sur l'image
+        cached = self.cachedSection(key, "pose")
+        if cached is None:
+            found, img = self.searchComplexities(img)
+            self.result_cache.put(key, "pose", {"complexity": self.model_complexity,
+                                                "landmarks": self.landmarks.data.copy() if found else None})
+        else:
+            self.model_complexity = cached["complexity"]
+            self.pose_box = None
+            self.landmarks_predicted = False
+            self.results = as_pose_results(cached["landmarks"])  # Pour un findPosition ultérieur
+            if cached["landmarks"] is None:
+                self.landmarks.clear()
+            else:
+                self.landmarks.fillArray(cached["landmarks"], frame.shape)
+                self.drawPosition(img)  # Même rendu que updateLandmarks
+            found = bool(self.lmList)
+        # Les passes suivantes sur la même image (visage, mains, contours) partagent la clé
+        self.still = (frame.bgr, key)
+        return found, img
+
+    def stillKey(self, img):
+        """Clé de cache si img est l'image de la dernière recherche de complexité, sinon None"""
+        if self.still is None:
+            return None
+        image, key = self.still
+        return key if FrameContext.of(img).bgr is image else None
+
+    def cachedSection(self, key, section):
+        """Section en cache pour l'image (None si absente ou sans clé)"""
+        if key is None:
+            return None
+        value = self.result_cache.get(key, section)
+        self.metrics.increment("cache_hits" if value is not None else "cache_misses")
+        return value
+
+    def gateCheck(self, img):
+        """Passe la frame au filtre de mouvement ; retourne True si les modèles doivent tourner"""
+        with self.metrics.timer("motion_gate"):
+            run = self.motion_gate.check(FrameContext.of(img).bgr)
+        if not run:
+            self.metrics.increment("frames_gated")
+        return run
+
+    def searchComplexities(self, img):
+        if self.parallel_search:
+            return self.parallelSearch(img)
+        return self.sequentialSearch(img)
+
+    def sequentialSearch(self, img):
+        frame = FrameContext.of(img)  # Une seule conversion RGB pour toutes les tentatives
         for complexity in range(self.min_complexity, self.max_complexity + 1):
             self.model_complexity = complexity
-            self.updatePoseModel()  # Recréer le modèle avec la nouvelle complexité
-
-<<<<<<< HEAD
-            img = self.findPose(img, draw=False)
-            self.findPosition(img)
-            if self.lmList:
-                print(f"Personne détectée avec une complexité de {self.model_complexity}")
-                return True, img
-        print("Aucune personne détectée après avoir testé toutes les complexités.")
-        return False, img
-
-    # Nouvelle fonction pour détecter les actions techniques par contours
-    def detect_actions_from_movement(self, image):
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blurred_image = cv2.GaussianBlur(gray_image, (5, 5), 0)
-        edges = cv2.Canny(blurred_image, 50, 150)
-        _, thresh_image = cv2.threshold(edges, 127, 255, cv2.THRESH_BINARY)
-
-        contours, _ = cv2.findContours(thresh_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        detected_contours = []
-        nb_actions = 0
-        for contour in contours:
-            contour_area = cv2.contourArea(contour)
-            if contour_area > 1000:
-                nb_actions += 1
-                detected_contours.append(contour)
-                cv2.drawContours(image, [contour], -1, (0, 255, 0), 2)
-
-        print(f"Nombre d'actions techniques détectées (Contours) : {nb_actions}")
-        return nb_actions, detected_contours, image
-
-    # Nouvelle fonction pour la soustraction d'arrière-plan
-    def detect_actions_with_bg_subtraction(self, image, bg_subtractor):
-        fg_mask = bg_subtractor.apply(image)
-        _, thresh_image = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
-        contours, _ = cv2.findContours(thresh_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        detected_contours = []
-        nb_actions = 0
-        for contour in contours:
-            if cv2.contourArea(contour) > 1000:
-                nb_actions += 1
-                detected_contours.append(contour)
-                cv2.drawContours(image, [contour], -1, (255, 0, 0), 2)
-
-        print(f"Nombre d'actions techniques détectées (Soustraction d'Arrière-Plan) : {nb_actions}")
-        return nb_actions, detected_contours, image
+            self.updatePoseModel()  # Modèle récupéré dans le pool (construit seulement au premier passage)
 
-    # Nouvelle fonction pour éviter les doublons
-    def remove_duplicate_actions(self, contours1, contours2):
-        final_contours = contours1.copy()
-        for contour2 in contours2:
-            duplicate = False
-            for contour1 in contours1:
-                distance = cv2.pointPolygonTest(contour1, tuple(contour2[0][0]), True)
-                if abs(distance) < 50:
-                    duplicate = True
-                    break
-            if not duplicate:
-                final_contours.append(contour2)
-        return final_contours
-=======
             # Appliquer la détection de pose avec la complexité actuelle
-            img = self.findPose(img, draw=False)
-            self.findPosition(img)
+            self.findPose(frame, draw=False)
+            self.updateLandmarks(frame)
 
             # Si des landmarks sont détectés, alors la personne est trouvée
-            if self.lmList:
-                print(f"Personne détectée avec une complexité de {self.model_complexity}")
+            if self.lmList and not self.landmarks_predicted:
+                log.info("Personne détectée avec une complexité de %d", self.model_complexity)
                 return True, img
 
         # Si aucune détection après avoir testé toutes les complexités
-        print("Aucune personne détectée après avoir testé toutes les complexités.")
+        log.warning("Aucune personne détectée après avoir testé toutes les complexités.")
         return False, img
 
-    def faceDetector(self, img):
+    def parallelSearch(self, img):
+        """Toutes les complexités en même temps, chacune sur son modèle préchauffé du pool.
+
+        BY_DETECTION : la moins coûteuse qui trouve une personne est retenue dès que les
+        complexités inférieures ont échoué ; on n'attend pas les tentatives plus lentes.
+        BY_VISIBILITY : toutes les tentatives sont attendues et la visibilité moyenne des
+        landmarks la plus haute l'emporte.
+        """
+        frame = FrameContext.of(img)
+        self.still = None
+        rgb = self.frameRGB(frame)
+        complexities = range(self.min_complexity, self.max_complexity + 1)
+        if self.search_pool is None:
+            self.search_pool = ThreadPoolExecutor(max_workers=len(complexities), thread_name_prefix="complexity")
+        futures = {self.search_pool.submit(self.attemptComplexity, self.pose_pool.get(c), c, rgb): c
+                   for c in complexities}
+        outcomes = {}  # complexité -> (résultats, visibilité moyenne ou None)
+        best = None
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+            if self.search_by == BY_DETECTION:
+                best = next((c for c in complexities if c not in outcomes or outcomes[c][1] is not None), None)
+                if best in outcomes:
+                    break
+        if self.search_by == BY_VISIBILITY:
+            best = max((c for c in complexities if outcomes[c][1] is not None),
+                       key=lambda c: outcomes[c][1], default=None)
+        abandoned = sum(future.cancel() or not future.done() for future in futures)
+        if abandoned:
+            self.metrics.increment("search_abandoned", abandoned)
+
+        # Les tentatives abandonnées continuent sur leur propre modèle ; l'état du détecteur vient de la retenue
+        self.model_complexity = self.max_complexity if best is None else best
+        self.pose_box = None
+        self.results = outcomes[self.model_complexity][0]
+        self.updateLandmarks(img)
+        if best is None:
+            log.warning("Aucune personne détectée après avoir testé toutes les complexités.")
+            return False, img
+        log.info("Personne détectée avec une complexité de %d", self.model_complexity)
+        return True, img
+
+    def attemptComplexity(self, model, complexity, rgb):
+        """Tentative d'un thread de recherche : (résultats, visibilité moyenne ou None)"""
+        # Un modèle Mediapipe ne traite qu'une image à la fois (tentative abandonnée encore en cours)
+        with self.search_locks[complexity], self.metrics.timer(f"process.pose_{complexity}"):
+            results = model.process(rgb)
+        if not results.pose_landmarks:
+            return results, None
+        return results, float(np.mean([lm.visibility for lm in results.pose_landmarks.landmark]))
+
+    def faceDetector(self, img, draw=True):
         """Détecte les visages dans l'image, affiche un carré et la probabilité"""
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        results = self.face_detection.process(imgRGB)
+        frame = FrameContext.of(img)
+        h, w, c = img.shape
+        # Avec le suivi de région, seule la zone de la tête est traitée
+        box = self.roi.headBox(self.landmarks, img.shape) if self.roi is not None else None
+        key = self.stillKey(frame)
+        cached = self.cachedSection(key, "faces")
+        if cached is not None:
+            self.faces = cached
+        else:
+            rgb = self.frameRGB(frame)
+            with self.metrics.timer("process.face"):
+                if box is None:
+                    box = (0, 0, w, h)
+                    results = self.face_detection.process(rgb)
+                else:
+                    results = self.face_detection.process(crop(rgb, box))
+
+            self.faces = []
+            if results.detections:
+                x0, y0 = box[0], box[1]
+                bw, bh = box[2] - box[0], box[3] - box[1]
+                for detection in results.detections:
+                    bboxC = detection.location_data.relative_bounding_box
+                    bbox = int(bboxC.xmin * bw) + x0, int(bboxC.ymin * bh) + y0, \
+                           int(bboxC.width * bw), int(bboxC.height * bh)
+                    self.faces.append({"bbox": bbox, "score": detection.score[0]})
+            if key is not None:
+                self.result_cache.put(key, "faces", self.faces)
 
         # Si un visage est détecté, dessiner un carré autour et afficher la probabilité
-        if results.detections:
-            for detection in results.detections:
-                bboxC = detection.location_data.relative_bounding_box
-                h, w, c = img.shape
-                bbox = int(bboxC.xmin * w), int(bboxC.ymin * h), \
-                       int(bboxC.width * w), int(bboxC.height * h)
-                # Dessiner un carré autour du visage
-                cv2.rectangle(img, (bbox[0], bbox[1]), (bbox[0] + bbox[2], bbox[1] + bbox[3]), (0, 255, 0), 2)
-                # Afficher la probabilité de détection du visage
-                confidence = detection.score[0]
-                cv2.putText(img, f"{int(confidence * 100)}% Face", (bbox[0], bbox[1] - 10),
-                            cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
-            return True, img  # Continuer le traitement si un visage est détecté
-        return False, img
-
-    def detectGrasping(self, img):
-        """Détecte si une main saisit un objet (grasping)"""
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(imgRGB)
-
-        if results.multi_hand_landmarks:
-            for handLms in results.multi_hand_landmarks:
-                mp.solutions.drawing_utils.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
-                # Extraction des positions des articulations des doigts
-                hand_points = [(lm.x, lm.y) for lm in handLms.landmark]
-                
-                # Vérification de la position des doigts
-                if self.isGrasping(hand_points):
-                    cv2.putText(img, "Grasping Detected", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                    return True, img
-        return False, img
-
-    def isGrasping(self, hand_points):
-        """Logique simplifiée pour détecter si la main est en train de saisir (pli des doigts)"""
-        # Vérification des conditions pour le grasping
-        # L'index 8 correspond à l'extrémité de l'index, et l'index 6 au milieu de l'index
-        # Si l'extrémité du doigt est plus proche de la paume que le milieu du doigt -> doigt plié
-        index_flexion = hand_points[8][1] > hand_points[6][1]  # L'index est plié
+        if draw and not self.headless:
+            with self.metrics.timer("draw"):
+                Overlay.drawFaces(frame.bgr, self.faces)
+        return bool(self.faces), img  # Continuer le traitement si un visage est détecté
+
+    def detectGrasping(self, img, draw=True):
+        """Détecte si une main saisit un objet (grasping) ; toutes les mains sont dans self.hands_state"""
+        frame = FrameContext.of(img)
+        # Le modèle de main ne voit que les zones autour des poignets 15/16 de la pose ;
+        # image entière seulement si aucune pose n'est disponible
+        key = self.stillKey(frame)
+        cached = self.cachedSection(key, "hands")
+        if cached is not None:
+            # Identifiants de suivi attribués par le suivi de ce détecteur, pas ceux de l'analyse en cache
+            ids = self.hand_analyzer.tracker.update(np.array([hand["landmarks"][0, :2] for hand in cached],
+                                                             dtype=np.float32))
+            self.hands_state = [dict(hand, id=int(hand_id)) for hand, hand_id in zip(cached, ids)]
+        else:
+            boxes = self.wrist_regions.wristBoxes(self.landmarks, img.shape)
+            rgb = self.frameRGB(frame)
+            with self.metrics.timer("process.hands"):
+                if boxes:
+                    detections = [(box, self.wrist_hands.get(side).process(crop(rgb, box)))
+                                  for side, box in boxes.items()]
+                else:
+                    detections = [(None, self.hands.process(rgb))]
+
+            hands = []
+            for box, results in detections:
+                for handLms in results.multi_hand_landmarks or []:
+                    # Extraction des positions des articulations des doigts
+                    points = np.array([(lm.x, lm.y, lm.z) for lm in handLms.landmark], dtype=np.float32)
+                    if box is not None:
+                        to_full_frame(points, box, img.shape)
+                    hands.append(points)
+            # Classification vectorisée de toutes les mains (pince, prise de force, main ouverte)
+            self.hands_state = self.hand_analyzer.analyze(np.array(hands, dtype=np.float32), img.shape)
+            if key is not None:
+                self.result_cache.put(key, "hands", [{name: value for name, value in hand.items() if name != "id"}
+                                                     for hand in self.hands_state])
+
+        if draw and not self.headless:
+            with self.metrics.timer("draw"):
+                Overlay.drawHands(frame.bgr, self.hands_state)
+        return any(hand["grasping"] for hand in self.hands_state), img
+
+    def isGrasping(self, hand_points, img_shape=None):
+        """Vrai si la main (21, 2 ou 3) tient un objet (pince ou prise de force), quelle que soit son orientation.
+
+        Points en pixels, ou normalisés avec img_shape (mise à l'échelle avant classification).
+        """
+        scale = None if img_shape is None else (img_shape[1], img_shape[0], img_shape[1])
+        grips, _, _ = classify_grips(np.asarray(hand_points, dtype=np.float32)[None],
+                                     self.hand_analyzer.power_flexion, self.hand_analyzer.pinch_threshold, scale)
+        return bool(grips[0] != OPEN)
+
+    def analyze(self, img, face=None, hands=None, pose=None):
+        """Analyse complète d'une frame sans toucher aux pixels.
+
+        Retourne un dictionnaire de résultats structurés (copies indépendantes de la frame
+        suivante) ; le rendu se fait ensuite avec Overlay.drawResults si la frame est affichée.
+        Une seule conversion BGR -> RGB est faite pour les trois modèles.
+        Avec un contrôleur adaptatif, la pose peut être réutilisée ou extrapolée et les modèles
+        de visage/mains sautés (leurs derniers résultats sont alors conservés).
+        pose=False réutilise les landmarks déjà calculés (ex. après tryDifferentComplexities).
+        Par défaut (None), chaque modèle tourne s'il fait partie des capacités déclarées.
+        """
+        face = FACE in self.capabilities if face is None else face
+        hands = HANDS in self.capabilities if hands is None else hands
+        pose = POSE in self.capabilities if pose is None else pose
+        frame = FrameContext.of(img)
+        # Scène immobile : aucun modèle ne tourne, les derniers résultats sont réutilisés
+        gated = self.motion_gate is not None and not self.gateCheck(frame)
+        plan = self.controller.plan() if self.controller is not None and not gated else None
+        if plan is not None and plan["complexity"] != self.model_complexity:
+            self.model_complexity = plan["complexity"]
+            self.updatePoseModel()
+
+        pose_mode = "run" if plan is None else plan["pose"]
+        if not pose or gated:
+            pose_mode = "reuse"
+        detected = None  # Détection réelle sur cette frame (None : la pose n'a pas tourné)
+        if pose_mode == "run":
+            with self.stageTimer(f"pose_{self.model_complexity}"):
+                self.findPose(frame, draw=False)
+                self.updateLandmarks(frame, draw=False)
+            detected = bool(self.landmarks) and not self.landmarks_predicted
+            if self.landmarks_predicted:
+                pose_mode = "interpolate"
+            if self.controller is not None:
+                if detected:
+                    self.controller.observe(self.landmarks.data)
+                else:
+                    self.controller.forget()  # Pas de squelette fantôme extrapolé d'un historique périmé
+        elif pose_mode == "interpolate":
+            predicted = self.controller.predict()
+            if predicted is None:
+                self.landmarks.clear()
+            else:
+                self.landmarks.fillArray(predicted, frame.shape)
+
+        found = bool(self.landmarks)
+        result = {
+            "complexity": self.model_complexity,
+            "pose": pose_mode,
+            "landmarks": self.landmarks.data.copy() if found else None,
+            "pixels": self.landmarks.pixels.copy() if found else None,
+            "angles": self.findAngles(frame.shape),
+            "rula": self.scorePosture(frame.shape),
+            "faces": [],
+            "hands": [],
+            "gate": self.motion_gate.decision if self.motion_gate is not None else None,
+        }
+        if face:
+            if not gated and (plan is None or plan["face"]):
+                with self.stageTimer("face"):
+                    self.faceDetector(frame, draw=False)
+            result["faces"] = self.faces
+        if hands:
+            if not gated and (plan is None or plan["hands"]):
+                with self.stageTimer("hands"):
+                    self.detectGrasping(frame, draw=False)
+            result["hands"] = self.hands_state
+
+        if gated:
+            return result
+        if self.motion_gate is not None and pose_mode == "run":
+            self.motion_gate.report(found)
+        if self.controller is not None:
+            self.controller.report(detected)
+        return result
+
+    def stageTimer(self, stage):
+        """Chronomètre d'étape du contrôleur adaptatif (sans effet s'il n'y en a pas)"""
+        return self.controller.timer(stage) if self.controller is not None else nullcontext()
+
+    def updateComplexityOnDetection(self, detection_success):
+        """Mettre à jour la complexité en fonction de la réussite ou de l'échec de la détection"""
+        if self.controller is None:
+            self.controller = AdaptiveController(min_complexity=self.min_complexity,
+                                                 max_complexity=self.max_complexity,
+                                                 complexity=self.model_complexity)
+        complexity = self.controller.report(detection_success)
+        if complexity != self.model_complexity:
+            self.model_complexity = complexity
+            self.updatePoseModel()
+        return complexity
 
-        # Même logique pour les autres doigts
-        middle_flexion = hand_points[12][1] > hand_points[10][1]  # Le majeur est plié
-        ring_flexion = hand_points[16][1] > hand_points[14][1]  # L'annulaire est plié
-        pinky_flexion = hand_points[20][1] > hand_points[18][1]  # L'auriculaire est plié
+    def findAngles(self, img_shape=None, min_visibility=None):
+        """Calcule tous les angles de Landmarks.py pour la frame courante (vecteur dans l'ordre de angle_engine.names)"""
+        if not self.landmarks:
+            return None
+        with self.metrics.timer("angles"):
+            self.angles = self.angle_engine.computeLandmarks(self.landmarks, img_shape, min_visibility)
+        return self.angles
 
-        # Si la majorité des doigts sont pliés, on considère cela comme une prise en main (grasping)
-        return index_flexion and middle_flexion and ring_flexion and pinky_flexion
+    def scorePosture(self, img_shape):
+        """Score RULA de la frame courante (None si aucune personne)"""
+        if not self.landmarks:
+            return None
+        return self.rula.scoreLandmarks(self.landmarks, img_shape)
 
-    def displayBodyAngles(self, img):
+    def displayBodyAngles(self, img, names=("left_elbow", "right_elbow")):
         """Affiche les angles des articulations du corps (ex. coudes, genoux)"""
-        landmarks = {
-            "left_elbow": [11, 13, 15],  # Épaule gauche, coude gauche, poignet gauche
-            "right_elbow": [12, 14, 16],  # Épaule droite, coude droit, poignet droit
-        }
+        angles = self.findAngles(img.shape)
+        if angles is None or self.headless:
+            return
 
-        for angle_name, points in landmarks.items():
-            angle = self.findAngle(img, points[0], points[1], points[2])
-            if angle is not None:
-                cv2.putText(img, f"{angle_name}: {int(angle)}°", (points[1] - 10, points[2] - 10),
-                            cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 0), 2)
+        with self.metrics.timer("draw"):
+            Overlay.drawAngles(FrameContext.of(img).bgr, self.landmarks.pixels, angles, self.angle_engine, names)
 
     def findAngle(self, img, p1, p2, p3, draw=True):
-        if p1 < len(self.lmList) and p2 < len(self.lmList) and p3 < len(self.lmList):
+        """Angle (0-180°) au point p2 entre les segments p2-p1 et p2-p3"""
+        if p1 < len(self.landmarks) and p2 < len(self.landmarks) and p3 < len(self.landmarks):
             # Récupérer les coordonnées des points de repère
-            x1, y1 = self.lmList[p1][1:]
-            x2, y2 = self.lmList[p2][1:]
-            x3, y3 = self.lmList[p3][1:]
+            a, b, c = self.landmarks.pixels[[p1, p2, p3]]
+            angle = float(angle_between(a, b, c))
 
-            # Calculer l'angle
-            angle = math.degrees(math.atan2(y3 - y2, x3 - x2) - math.atan2(y1 - y2, x1 - x2))
-            if angle < 0:
-                angle += 360
-
-            if draw:
-                cv2.circle(img, (x1, y1), 5, (255, 0, 255), cv2.FILLED)
-                cv2.circle(img, (x2, y2), 5, (255, 0, 255), cv2.FILLED)
-                cv2.circle(img, (x3, y3), 5, (255, 0, 255), cv2.FILLED)
-                cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 2)
-                cv2.line(img, (x3, y3), (x2, y2), (255, 0, 255), 2)
-                cv2.putText(img, str(int(angle)), (x2 - 50, y2 + 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
+            if draw and not self.headless:
+                with self.metrics.timer("draw"):
+                    self.drawAngle(img, p1, p2, p3, angle)
 
             return angle
         else:
             return None
->>>>>>> ea4b0d0b024278fa7b79c01727cb0ec72e8be57a
+
+    def drawAngle(self, img, p1, p2, p3, angle):
+        """Dessine les deux segments de l'angle et sa valeur"""
+        img = FrameContext.of(img).bgr
+        (x1, y1), (x2, y2), (x3, y3) = self.landmarks.pixels[[p1, p2, p3]].tolist()
+        cv2.circle(img, (x1, y1), 5, (255, 0, 255), cv2.FILLED)
+        cv2.circle(img, (x2, y2), 5, (255, 0, 255), cv2.FILLED)
+        cv2.circle(img, (x3, y3), 5, (255, 0, 255), cv2.FILLED)
+        cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 2)
+        cv2.line(img, (x3, y3), (x2, y2), (255, 0, 255), 2)
+        cv2.putText(img, str(int(angle)), (x2 - 50, y2 + 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
+
+    # Nouvelle fonction pour détecter les actions techniques par contours
+    def detect_actions_from_movement(self, image):
+        key = self.stillKey(image)
+        detected_contours = self.cachedSection(key, "contours")
+        if detected_contours is None:
+            gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            blurred_image = cv2.GaussianBlur(gray_image, (5, 5), 0)
+            edges = cv2.Canny(blurred_image, 50, 150)
+            _, thresh_image = cv2.threshold(edges, 127, 255, cv2.THRESH_BINARY)
+
+            contours, _ = cv2.findContours(thresh_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            detected_contours = [contour for contour in contours if cv2.contourArea(contour) > 1000]
+            if key is not None:
+                self.result_cache.put(key, "contours", detected_contours)
+        nb_actions = len(detected_contours)
+        if not self.headless:
+            cv2.drawContours(image, detected_contours, -1, (0, 255, 0), 2)
+
+        log.info("Nombre d'actions techniques détectées (Contours) : %d", nb_actions)
+        return nb_actions, detected_contours, image
+
+    # Nouvelle fonction pour la soustraction d'arrière-plan
+    def detect_actions_with_bg_subtraction(self, image, bg_subtractor):
+        fg_mask = bg_subtractor.apply(image)
+        _, thresh_image = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
+        contours, _ = cv2.findContours(thresh_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        detected_contours = []
+        nb_actions = 0
+        for contour in contours:
+            if cv2.contourArea(contour) > 1000:
+                nb_actions += 1
+                detected_contours.append(contour)
+                if not self.headless:
+                    cv2.drawContours(image, [contour], -1, (255, 0, 0), 2)
+
+        log.info("Nombre d'actions techniques détectées (Soustraction d'Arrière-Plan) : %d", nb_actions)
+        return nb_actions, detected_contours, image
+
+    # Nouvelle fonction pour éviter les doublons
+    def remove_duplicate_actions(self, contours1, contours2, iou_threshold=0.1, distance=50):
+        """Fusionne les détections des deux méthodes qui se recouvrent ou sont à moins de `distance` px.
+
+        Index spatial par grille : coût quasi linéaire en nombre de contours. Retourne une région
+        (enveloppe convexe) par groupe de détections fusionnées.
+        """
+        return merge_contours(list(contours1) + list(contours2), iou_threshold, distance)
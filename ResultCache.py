@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from importlib import metadata
+
+import numpy as np
+
+from Metrics import get_logger
+
+log = get_logger("ResultCache")
+
+# Version du format des entrées : à incrémenter si leur contenu change
+CACHE_FORMAT = 2
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "posture_results")
+
+
+def mediapipe_version():
+    """Version de Mediapipe installée, sans importer le paquet"""
+    try:
+        return metadata.version("mediapipe")
+    except metadata.PackageNotFoundError:
+        return "absent"
+
+
+class ResultCache:
+    """Cache disque des résultats d'analyse d'images fixes, indexé par le contenu de l'image.
+
+    La clé est le SHA-256 des pixels (forme et type compris) et de la configuration du
+    détecteur (complexités, seuils de confiance et de prise, version de Mediapipe) : modifier
+    l'image ou un réglage donne une autre clé, jamais un résultat périmé.
+    Chaque section d'une image ("pose", "faces", "hands", "contours") est un fichier distinct,
+    écrit d'un bloc (fichier temporaire puis os.replace) : plusieurs processus peuvent partager
+    le même dossier sans lecture-modification-écriture. Éviction LRU par date d'accès ; le
+    dossier n'est parcouru que lorsque la taille estimée dépasse `max_bytes` (ou toutes les
+    `evict_every` écritures, pour tenir compte des autres processus), et l'éviction descend
+    alors sous `low_water` x max_bytes.
+    Le format est pickle : ne pointer que vers un dossier de confiance.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=64 * 1024 * 1024, evict_every=256, low_water=0.8):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.low_water = low_water
+        os.makedirs(directory, exist_ok=True)
+        self.puts = 0
+        self.estimated_bytes = self.size
+
+    @staticmethod
+    def key(img, config):
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"format": CACHE_FORMAT, "shape": img.shape, "dtype": str(img.dtype),
+                                  "config": config}, sort_keys=True).encode())
+        digest.update(np.ascontiguousarray(img))
+        return digest.hexdigest()
+
+    def path(self, key, section):
+        return os.path.join(self.directory, f"{key}.{section}.pkl")
+
+    def get(self, key, section):
+        """Section en cache pour l'image ; None si absente"""
+        path = self.path(key, section)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+            os.utime(path)  # Date d'accès pour l'éviction LRU
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            log.warning("Entrée de cache illisible %s : %s", path, e)
+            return None
+        return value
+
+    def put(self, key, section, value):
+        """Enregistre une section de l'image (écriture atomique)"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+                written = file.tell()
+            os.replace(tmp, self.path(key, section))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.puts += 1
+        self.estimated_bytes += written
+        if self.estimated_bytes > self.max_bytes or self.puts % self.evict_every == 0:
+            self.evict()
+
+    def entries(self):
+        """[(date d'accès, taille, chemin)] du plus ancien au plus récent"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue  # Supprimée entre-temps par un autre processus
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(self.directory, name)))
+        return sorted(entries)
+
+    def evict(self):
+        """Supprime les sections les moins récemment utilisées si le dossier dépasse max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in entries:
+                if total <= self.max_bytes * self.low_water:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        self.estimated_bytes = total
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.estimated_bytes = 0
+
+    def __len__(self):
+        return len(self.entries())
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
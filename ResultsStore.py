@@ -0,0 +1,163 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from LandmarkArray import NUM_LANDMARKS
+from Landmarks import landmarks as LANDMARK_TRIPLETS
+from Metrics import get_logger
+
+log = get_logger("ResultsStore")
+
+# Zone de risque inconnue (pas d'angle calculé pour cette frame)
+NO_ZONE = -1
+
+
+def record_dtype(num_angles):
+    """Format binaire d'une ligne de résultats (taille fixe, donc accès direct par index)"""
+    return np.dtype([
+        ("timestamp", "<f8"),        # Secondes (time.time()), croissant dans un fichier
+        ("frame", "<u8"),            # Numéro de frame
+        ("source", "<i4"),           # Caméra ou opérateur
+        ("actions", "<i4"),          # Nombre d'actions techniques
+        ("landmarks", "<f4", (NUM_LANDMARKS, 4)),
+        ("angles", "<f4", (num_angles,)),
+        ("zones", "i1", (num_angles,)),
+    ])
+
+
+class ResultsWriter:
+    """Enregistrement des résultats par frame dans un fichier binaire en ajout seul.
+
+    Chaque frame est copiée dans un lot préalloué ; les lots pleins (ou trop anciens) sont écrits
+    par un thread d'arrière-plan, hors du chemin critique. Un fichier JSON voisin décrit le format.
+    """
+
+    def __init__(self, path, angle_names=None, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.angle_names = list(LANDMARK_TRIPLETS) if angle_names is None else list(angle_names)
+        self.dtype = record_dtype(len(self.angle_names))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._write_header()
+        self.batch = np.zeros(batch_size, dtype=self.dtype)
+        self.count = 0
+        self.batch_started = time.monotonic()
+        self.last_timestamp = -np.inf
+        if os.path.exists(path) and os.path.getsize(path) >= self.dtype.itemsize:
+            # Reprise d'un fichier existant : les nouvelles lignes doivent suivre la dernière
+            self.last_timestamp = ResultsReader(path).records["timestamp"][-1]
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def _write_header(self):
+        header = {"dtype": self.dtype.descr, "angle_names": self.angle_names,
+                  "num_landmarks": NUM_LANDMARKS, "version": 1}
+        header_path = self.path + ".json"
+        if os.path.exists(header_path):
+            with open(header_path) as file:
+                existing = json.load(file)
+            if existing["angle_names"] != self.angle_names:
+                raise ValueError(f"{self.path} a été créé avec d'autres angles : {existing['angle_names']}")
+            return
+        with open(header_path, "w") as file:
+            json.dump(header, file)
+
+    def append(self, timestamp=None, frame=0, landmarks=None, angles=None, zones=None, actions=0, source=0):
+        """Ajoute une frame (copie dans le lot courant, sans E/S).
+
+        Sans timestamp, l'horloge murale est utilisée et bornée au dernier horodatage : un recul
+        de l'horloge (ajustement NTP) n'interrompt pas un enregistrement en direct. Un timestamp
+        explicite décroissant lève ValueError.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+            if timestamp < self.last_timestamp:
+                log.warning("Recul de l'horloge de %.3f s, horodatage borné au précédent",
+                            self.last_timestamp - timestamp)
+                timestamp = self.last_timestamp
+        elif timestamp < self.last_timestamp:
+            raise ValueError("Les horodatages doivent être croissants dans un fichier de résultats")
+        self.last_timestamp = timestamp
+        row = self.batch[self.count]
+        row["timestamp"] = timestamp
+        row["frame"] = frame
+        row["source"] = source
+        row["actions"] = actions
+        row["landmarks"] = np.nan if landmarks is None else landmarks
+        row["angles"] = np.nan if angles is None else angles
+        row["zones"] = NO_ZONE if zones is None else zones
+        self.count += 1
+        if self.count == self.batch_size or time.monotonic() - self.batch_started > self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Confie le lot courant au thread d'écriture"""
+        if self.count:
+            self.pending.put(self.batch[:self.count])
+            self.batch = np.zeros(self.batch_size, dtype=self.dtype)
+            self.count = 0
+        self.batch_started = time.monotonic()
+
+    def _write_loop(self):
+        with open(self.path, "ab") as file:
+            while True:
+                batch = self.pending.get()
+                if batch is None:
+                    return
+                file.write(batch.tobytes())
+                file.flush()
+
+    def close(self):
+        self.flush()
+        self.pending.put(None)
+        self.writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultsReader:
+    """Lecture d'un fichier de résultats par projection mémoire (np.memmap).
+
+    Les horodatages étant croissants, une plage de temps est trouvée par recherche dichotomique :
+    seules les pages nécessaires du fichier sont lues.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path + ".json") as file:
+            header = json.load(file)
+        self.angle_names = header["angle_names"]
+        self.dtype = record_dtype(len(self.angle_names))
+        self.refresh()
+
+    def refresh(self):
+        """Prend en compte les lignes ajoutées depuis l'ouverture"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        count = size // self.dtype.itemsize
+        self.records = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(count,)) if count else \
+            np.zeros(0, dtype=self.dtype)
+        return self
+
+    def __len__(self):
+        return len(self.records)
+
+    def range(self, start=None, end=None):
+        """Lignes dont l'horodatage est dans [start, end) (vue, sans copie)"""
+        timestamps = self.records["timestamp"]
+        first = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        last = len(self.records) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        return self.records[first:last]
+
+    def angle(self, name, start=None, end=None):
+        """Série temporelle d'un angle : (horodatages, valeurs)"""
+        rows = self.range(start, end)
+        return rows["timestamp"], rows["angles"][:, self.angle_names.index(name)]
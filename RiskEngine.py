@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+
+from Landmarks import landmarks as LANDMARK_TRIPLETS
+
+GREEN, ORANGE, RED = 0, 1, 2
+NO_ZONE = -1  # Angle non calculé ou articulation sans seuils
+ZONE_NAMES = {GREEN: "Zone verte", ORANGE: "Zone orange", RED: "Zone rouge", NO_ZONE: "Non classé"}
+
+# Seuils indicatifs par articulation, sur l'angle intérieur (0-180°) calculé par AngleEngine :
+# (vert_min, vert_max, orange_min, orange_max). Hors de la plage orange : zone rouge.
+# Les plages sont contiguës : il n'existe aucune valeur non classée (contrairement à l'ancien 16-17°).
+DEFAULT_THRESHOLDS = {
+    "left_elbow": (80, 120, 45, 160),
+    "right_elbow": (80, 120, 45, 160),
+    "left_shoulder": (0, 20, 0, 60),
+    "right_shoulder": (0, 20, 0, 60),
+    "left_wrist": (165, 180, 150, 180),
+    "right_wrist": (165, 180, 150, 180),
+    "spine": (80, 100, 70, 110),
+    "left_knee": (150, 180, 120, 180),
+    "right_knee": (150, 180, 120, 180),
+    "left_hip": (150, 180, 120, 180),
+    "right_hip": (150, 180, 120, 180),
+}
+
+
+class RiskEngine:
+    """Classification vert/orange/rouge de toutes les articulations et statistiques d'exposition.
+
+    `update` classe le vecteur d'angles d'une frame en une opération vectorisée, puis met à jour
+    des cumuls de taille fixe par articulation (temps passé dans chaque zone, épisode rouge en cours
+    et plus long épisode rouge) : la mémoire ne grandit pas avec la durée du poste.
+    """
+
+    def __init__(self, names=None, thresholds=None):
+        self.names = list(LANDMARK_TRIPLETS) if names is None else list(names)
+        thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+        table = np.array([thresholds.get(name, (np.nan,) * 4) for name in self.names], dtype=np.float32)
+        self.green_lo, self.green_hi, self.orange_lo, self.orange_hi = table.T
+        self.classified = ~np.isnan(self.green_lo)
+        self.reset()
+
+    def reset(self):
+        count = len(self.names)
+        self.time_in_zone = np.zeros((count, 3))  # Secondes passées en vert / orange / rouge
+        self.red_run = np.zeros(count)  # Durée de l'épisode rouge en cours
+        self.longest_red = np.zeros(count)  # Plus long épisode rouge continu
+        self.red_episodes = np.zeros(count, dtype=np.int64)
+        self.in_red = np.zeros(count, dtype=bool)
+        self.frames = 0
+        self.last_timestamp = None
+
+    def classify(self, angles):
+        """Zones (..., K) pour des angles (..., K), y compris sur un lot de frames"""
+        angles = np.asarray(angles, dtype=np.float32)
+        with np.errstate(invalid="ignore"):
+            in_green = (angles >= self.green_lo) & (angles <= self.green_hi)
+            in_orange = (angles >= self.orange_lo) & (angles <= self.orange_hi)
+        # Le vert l'emporte sur l'orange, même si une table personnalisée ne l'inclut pas dans l'orange
+        zones = np.select([in_green, in_orange], [GREEN, ORANGE], RED).astype(np.int8)
+        zones[..., ~self.classified] = NO_ZONE
+        zones[np.isnan(angles)] = NO_ZONE
+        return zones
+
+    def update(self, angles, timestamp=None, dt=None):
+        """Classe une frame et cumule l'exposition ; retourne les zones (K,)"""
+        zones = self.classify(angles)
+        if dt is None:
+            timestamp = time.monotonic() if timestamp is None else timestamp
+            dt = 0.0 if self.last_timestamp is None else timestamp - self.last_timestamp
+            self.last_timestamp = timestamp
+        self.frames += 1
+
+        known = zones >= 0
+        rows = np.flatnonzero(known)
+        self.time_in_zone[rows, zones[known]] += dt
+        red = zones == RED
+        self.red_episodes += red & ~self.in_red
+        self.in_red = red
+        self.red_run = np.where(red, self.red_run + dt, 0.0)
+        np.maximum(self.longest_red, self.red_run, out=self.longest_red)
+        return zones
+
+    def summary(self):
+        """Statistiques d'exposition par articulation"""
+        total = self.time_in_zone.sum(axis=1, keepdims=True)
+        share = np.divide(self.time_in_zone, total, out=np.zeros_like(self.time_in_zone), where=total > 0)
+        return {name: {"green_s": float(self.time_in_zone[i, GREEN]), "orange_s": float(self.time_in_zone[i, ORANGE]),
+                       "red_s": float(self.time_in_zone[i, RED]), "red_share": float(share[i, RED]),
+                       "longest_red_s": float(self.longest_red[i]), "red_episodes": int(self.red_episodes[i])}
+                for i, name in enumerate(self.names) if self.classified[i]}
@@ -0,0 +1,125 @@
+import numpy as np
+
+HEAD_LANDMARKS = list(range(11))  # Nez, yeux, oreilles, bouche
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+
+
+def padded_box(points, img_shape, padding=0.25, min_size=32):
+    """Boîte (x0, y0, x1, y1) en pixels englobant les points (n, 2), élargie de `padding` et bornée à l'image"""
+    h, w = img_shape[:2]
+    (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+    pad = max(x1 - x0, y1 - y0, min_size) * padding
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    half_w = max(x1 - x0, min_size) / 2 + pad
+    half_h = max(y1 - y0, min_size) / 2 + pad
+    box = (int(max(cx - half_w, 0)), int(max(cy - half_h, 0)),
+           int(min(cx + half_w, w)), int(min(cy + half_h, h)))
+    if box[2] - box[0] < 2 or box[3] - box[1] < 2:
+        return None
+    return box
+
+
+def crop(img, box):
+    """Sous-image contiguë correspondant à la boîte (Mediapipe exige un buffer contigu)"""
+    x0, y0, x1, y1 = box
+    return np.ascontiguousarray(img[y0:y1, x0:x1])
+
+
+def to_full_frame(points, box, img_shape):
+    """Ramène en place des coordonnées normalisées dans la boîte vers l'image entière.
+
+    points : tableau (n, >=2) ; la colonne z éventuelle est exprimée à l'échelle de la largeur,
+    elle est donc aussi remise à l'échelle.
+    """
+    h, w = img_shape[:2]
+    x0, y0, x1, y1 = box
+    points[:, 0] = (points[:, 0] * (x1 - x0) + x0) / w
+    points[:, 1] = (points[:, 1] * (y1 - y0) + y0) / h
+    if points.shape[1] > 2:
+        points[:, 2] *= (x1 - x0) / w
+    return points
+
+
+def contains(outer, inner):
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def box_area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+class RoiTracker:
+    """Région d'intérêt suivie d'une frame à l'autre à partir des landmarks de pose.
+
+    La boîte de la personne est élargie de `padding` et n'est recalculée que lorsque les landmarks
+    sortent de la zone courante (crop stable). Sans landmarks, `box` vaut None : détection plein cadre.
+    """
+
+    def __init__(self, padding=0.25, min_visibility=0.5, min_size=64):
+        self.padding = padding
+        self.min_visibility = min_visibility
+        self.min_size = min_size
+        self.box = None
+        self.pixels_processed = 0  # Statistiques : pixels réellement envoyés aux modèles
+        self.pixels_total = 0
+
+    def reset(self):
+        self.box = None
+
+    def update(self, landmarks, img_shape):
+        """Met à jour la région à partir d'un LandmarkArray plein cadre ; retourne la boîte"""
+        if not landmarks:
+            self.box = None
+            return None
+        visible = landmarks.pixels[landmarks.visibility >= self.min_visibility]
+        if len(visible) < 3:
+            self.box = None
+            return None
+        tight = padded_box(visible, img_shape, padding=0, min_size=self.min_size)
+        if self.box is None or tight is None or not contains(self.box, tight):
+            self.box = padded_box(visible, img_shape, self.padding, self.min_size)
+        return self.box
+
+    def cropPose(self, img):
+        """Retourne (image à traiter, boîte) ; boîte None = image entière"""
+        if self.box is None:
+            return img, None
+        return crop(img, self.box), self.box
+
+    def account(self, img_shape, processed):
+        """Statistiques d'une frame, comptée une seule fois même si le modèle a tourné deux fois
+
+        processed : pixels réellement envoyés au modèle de pose (région puis image entière si la
+        personne a été perdue dans la région).
+        """
+        self.pixels_total += img_shape[0] * img_shape[1]
+        self.pixels_processed += processed
+
+    def headBox(self, landmarks, img_shape):
+        """Boîte autour de la tête (landmarks 0 à 10)"""
+        if not landmarks:
+            return None
+        head = landmarks.pixels[HEAD_LANDMARKS][landmarks.visibility[HEAD_LANDMARKS] >= self.min_visibility]
+        if len(head) < 2:
+            return None
+        return padded_box(head, img_shape, padding=0.8, min_size=self.min_size)
+
+    def wristBoxes(self, landmarks, img_shape):
+        """Boîtes autour de chaque poignet visible : {"left": box, "right": box}
+
+        La taille suit la longueur de l'avant-bras pour contenir la main entière.
+        """
+        boxes = {}
+        if not landmarks:
+            return boxes
+        for side, wrist, elbow in (("left", LEFT_WRIST, LEFT_ELBOW), ("right", RIGHT_WRIST, RIGHT_ELBOW)):
+            if landmarks.visibility[wrist] < self.min_visibility:
+                continue
+            center = landmarks.pixels[wrist].astype(np.float32)
+            forearm = np.linalg.norm(center - landmarks.pixels[elbow])
+            half = max(forearm * 0.9, self.min_size / 2)
+            box = padded_box(np.stack([center - half, center + half]), img_shape, padding=0, min_size=self.min_size)
+            if box is not None:
+                boxes[side] = box
+        return boxes
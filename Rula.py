@@ -0,0 +1,137 @@
+import numpy as np
+
+# Indices Mediapipe utilisés pour les segments du corps
+NOSE, LEFT_EAR, RIGHT_EAR = 0, 7, 8
+SHOULDERS, ELBOWS, WRISTS, INDEXES = (11, 12), (13, 14), (15, 16), (19, 20)
+HIPS, KNEES, ANKLES = (23, 24), (25, 26), (27, 28)
+
+# Tables RULA officielles (scores - 1 utilisés comme indices)
+# Table A : [bras, avant-bras, poignet, rotation du poignet]
+TABLE_A = np.array([
+    [[[1, 2], [2, 2], [2, 3], [3, 3]], [[2, 2], [2, 2], [3, 3], [3, 3]], [[2, 3], [2, 3], [3, 3], [4, 4]]],
+    [[[2, 3], [3, 3], [3, 3], [4, 4]], [[3, 3], [3, 3], [3, 4], [4, 4]], [[3, 4], [4, 4], [4, 4], [5, 5]]],
+    [[[3, 3], [4, 4], [4, 4], [5, 5]], [[3, 4], [4, 4], [4, 4], [5, 5]], [[4, 4], [4, 4], [4, 5], [5, 5]]],
+    [[[4, 4], [4, 4], [4, 5], [5, 5]], [[4, 4], [4, 4], [4, 5], [5, 5]], [[4, 4], [4, 5], [5, 5], [6, 6]]],
+    [[[5, 5], [5, 5], [5, 6], [6, 7]], [[5, 6], [6, 6], [6, 7], [7, 7]], [[6, 6], [6, 7], [7, 7], [7, 8]]],
+    [[[7, 7], [7, 7], [7, 8], [8, 9]], [[8, 8], [8, 8], [8, 9], [9, 9]], [[9, 9], [9, 9], [9, 9], [9, 9]]],
+], dtype=np.int8)
+
+# Table B : [cou, tronc, jambes]
+TABLE_B = np.array([
+    [[1, 3], [2, 3], [3, 4], [5, 5], [6, 6], [7, 7]],
+    [[2, 3], [2, 3], [4, 5], [5, 5], [6, 7], [7, 7]],
+    [[3, 3], [3, 4], [4, 5], [5, 6], [6, 7], [7, 7]],
+    [[5, 5], [5, 6], [6, 7], [7, 7], [7, 7], [8, 8]],
+    [[7, 7], [7, 7], [7, 8], [8, 8], [8, 8], [8, 8]],
+    [[8, 8], [8, 8], [8, 8], [8, 9], [9, 9], [9, 9]],
+], dtype=np.int8)
+
+# Table C : [score A (1-8+), score B (1-7+)]
+TABLE_C = np.array([
+    [1, 2, 3, 3, 4, 5, 5],
+    [2, 2, 3, 4, 4, 5, 5],
+    [3, 3, 3, 4, 4, 5, 6],
+    [3, 3, 3, 4, 5, 6, 6],
+    [4, 4, 4, 5, 6, 7, 7],
+    [4, 4, 5, 6, 6, 7, 7],
+    [5, 5, 6, 6, 7, 7, 7],
+    [5, 5, 6, 7, 7, 7, 7],
+], dtype=np.int8)
+
+# Niveaux d'action RULA selon le score final
+ACTION_LEVELS = np.array([0, 1, 1, 2, 2, 3, 3, 4], dtype=np.int8)  # index = score final (1-7)
+
+
+def _segment_angle(u, v):
+    """Angle (degrés, 0-180) entre deux vecteurs (..., 2)"""
+    dot = np.sum(u * v, axis=-1)
+    cross = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+    return np.degrees(np.arctan2(np.abs(cross), dot))
+
+
+def posture_angles(points):
+    """Angles posturaux RULA (degrés) pour des landmarks (..., 33, >=2) en pixels (y vers le bas).
+
+    Retourne un dictionnaire de tableaux (..., 2) pour les côtés gauche/droit (bras, avant-bras,
+    poignet) et (...,) pour le cou et le tronc.
+    """
+    p = np.asarray(points, dtype=np.float32)[..., :2]
+    shoulders, elbows = p[..., SHOULDERS, :], p[..., ELBOWS, :]
+    wrists, indexes, hips = p[..., WRISTS, :], p[..., INDEXES, :], p[..., HIPS, :]
+    mid_shoulder, mid_hip = shoulders.mean(axis=-2), hips.mean(axis=-2)
+    head = p[..., (LEFT_EAR, RIGHT_EAR), :].mean(axis=-2)
+    trunk = mid_shoulder - mid_hip  # Vecteur hanches -> épaules
+    down = -trunk[..., None, :]  # Direction du tronc vers le bas, pour chaque côté
+    upper_arm = elbows - shoulders
+    forearm = wrists - elbows
+    hand = indexes - wrists
+    return {
+        "upper_arm": _segment_angle(down, upper_arm),           # 0 = bras le long du corps
+        "lower_arm": _segment_angle(upper_arm, forearm),        # 0 = bras tendu
+        "wrist": _segment_angle(forearm, hand),                 # 0 = poignet dans l'axe
+        "neck": _segment_angle(trunk, head - mid_shoulder),     # 0 = tête dans l'axe du tronc
+        "trunk": _segment_angle(trunk, np.array([0.0, -1.0], dtype=np.float32)),  # 0 = tronc vertical
+    }
+
+
+class RulaScorer:
+    """Score RULA (1-7) par frame ou sur une session entière, par simple indexation de tables.
+
+    Les angles sont convertis en scores de segment par np.digitize (bornes RULA), puis les tables
+    A, B et C officielles sont indexées directement : aucune logique conditionnelle par frame.
+    Les ajustements non observables par caméra (bras soutenu, charge, rotation du poignet...) sont
+    des paramètres constants.
+    """
+
+    UPPER_ARM_BINS = [20, 45, 90]   # 1 : 0-20°, 2 : 20-45°, 3 : 45-90°, 4 : >90°
+    LOWER_ARM_GOOD = (60, 100)      # 1 : flexion 60-100°, sinon 2
+    WRIST_BINS = [1, 15]            # 1 : neutre, 2 : 0-15°, 3 : >15°
+    NECK_BINS = [10, 20]            # 1 : 0-10°, 2 : 10-20°, 3 : >20°
+    TRUNK_BINS = [1, 20, 60]        # 1 : droit, 2 : 0-20°, 3 : 20-60°, 4 : >60°
+
+    def __init__(self, wrist_twist=1, legs=1, muscle_use=0, force_load=0):
+        self.wrist_twist = wrist_twist
+        self.legs = legs  # 1 : jambes et pieds bien appuyés, 2 sinon
+        self.muscle_use = muscle_use
+        self.force_load = force_load
+
+    def segmentScores(self, angles):
+        upper_arm = np.digitize(angles["upper_arm"], self.UPPER_ARM_BINS) + 1
+        lo, hi = self.LOWER_ARM_GOOD
+        lower_arm = np.where((angles["lower_arm"] >= lo) & (angles["lower_arm"] <= hi), 1, 2)
+        wrist = np.digitize(angles["wrist"], self.WRIST_BINS) + 1
+        neck = np.digitize(angles["neck"], self.NECK_BINS) + 1
+        trunk = np.digitize(angles["trunk"], self.TRUNK_BINS) + 1
+        return {"upper_arm": upper_arm, "lower_arm": lower_arm, "wrist": wrist, "neck": neck, "trunk": trunk}
+
+    def score(self, points):
+        """Scores RULA pour des landmarks (33, D) ou une session (N, 33, D) en pixels.
+
+        Retourne un dictionnaire : "score" (final, 1-7), "action_level" (1-4), "score_a" (pire côté),
+        "score_b", et les scores par segment.
+        """
+        s = self.segmentScores(posture_angles(points))
+        score_a = TABLE_A[s["upper_arm"] - 1, s["lower_arm"] - 1, s["wrist"] - 1, self.wrist_twist - 1]
+        score_a = score_a.max(axis=-1) + self.muscle_use + self.force_load  # Côté le plus exposé
+        score_b = TABLE_B[s["neck"] - 1, s["trunk"] - 1, self.legs - 1] + self.muscle_use + self.force_load
+        final = TABLE_C[np.clip(score_a, 1, 8) - 1, np.clip(score_b, 1, 7) - 1]
+        return dict(s, score=final, action_level=ACTION_LEVELS[final], score_a=score_a, score_b=score_b)
+
+    def scoreLandmarks(self, landmarks, img_shape):
+        """Score d'une frame à partir d'un LandmarkArray"""
+        h, w = img_shape[:2]
+        return self.score(landmarks.xy * (w, h))
+
+    def scoreSession(self, landmarks, img_shape, valid=None):
+        """Scores d'une session enregistrée (N, 33, >=2) normalisée, en une passe.
+
+        Les frames invalides (sans personne, landmarks NaN) reçoivent un score 0.
+        """
+        h, w = img_shape[:2]
+        points = np.asarray(landmarks, dtype=np.float32)[..., :2] * (w, h)
+        if valid is None:
+            valid = ~np.isnan(points).any(axis=(-1, -2))
+        result = self.score(np.nan_to_num(points))
+        result["score"] = np.where(valid, result["score"], 0)
+        result["action_level"] = np.where(valid, result["action_level"], 0)
+        return result
@@ -0,0 +1,206 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Entête partagé (int64) : numéro de la dernière frame écrite et géométrie du tampon
+WRITE_SEQ, SLOTS, HEIGHT, WIDTH, CHANNELS, MAX_READERS = range(6)
+HEADER_SIZE = 8
+
+
+class FrameLease:
+    """Frame prêtée par l'anneau, sans copie : vue en lecture seule sur la mémoire partagée.
+
+    Tant que le prêt n'est pas rendu (`release()` ou fin du bloc `with`), l'écrivain n'écrase
+    pas l'emplacement (sauf si tous les emplacements sont prêtés). `valid()` vérifie par
+    numéro de version (seqlock) que la frame n'a pas été réécrite entre-temps.
+    Pour dessiner sur la frame, en faire une copie.
+    """
+
+    def __init__(self, ring, slot, seq, timestamp, version):
+        self.ring = ring
+        self.slot = slot
+        self.seq = seq
+        self.timestamp = timestamp
+        self.version = version
+        self.frame = ring.readonly[slot]
+        self.released = False
+
+    def valid(self):
+        return not self.released and self.ring.versions[self.slot] == self.version
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            with self.ring.cond:
+                self.ring.pins[self.slot] -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedFrameRing:
+    """Anneau de frames à emplacements fixes dans multiprocessing.shared_memory.
+
+    La capture écrit chaque frame une seule fois ; un nombre quelconque de consommateurs
+    (processus d'inférence, enregistrement, affichage) la lisent sans copie ni sérialisation.
+    - chaque emplacement porte le numéro de la frame, son horodatage et une version paire au
+      repos, impaire pendant l'écriture (seqlock) ;
+    - l'écrivain remplace la frame la plus ancienne non prêtée (écrasement du plus ancien) ;
+    - les lecteurs enregistrés publient leur position (`reader_positions`) pour suivre leur retard.
+
+    L'objet se transmet tel quel aux processus fils (arguments de Process) : il s'y rattache
+    au même segment de mémoire partagée.
+    """
+
+    def __init__(self, shape, slots=8, dtype=np.uint8, max_readers=8, name=None, cond=None):
+        shape = tuple(shape) if len(shape) == 3 else tuple(shape) + (1,)
+        self.shape, self.slots, self.dtype, self.max_readers = shape, slots, np.dtype(dtype), max_readers
+        self.owner = name is None
+        frame_bytes = int(np.prod(shape)) * self.dtype.itemsize
+        # Entête + versions, numéros, prêts, positions des lecteurs (int64) + horodatages (float64) + frames
+        meta = HEADER_SIZE + 3 * slots + max_readers
+        size = 8 * (meta + slots) + slots * frame_bytes
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            try:
+                # Le segment appartient au créateur : le processus qui s'y rattache ne doit pas le supprimer
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:  # Python < 3.13 : les processus fils partagent le suivi des ressources du créateur
+                self.shm = shared_memory.SharedMemory(name=name)
+        self.cond = cond if cond is not None else multiprocessing.get_context("spawn").Condition()
+
+        buffer = self.shm.buf
+        ints = np.ndarray((meta,), dtype=np.int64, buffer=buffer)
+        self.header = ints[:HEADER_SIZE]
+        self.versions = ints[HEADER_SIZE:HEADER_SIZE + slots]
+        self.sequences = ints[HEADER_SIZE + slots:HEADER_SIZE + 2 * slots]
+        self.pins = ints[HEADER_SIZE + 2 * slots:HEADER_SIZE + 3 * slots]
+        self.reader_positions = ints[HEADER_SIZE + 3 * slots:]
+        self.timestamps = np.ndarray((slots,), dtype=np.float64, buffer=buffer, offset=8 * meta)
+        self.frames = np.ndarray((slots,) + shape, dtype=self.dtype, buffer=buffer, offset=8 * (meta + slots))
+        if self.owner:
+            self.header[:] = 0
+            self.header[[SLOTS, HEIGHT, WIDTH, CHANNELS, MAX_READERS]] = (slots,) + shape + (max_readers,)
+            self.versions[:] = 0
+            self.sequences[:] = -1
+            self.pins[:] = 0
+            self.reader_positions[:] = -1
+        self.readonly = self.frames.view()
+        self.readonly.flags.writeable = False
+
+    def __reduce__(self):
+        return (self.__class__, (self.shape, self.slots, self.dtype, self.max_readers, self.shm.name, self.cond))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def lastSeq(self):
+        """Numéro de la dernière frame écrite (0 si aucune)"""
+        return int(self.header[WRITE_SEQ])
+
+    def _choose_slot(self):
+        """Emplacement à réécrire : la frame la plus ancienne qui n'est pas prêtée"""
+        free = np.flatnonzero(self.pins == 0)
+        candidates = free if len(free) else np.arange(self.slots)
+        return int(candidates[np.argmin(self.sequences[candidates])])
+
+    def write(self, frame, timestamp=None):
+        """Copie la frame dans l'anneau (seule copie du pipeline) ; retourne son numéro"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.cond:
+            slot = self._choose_slot()
+            seq = self.lastSeq + 1
+            self.versions[slot] += 1  # Impair : écriture en cours
+        np.copyto(self.frames[slot], frame.reshape(self.shape), casting="no")
+        with self.cond:
+            self.sequences[slot] = seq
+            self.timestamps[slot] = timestamp
+            self.versions[slot] += 1  # Pair : frame stable
+            self.header[WRITE_SEQ] = seq
+            self.cond.notify_all()
+        return seq
+
+    def read(self, seq=None):
+        """Prête la frame `seq` (par défaut la plus récente) ; None si elle a déjà été écrasée"""
+        with self.cond:
+            seq = self.lastSeq if seq is None else seq
+            slots = np.flatnonzero((self.sequences == seq) & (self.versions % 2 == 0))
+            if seq <= 0 or not len(slots):
+                return None
+            slot = int(slots[0])
+            self.pins[slot] += 1
+            return FrameLease(self, slot, seq, float(self.timestamps[slot]), int(self.versions[slot]))
+
+    def readAfter(self, after_seq):
+        """Prête la plus ancienne frame disponible plus récente que `after_seq` ; None s'il n'y en a pas.
+
+        Les numéros présents dans l'anneau ne sont pas forcément contigus (un emplacement prêté
+        garde sa frame pendant que les autres sont réécrits).
+        """
+        with self.cond:
+            stable = (self.sequences > after_seq) & (self.versions % 2 == 0)
+            if not stable.any():
+                return None
+            slot = int(np.flatnonzero(stable)[np.argmin(self.sequences[stable])])
+            self.pins[slot] += 1
+            return FrameLease(self, slot, int(self.sequences[slot]), float(self.timestamps[slot]),
+                              int(self.versions[slot]))
+
+    def oldestSeq(self):
+        """Numéro de la plus ancienne frame encore disponible"""
+        with self.cond:
+            available = self.sequences[self.sequences > 0]
+            return int(available.min()) if len(available) else 0
+
+    def wait(self, after_seq, timeout=None):
+        """Attend qu'une frame plus récente que `after_seq` soit écrite ; retourne le dernier numéro"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.lastSeq > after_seq, timeout)
+            return self.lastSeq
+
+    def reader(self, reader_id=None):
+        """Lecteur séquentiel enregistré (position publiée dans reader_positions)"""
+        return RingReader(self, reader_id)
+
+    def close(self):
+        # Les vues NumPy doivent disparaître avant de fermer le segment
+        del self.header, self.versions, self.sequences, self.pins, self.reader_positions
+        del self.timestamps, self.frames, self.readonly
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """Lit toutes les frames dans l'ordre, ou saute au plus ancien disponible en cas de retard"""
+
+    def __init__(self, ring, reader_id=None):
+        self.ring = ring
+        self.reader_id = reader_id
+        self.position = ring.lastSeq  # Dernière frame lue : on commence aux frames à venir
+        self.dropped = 0  # Frames écrasées avant d'avoir été lues
+        self.publish()
+
+    def publish(self):
+        if self.reader_id is not None:
+            self.ring.reader_positions[self.reader_id] = self.position
+
+    def next(self, timeout=1.0):
+        """Prête la frame suivante ; None si aucune n'arrive dans le délai"""
+        if self.ring.wait(self.position, timeout) <= self.position:
+            return None
+        lease = self.ring.readAfter(self.position)
+        if lease is None:
+            return None
+        self.dropped += lease.seq - self.position - 1
+        self.position = lease.seq
+        self.publish()
+        return lease
@@ -0,0 +1,134 @@
+import argparse
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from FrameContext import FrameContext
+from ResultCache import DEFAULT_DIRECTORY
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+# Détecteur propre à chaque processus de travail, créé une seule fois puis réutilisé
+detector = None
+
+
+def init_worker(detector_kwargs, cache_dir=None):
+    global detector
+    cv2.setNumThreads(1)  # Le parallélisme vient du pool de processus, pas d'OpenCV
+    import PoseModule as pm
+    from Metrics import configure_logging
+    from ResultCache import ResultCache
+    configure_logging(logging.WARNING)  # Pas de message par image dans les processus de travail
+    # Cache disque partagé par les processus (écritures atomiques) : images déjà analysées non recalculées
+    result_cache = ResultCache(cache_dir) if cache_dir else None
+    detector = pm.poseDetector(headless=True, result_cache=result_cache, **detector_kwargs)
+
+
+def to_serializable(value):
+    """Convertit les résultats (tableaux NumPy, NaN) en types JSON"""
+    if isinstance(value, dict):
+        return {key: to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_serializable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_serializable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def summarize(result):
+    """Garde les champs utiles à l'analyse hors ligne"""
+    if result["angles"] is not None:
+        result["angles"] = detector.angle_engine.asDict(result["angles"])
+    result["hands"] = [{"id": hand["id"], "grip": hand["grip_name"], "grasping": hand["grasping"],
+                        "landmarks": hand["landmarks"]} for hand in result["hands"]]
+    result.pop("pixels", None)
+    return to_serializable(result)
+
+
+def analyze_image(path):
+    """Tâche d'un processus : décodage puis analyse d'une image fixe"""
+    img = cv2.imread(path)
+    if img is None:
+        return [{"source": path, "error": "image illisible"}]
+    # Une seule conversion BGR -> RGB partagée par la recherche de complexité et les autres modèles
+    frame = FrameContext(img)
+    person_detected, _ = detector.tryDifferentComplexities(frame)
+    result = detector.analyze(frame, pose=False)
+    result.update(source=path, person_detected=person_detected)
+    return [summarize(result)]
+
+
+def analyze_video_chunk(task):
+    """Tâche d'un processus : décode et analyse les frames [start, end) d'une vidéo"""
+    path, start, end = task
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    results = []
+    for index in range(start, end):
+        success, frame = cap.read()
+        if not success or frame is None:
+            break
+        result = detector.analyze(frame)
+        result.update(source=path, frame=index, timestamp=cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+        results.append(summarize(result))
+    cap.release()
+    return results
+
+
+def build_tasks(source, chunk_size):
+    """Liste ordonnée des tâches ; seuls des chemins et des numéros de frame transitent vers les processus"""
+    if os.path.isdir(source):
+        paths = sorted(os.path.join(source, name) for name in os.listdir(source)
+                       if name.lower().endswith(IMAGE_EXTENSIONS))
+        return analyze_image, paths, {"mode": True}
+    cap = cv2.VideoCapture(source)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    if frame_count <= 0:
+        raise SystemExit(f"Impossible de lire la vidéo {source}")
+    tasks = [(source, start, min(start + chunk_size, frame_count)) for start in range(0, frame_count, chunk_size)]
+    return analyze_video_chunk, tasks, {"mode": False}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse de posture hors ligne sur un dossier d'images ou une vidéo")
+    parser.add_argument("source", help="Dossier d'images ou fichier vidéo")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="Fichier de résultats (une ligne JSON par frame)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Nombre de processus")
+    parser.add_argument("--chunk-size", type=int, default=300,
+                        help="Frames consécutives par tâche vidéo (le suivi Mediapipe reste continu dans un bloc)")
+    parser.add_argument("--detection-con", type=float, default=0.5)
+    parser.add_argument("--track-con", type=float, default=0.5)
+    parser.add_argument("--cache-dir", default=DEFAULT_DIRECTORY, help="Cache des résultats d'images fixes")
+    parser.add_argument("--no-cache", action="store_true", help="Analyser toutes les images sans cache")
+    parser.add_argument("--parallel-search", action="store_true",
+                        help="Essayer les complexités en parallèle (utile avec peu de processus)")
+    parser.add_argument("--search-by", choices=("detection", "visibility"), default="detection",
+                        help="Recherche parallèle : complexité la moins coûteuse qui détecte, ou landmarks les plus visibles")
+    args = parser.parse_args()
+
+    function, tasks, detector_kwargs = build_tasks(args.source, args.chunk_size)
+    detector_kwargs.update(detectionCon=args.detection_con, trackCon=args.track_con,
+                           parallel_search=args.parallel_search, search_by=args.search_by)
+    count = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(detector_kwargs, None if args.no_cache else args.cache_dir)) as executor, open(args.output, "w") as output:
+        # map conserve l'ordre des tâches : le fichier de sortie suit l'ordre des images/frames
+        for results in executor.map(function, tasks):
+            for result in results:
+                output.write(json.dumps(result) + "\n")
+                count += 1
+    print(f"{count} résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
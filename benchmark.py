@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from AngleEngine import AngleEngine, angle_between
+from ContourMerge import merge_contours
+from HandAnalyzer import classify_grips
+from LandmarkArray import LandmarkArray, NUM_LANDMARKS, as_pose_results
+from LandmarkFilter import OneEuroFilter, filter_session
+from MotionGate import MotionGate
+from RiskEngine import RiskEngine
+from Rula import RulaScorer
+
+
+def make_frames(count, width=640, height=480, seed=0):
+    """Frames synthétiques reproductibles : fond bruité et formes (donnent des contours)"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        img = rng.integers(0, 40, (height, width, 3), dtype=np.uint8)
+        for _ in range(12):
+            x, y = int(rng.integers(0, width - 80)), int(rng.integers(0, height - 80))
+            color = tuple(int(c) for c in rng.integers(80, 255, 3))
+            if rng.random() < 0.5:
+                cv2.rectangle(img, (x, y), (x + int(rng.integers(20, 80)), y + int(rng.integers(20, 80))), color, -1)
+            else:
+                cv2.circle(img, (x + 40, y + 40), int(rng.integers(10, 40)), color, -1)
+        frames.append(img)
+    return frames
+
+
+def load_frames(folder, width=None):
+    """Frames enregistrées (dossier d'images) utilisées comme fixtures"""
+    frames = []
+    for name in sorted(os.listdir(folder)):
+        img = cv2.imread(os.path.join(folder, name))
+        if img is not None:
+            if width:
+                img = cv2.resize(img, (width, int(img.shape[0] * width / img.shape[1])))
+            frames.append(img)
+    return frames
+
+
+def make_landmarks(count, seed=0):
+    """Squelettes synthétiques (count, 33, 4) : positions plausibles autour d'une pose debout"""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 4)).astype(np.float32)
+    base[:, 3] = 0.9
+    noise = rng.normal(0, 0.02, (count, NUM_LANDMARKS, 4)).astype(np.float32)
+    noise[..., 3] = 0
+    return base + noise
+
+
+def measure(function, inputs, iterations, warmup=3, memory_iterations=5):
+    """Latences (ms) p50/p95/p99, débit (appels/s) et pic mémoire (Ko) d'une étape"""
+    for i in range(warmup):
+        function(inputs[i % len(inputs)])
+    durations = np.empty(iterations)
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        start = time.perf_counter_ns()
+        function(item)
+        durations[i] = time.perf_counter_ns() - start
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    for i in range(memory_iterations):
+        function(inputs[i % len(inputs)])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    durations /= 1e6
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            "mean_ms": float(durations.mean()), "throughput_per_s": float(1000 / durations.mean()),
+            "peak_kb": peak / 1024, "iterations": iterations}
+
+
+def core_stages(frames, landmarks, batch_size):
+    """Étapes sans modèle Mediapipe : exécutables sans caméra ni GPU"""
+    shape = frames[0].shape
+    array = LandmarkArray()
+    engine = AngleEngine()
+    rula = RulaScorer()
+    risk = RiskEngine(engine.names)
+    one_euro = OneEuroFilter()
+    gate = MotionGate()
+    clock = iter(np.arange(10 ** 7) / 30)
+    results = [as_pose_results(points) for points in landmarks[:64]]
+    filled = [LandmarkArray().fillArray(points, shape) for points in landmarks[:64]]
+    batch = landmarks[:batch_size]
+    hands = [landmarks[i:i + 4, :21, :3] for i in range(0, 64, 4)]  # 4 mains (21, 3) synthétiques
+    contours = [cv2.findContours(cv2.Canny(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), 50, 150),
+                                 cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0] for img in frames]
+    return {
+        "landmarks.fill": (lambda result: array.fill(result.pose_landmarks.landmark, shape), results),
+        "angles.frame": (lambda points: engine.computeLandmarks(points, shape), filled),
+        "angles.batch": (lambda points: engine.compute(points, scale=(shape[1], shape[0], shape[1])), [batch]),
+        "angle_between": (lambda points: angle_between(points.pixels[11], points.pixels[13], points.pixels[15]), filled),
+        "rula.frame": (lambda points: rula.scoreLandmarks(points, shape), filled),
+        "rula.batch": (lambda points: rula.scoreSession(points, shape), [batch]),
+        "risk.update": (lambda points: risk.update(engine.computeLandmarks(points, shape), dt=1 / 30), filled),
+        "merge_contours": (lambda found: merge_contours(found), contours),
+        "hands.classify": (classify_grips, hands),
+        "motion_gate": (gate.check, frames),
+        "filter.update": (lambda points: one_euro.update(points, next(clock)), list(landmarks[:64])),
+        "filter.session": (lambda points: filter_session(points, np.arange(len(points)) / 30), [batch]),
+    }
+
+
+def detector_stages(detector, frames, landmarks):
+    """Étapes du poseDetector sans inférence (landmarks synthétiques, contours)"""
+    results = [as_pose_results(points) for points in landmarks[:64]]
+
+    def find_position(result):
+        detector.results = result
+        return detector.findPosition(frames[0], draw=False)
+
+    def with_landmarks(function):
+        detector.results = results[0]
+        detector.findPosition(frames[0], draw=False)
+        return function
+
+    bg_subtractor = cv2.createBackgroundSubtractorMOG2()
+    contours = [(detector.detect_actions_from_movement(img)[1],
+                 detector.detect_actions_with_bg_subtraction(img, bg_subtractor)[1]) for img in frames]
+    return {
+        "findPosition": (find_position, results),
+        "findAngle": (with_landmarks(lambda img: detector.findAngle(img, 11, 13, 15, draw=False)), frames),
+        "displayBodyAngles": (with_landmarks(lambda img: detector.displayBodyAngles(img)), frames),
+        "detect_actions_from_movement": (detector.detect_actions_from_movement, frames),
+        "detect_actions_with_bg_subtraction": (lambda img: detector.detect_actions_with_bg_subtraction(img, bg_subtractor), frames),
+        "remove_duplicate_actions": (lambda pair: detector.remove_duplicate_actions(*pair), contours),
+    }
+
+
+def model_stages(detector, frames):
+    """Étapes d'inférence du poseDetector ; nécessitent les modèles Mediapipe (exécutés sur CPU)"""
+    return {
+        "findPose": (lambda img: detector.findPose(img, draw=False), frames),
+        "faceDetector": (lambda img: detector.faceDetector(img, draw=False), frames),
+        "detectGrasping": (lambda img: detector.detectGrasping(img, draw=False), frames),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(report, baseline, threshold):
+    """Affiche l'évolution de p50 par rapport à une référence ; retourne les étapes en régression"""
+    regressions = []
+    print(f"\nComparaison avec {baseline['meta'].get('commit')} (seuil x{threshold}) :")
+    for name, stats in report["stages"].items():
+        reference = baseline["stages"].get(name)
+        if reference is None or "p50_ms" not in reference or "p50_ms" not in stats:
+            continue
+        ratio = stats["p50_ms"] / max(reference["p50_ms"], 1e-9)
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"  {name:38s} {reference['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms  x{ratio:5.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des étapes de PoseModule (sans caméra ni GPU)")
+    parser.add_argument("--images", help="Dossier de frames enregistrées (sinon frames synthétiques)")
+    parser.add_argument("--width", type=int, default=640, help="Largeur des frames")
+    parser.add_argument("--frames", type=int, default=16, help="Nombre de frames synthétiques")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Frames par appel pour les étapes en lot")
+    parser.add_argument("--stages", nargs="*", help="Limiter aux étapes données")
+    parser.add_argument("--save", help="Écrire le rapport JSON (référence pour une comparaison future)")
+    parser.add_argument("--compare", help="Rapport JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Ratio p50 au-delà duquel signaler une régression")
+    args = parser.parse_args()
+
+    frames = load_frames(args.images, args.width) if args.images else \
+        make_frames(args.frames, args.width, args.width * 3 // 4)
+    landmarks = make_landmarks(max(args.batch_size, 64))
+    stages = core_stages(frames, landmarks, args.batch_size)
+
+    # Les modèles ne sont construits qu'au premier usage : le détecteur existe même sans Mediapipe
+    import PoseModule as pm
+    detector = pm.poseDetector(mode=True, headless=True)
+    stages.update(detector_stages(detector, frames, landmarks))
+    try:
+        detector.warmUp()
+        stages.update(model_stages(detector, frames))
+    except Exception as e:
+        print(f"Étapes Mediapipe ignorées ({type(e).__name__}: {e})")
+
+    report = {"meta": {"commit": git_commit(), "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__,
+                       "machine": platform.machine(), "frame_shape": list(frames[0].shape),
+                       "synthetic": not args.images, "batch_size": args.batch_size},
+              "stages": {}}
+    print(f"{'étape':38s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'débit/s':>10s} {'pic Ko':>9s}")
+    for name, (function, inputs) in stages.items():
+        if args.stages and name not in args.stages:
+            continue
+        stats = measure(function, inputs, args.iterations)
+        report["stages"][name] = stats
+        print(f"{name:38s} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} "
+              f"{stats['throughput_per_s']:10.1f} {stats['peak_kb']:9.1f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Rapport enregistré dans {args.save}")
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
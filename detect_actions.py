@@ -1,9 +1,16 @@
 import cv2
-from PoseModule import poseDetector  # Import de la classe poseDetector
-import numpy as np
+from PoseModule import POSE, poseDetector  # Import de la classe poseDetector
+from ActionDetector import ActionDetector
+import sys
+from Metrics import configure_logging
+from ResultCache import ResultCache
+
+configure_logging()
 
 # Initialiser le détecteur de pose avec la classe poseDetector
-detector = poseDetector(upBody=True)
+# Seul le modèle de pose est utilisé : ni visage ni mains ne sont construits
+# Pose et contours des images fixes mis en cache sur disque (clé : contenu de l'image + réglages)
+detector = poseDetector(upBody=True, capabilities=(POSE,), result_cache=ResultCache())
 
 # Fonction principale pour détecter les poses et actions techniques
 def detect_combined_actions(image_path):
@@ -25,10 +32,9 @@ def detect_combined_actions(image_path):
     print("\n---- Détection des Actions Techniques ----")
     actions_from_movement, contours_movement, image_movement = detector.detect_actions_from_movement(image)
 
-    bg_subtractor = cv2.createBackgroundSubtractorMOG2()
-    actions_from_bg_subtraction, contours_bg, image_bg = detector.detect_actions_with_bg_subtraction(image, bg_subtractor)
-
-    combined_contours = detector.remove_duplicate_actions(contours_movement, contours_bg)
+    # Une image fixe n'a pas d'arrière-plan à apprendre : seuls les contours sont utilisés
+    # (la soustraction d'arrière-plan sert sur les vidéos, via ActionDetector)
+    combined_contours = detector.remove_duplicate_actions(contours_movement, [])
     total_actions = len(combined_contours)
     print(f"\nTotal d'actions techniques détectées après fusion : {total_actions}")
 
@@ -44,6 +50,43 @@ def detect_combined_actions(image_path):
     cv2.waitKey(0)
     cv2.destroyAllWindows()
 
-# Appliquer la détection sur une image
-image_path = '/home/pc-camera/Bureau/Cameras/03_Code_MiniPC/images/15.jpg'  # Remplace par le chemin correct de l'image
-detect_combined_actions(image_path)
+# Détection temporelle des actions techniques sur une vidéo (ou une caméra)
+def detect_actions_in_video(source):
+    print("---- Détection temporelle des actions techniques ----")
+    cap = cv2.VideoCapture(source)
+    live = isinstance(source, int)  # Index de caméra : pas d'horodatage vidéo fiable
+    action_detector = ActionDetector()  # Un seul modèle d'arrière-plan pour toute la vidéo
+    result = None
+
+    while True:
+        success, frame = cap.read()
+        if not success or frame is None:
+            break
+
+        # Fichier : horodatage de la vidéo (0.0 compris pour la première frame) ; caméra : horloge
+        timestamp = None if live else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+        detector.findPose(frame, draw=False)
+        detector.updateLandmarks(frame, draw=False)
+        result = action_detector.update(frame, detector.landmarks, timestamp)
+
+        cv2.putText(frame, f"Actions techniques : {result['actions']}", (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
+        cv2.putText(frame, f"Actions / min : {result['actions_per_minute']:.1f}", (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
+        cv2.imshow("Resultat", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    cap.release()
+    cv2.destroyAllWindows()
+    if result is not None:
+        print(f"Total d'actions techniques : {result['actions']} ({result['actions_per_minute']:.1f} actions/min)")
+
+# Appliquer la détection sur une image ou une vidéo
+image_path = sys.argv[1] if len(sys.argv) > 1 else '/home/pc-camera/Bureau/Cameras/03_Code_MiniPC/images/15.jpg'
+if image_path.isdigit():
+    detect_actions_in_video(int(image_path))  # Caméra en direct
+elif image_path.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
+    detect_actions_in_video(image_path)
+else:
+    detect_combined_actions(image_path)
+
@@ -0,0 +1,67 @@
+import numpy as np
+
+from ActionDetector import LEFT_SHOULDER, LEFT_WRIST, RIGHT_SHOULDER, RIGHT_WRIST, ActionDetector
+from LandmarkArray import LandmarkArray
+
+SHAPE = (240, 320, 3)
+FPS = 30
+
+
+def frame_with_block(x):
+    img = np.zeros(SHAPE, dtype=np.uint8)
+    if x is not None:
+        img[100:160, x:x + 40] = 255
+    return img
+
+
+def pose(wrist_x):
+    values = np.zeros((33, 4), dtype=np.float32)
+    values[:, 3] = 1.0
+    values[LEFT_SHOULDER, :2] = 0.4, 0.3
+    values[RIGHT_SHOULDER, :2] = 0.6, 0.3
+    values[[LEFT_WRIST, RIGHT_WRIST], :2] = (wrist_x, 0.55), (0.6, 0.55)
+    return LandmarkArray().fillArray(values, SHAPE)
+
+
+def test_static_scene_has_no_action():
+    detector = ActionDetector()
+    for i in range(60):
+        result = detector.update(frame_with_block(None), None, i / FPS)
+    assert result["actions"] == 0 and result["actions_per_minute"] == 0
+
+
+def test_motion_episodes_count_without_landmarks():
+    detector = ActionDetector()
+    t = 0.0
+    for episode in range(2):
+        for _ in range(40):  # Scène calme : l'arrière-plan est appris
+            detector.update(frame_with_block(None), None, t)
+            t += 1 / FPS
+        for x in range(0, 200, 10):  # Un objet traverse l'image
+            detector.update(frame_with_block(x), None, t)
+            t += 1 / FPS
+    for _ in range(40):
+        result = detector.update(frame_with_block(None), None, t)
+        t += 1 / FPS
+    assert result["actions"] == 2
+
+
+def test_wrist_gestures_are_counted():
+    detector = ActionDetector()
+    t = 0.0
+    for _ in range(30):
+        detector.update(frame_with_block(None), pose(0.4), t)
+        t += 1 / FPS
+    for gesture in range(3):
+        # Aller rapide du poignet (avec mouvement visible autour), puis pause
+        for x in np.linspace(0.4, 0.7, 8):
+            detector.update(frame_with_block(int(x * SHAPE[1]) - 20), pose(x), t)
+            t += 1 / FPS
+        for _ in range(20):
+            detector.update(frame_with_block(None), pose(0.7), t)
+            t += 1 / FPS
+        for _ in range(20):
+            result = detector.update(frame_with_block(None), pose(0.4), t)
+            t += 1 / FPS
+    assert result["actions"] == 3
+    assert detector.actionsPerMinute(t) > 0
@@ -0,0 +1,52 @@
+import numpy as np
+
+from AdaptiveController import AdaptiveController
+
+
+def controller(**kwargs):
+    ctrl = AdaptiveController(budget_ms=10, hold_frames=3, **kwargs)
+    ctrl.timings = {"pose_0": 4.0, "pose_1": 8.0, "pose_2": 20.0, "hands": 2.0, "face": 1.0}
+    return ctrl
+
+
+def test_downgrade_only_after_hold_frames():
+    ctrl = controller()
+    level = ctrl.level
+    ctrl.report(True, frame_ms=30)
+    ctrl.report(True, frame_ms=30)
+    assert ctrl.level == level
+    ctrl.report(True, frame_ms=30)
+    assert ctrl.level == level - 1
+
+
+def test_isolated_spike_does_not_change_level():
+    ctrl = controller()
+    level = ctrl.level
+    for frame_ms in (30, 30, 5, 30, 30, 5):
+        ctrl.report(True, frame_ms=frame_ms)
+    assert ctrl.level == level
+
+
+def test_repeated_failures_raise_complexity():
+    ctrl = controller(complexity=0)
+    for _ in range(ctrl.failure_threshold):
+        ctrl.report(False, frame_ms=5)
+    assert ctrl.complexity == 1
+
+
+def test_frames_without_inference_do_not_reset_failures():
+    ctrl = controller(complexity=0)
+    ctrl.report(False, frame_ms=5)
+    ctrl.report(None, frame_ms=5)
+    assert ctrl.failures == 1
+
+
+def test_predict_extrapolates_and_expires():
+    ctrl = controller(max_extrapolation=0.5)
+    pose = np.zeros((33, 4), dtype=np.float32)
+    ctrl.observe(pose, timestamp=0.0)
+    ctrl.observe(pose + [0.1, 0, 0, 0], timestamp=0.1)
+    np.testing.assert_allclose(ctrl.predict(timestamp=0.15)[0, 0], 0.15, atol=1e-6)
+    assert ctrl.predict(timestamp=1.0) is None
+    ctrl.forget()
+    assert ctrl.predict(timestamp=0.15) is None
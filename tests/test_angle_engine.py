@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from AngleEngine import AngleEngine, angle_between
+
+
+@pytest.mark.parametrize("c, expected", [((1, 0), 0.0), ((0, 1), 90.0), ((-1, 0), 180.0), ((1, 1), 45.0)])
+def test_angle_between_interior_angle(c, expected):
+    assert angle_between((1, 0), (0, 0), c) == pytest.approx(expected, abs=1e-4)
+
+
+def test_angle_between_is_vectorized():
+    a = np.array([[1, 0], [1, 0]])
+    c = np.array([[0, 1], [-1, 0]])
+    np.testing.assert_allclose(angle_between(a, np.zeros((2, 2)), c), [90, 180], atol=1e-4)
+
+
+def test_compute_matches_angle_between_for_each_triplet():
+    engine = AngleEngine()
+    points = np.random.default_rng(0).uniform(0, 1, (33, 4))
+    angles = engine.compute(points)
+    for name, (p1, p2, p3) in zip(engine.names, engine.triplets):
+        assert angles[engine.index[name]] == pytest.approx(float(angle_between(points[p1], points[p2], points[p3])),
+                                                           abs=1e-3)
+
+
+def test_compute_batch_and_scale():
+    engine = AngleEngine()
+    batch = np.random.default_rng(1).uniform(0, 1, (5, 33, 4))
+    angles = engine.compute(batch, scale=(640, 480, 640))
+    assert angles.shape == (5, len(engine.names))
+    np.testing.assert_allclose(angles[2], engine.compute(batch[2] * (640, 480, 640, 1)), atol=1e-3)
+
+
+def test_compute_hides_low_visibility():
+    engine = AngleEngine()
+    points = np.random.default_rng(2).uniform(0, 1, (33, 4))
+    visibility = np.ones(33)
+    visibility[13] = 0.1  # Coude gauche
+    angles = engine.compute(points, visibility=visibility, min_visibility=0.5)
+    assert np.isnan(angles[engine.index["left_elbow"]])
+    assert not np.isnan(angles[engine.index["right_elbow"]])
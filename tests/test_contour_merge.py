@@ -0,0 +1,28 @@
+import numpy as np
+
+from ContourMerge import merge_contours, merge_regions
+
+
+def square(x, y, size=20):
+    return np.array([[[x, y]], [[x + size, y]], [[x + size, y + size]], [[x, y + size]]], dtype=np.int32)
+
+
+def test_close_contours_are_merged():
+    regions = merge_regions([square(0, 0), square(30, 0), square(500, 500)], distance=15)
+    members = sorted(sorted(region["members"]) for region in regions)
+    assert members == [[0, 1], [2]]
+    merged = next(region for region in regions if len(region["members"]) == 2)
+    assert merged["box"] == (0, 0, 51, 21)
+
+
+def test_overlapping_contours_are_merged_without_distance():
+    assert len(merge_contours([square(0, 0), square(10, 10)], iou_threshold=0.1, distance=0)) == 1
+
+
+def test_far_contours_stay_separate():
+    contours = [square(x, 0) for x in range(0, 2000, 200)]
+    assert len(merge_contours(contours, distance=50)) == len(contours)
+
+
+def test_empty_input():
+    assert merge_contours([]) == []
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from HandAnalyzer import (FINGERS, INDEX_TIP, OPEN, PINCH, POWER, THUMB_TIP, HandAnalyzer, HandTracker,
+                          classify_grips, finger_flexion)
+
+SHAPE = (1080, 1920, 3)
+
+
+def hand(bend=0.0, pinch=False, rotation=0.0, center=(960, 540), size=60):
+    """Main (21, 2) en pixels : doigts en éventail, chaque articulation pliée de `bend` degrés"""
+    points = np.zeros((21, 2), dtype=np.float32)
+    for finger, spread in zip(FINGERS, np.radians([-60, -20, 0, 20, 40])):
+        direction, position = spread, np.zeros(2)
+        for joint in finger[1:]:
+            position = position + size * np.array([np.sin(direction), -np.cos(direction)])
+            points[joint] = position
+            direction += np.radians(bend)
+    if pinch:
+        points[THUMB_TIP] = points[INDEX_TIP] + (3, 0)
+    c, s = np.cos(np.radians(rotation)), np.sin(np.radians(rotation))
+    return points @ np.array([[c, s], [-s, c]], dtype=np.float32) + center
+
+
+def normalized(points):
+    return points / (SHAPE[1], SHAPE[0])
+
+
+def test_flexion_of_straight_and_bent_fingers():
+    flexion = finger_flexion(np.stack([hand(), hand(bend=50)]))
+    np.testing.assert_allclose(flexion[0], 0, atol=1e-3)
+    np.testing.assert_allclose(flexion[1, 1:], 150, atol=1e-2)
+
+
+def test_grip_types_in_pixels():
+    grips, _, _ = classify_grips(np.stack([hand(), hand(bend=60), hand(pinch=True)]))
+    assert grips.tolist() == [OPEN, POWER, PINCH]
+
+
+@pytest.mark.parametrize("rotation", [0, 45, 90, 135])
+def test_normalized_classification_is_rotation_invariant(rotation):
+    hands = np.stack([normalized(hand(rotation=rotation)), normalized(hand(bend=60, rotation=rotation)),
+                      normalized(hand(pinch=True, rotation=rotation))])
+    grips, _, _ = classify_grips(hands, scale=(SHAPE[1], SHAPE[0], SHAPE[1]))
+    assert grips.tolist() == [OPEN, POWER, PINCH]
+
+
+def test_tracker_keeps_ids_and_forgets_lost_hands():
+    tracker = HandTracker(max_missed=1)
+    first = tracker.update([[0.2, 0.5], [0.8, 0.5]])
+    assert tracker.update([[0.81, 0.5], [0.21, 0.5]]).tolist() == first[::-1].tolist()
+    tracker.update(np.zeros((0, 2)))
+    tracker.update(np.zeros((0, 2)))
+    assert int(tracker.update([[0.2, 0.5]])[0]) not in first
+
+
+def test_analyzer_removes_duplicates_and_tracks():
+    analyzer = HandAnalyzer()
+    left, right = normalized(hand(center=(500, 540))), normalized(hand(bend=60, center=(1400, 540)))
+    hands = np.stack([left, left + 0.001, right])
+    hands = np.concatenate([hands, np.zeros(hands.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+    result = analyzer.analyze(hands, SHAPE)
+    assert [hand["grip"] for hand in result] == [OPEN, POWER]
+    assert [hand["grasping"] for hand in result] == [False, True]
+    assert result[1]["pixels"][0].tolist() == [1400, 540]
+    again = analyzer.analyze(hands[[2, 0]], SHAPE)
+    assert [hand["id"] for hand in again] == [result[1]["id"], result[0]["id"]]
+    assert analyzer.analyze(np.zeros((0, 21, 3)), SHAPE) == []
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from LandmarkArray import LandmarkArray, as_pose_results
+
+
+def mediapipe_landmarks(values):
+    return [SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in values]
+
+
+def sample(seed=0):
+    return np.random.default_rng(seed).uniform(0, 1, (33, 4)).astype(np.float32)
+
+
+def test_fill_converts_to_pixels_like_the_legacy_loop():
+    values = sample()
+    landmarks = LandmarkArray().fill(mediapipe_landmarks(values), (480, 640, 3))
+    np.testing.assert_allclose(landmarks.data, values)
+    expected = [[i, int(x * 640), int(y * 480)] for i, (x, y, _, _) in enumerate(values)]
+    assert list(landmarks.lmList) == expected
+    assert landmarks.lmList[-1] == expected[-1] and landmarks.lmList[2:4] == expected[2:4]
+
+
+def test_fill_with_box_maps_back_to_full_frame():
+    values = np.full((33, 4), 0.5, dtype=np.float32)
+    landmarks = LandmarkArray().fill(mediapipe_landmarks(values), (400, 400, 3), box=(100, 200, 300, 400))
+    assert landmarks.pixels[0].tolist() == [200, 300]
+
+
+def test_clear_and_empty_fill():
+    landmarks = LandmarkArray().fillArray(sample()[:, :3], (10, 10))
+    assert landmarks and len(landmarks.lmList) == 33
+    assert (landmarks.visibility == 1).all()
+    landmarks.clear()
+    assert not landmarks and len(landmarks) == 0 and list(landmarks.lmList) == []
+    with pytest.raises(IndexError):
+        landmarks.lmList[0]
+    assert not LandmarkArray().fill([], (10, 10))
+
+
+def test_list_view_follows_the_reused_array():
+    landmarks = LandmarkArray().fillArray(sample(1), (100, 100))
+    snapshot = list(landmarks.lmList)
+    landmarks.fillArray(sample(2), (100, 100))
+    assert landmarks.lmList != snapshot
+
+
+def test_as_pose_results_round_trip():
+    values = sample(3)
+    results = as_pose_results(values)
+    np.testing.assert_allclose(LandmarkArray().fill(results.pose_landmarks.landmark, (1, 1)).data, values)
+    assert as_pose_results(None).pose_landmarks is None
@@ -0,0 +1,49 @@
+import numpy as np
+
+from LandmarkFilter import OneEuroFilter, fill_gaps, filter_session
+
+
+def test_filter_reduces_jitter_on_still_pose():
+    rng = np.random.default_rng(0)
+    truth = rng.uniform(0.3, 0.7, (33, 3)).astype(np.float32)
+    one_euro = OneEuroFilter()
+    errors = []
+    for i in range(60):
+        noisy = truth + rng.normal(0, 0.01, truth.shape)
+        errors.append((np.abs(noisy - truth).mean(), np.abs(one_euro.update(noisy, i / 30)[:, :3] - truth).mean()))
+    raw, filtered = np.mean(errors[10:], axis=0)
+    assert filtered < raw / 2
+
+
+def test_update_keeps_visibility():
+    points = np.full((33, 4), 0.5, dtype=np.float32)
+    points[:, 3] = 0.2
+    assert OneEuroFilter().update(points, 0.0)[:, 3].tolist() == [np.float32(0.2)] * 33
+
+
+def test_predict_expires_after_max_gap():
+    one_euro = OneEuroFilter(max_gap=0.5)
+    one_euro.update(np.zeros((33, 3)), 0.0)
+    assert one_euro.predict(0.2) is not None
+    assert one_euro.predict(1.0) is None
+
+
+def test_fill_gaps_interpolates_short_gaps_only():
+    points = np.zeros((6, 33, 3), dtype=np.float32)
+    points[:, :, 0] = np.arange(6)[:, None]
+    points[[1, 4]] = np.nan
+    timestamps = np.array([0, 0.1, 0.2, 0.3, 5.0, 5.1])
+    points[3:] = np.arange(3, 6)[:, None, None] * [1, 0, 0]
+    points[4] = np.nan
+    filled, valid = fill_gaps(points, timestamps)
+    assert valid.tolist() == [True, True, True, True, False, True]
+    np.testing.assert_allclose(filled[1, :, 0], 1.0)
+    assert np.isnan(filled[4]).all()
+
+
+def test_filter_session_keeps_empty_frames_nan():
+    points = np.random.default_rng(1).uniform(0, 1, (20, 33, 4)).astype(np.float32)
+    points[10:] = np.nan
+    smoothed, valid = filter_session(points, np.arange(20) / 30, max_gap=0.01)
+    assert valid[:10].all() and not valid[10:].any()
+    assert np.isnan(smoothed[10:]).all() and not np.isnan(smoothed[:10]).any()
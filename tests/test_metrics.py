@@ -0,0 +1,71 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from Metrics import Metrics, PrometheusExporter
+
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+
+    def observe(self, name, seconds):
+        self.events.append(("observe", name, seconds))
+
+    def increment(self, name, value):
+        self.events.append(("increment", name, value))
+
+
+def test_counters_and_stage_statistics():
+    sink = RecordingSink()
+    metrics = Metrics(sinks=[sink])
+    for seconds in (0.01, 0.02, 0.03):
+        metrics.observe("process.pose_1", seconds)
+    metrics.increment("model_builds")
+    metrics.increment("model_builds", 2)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"model_builds": 3}
+    stage = snapshot["stages"]["process.pose_1"]
+    assert stage["count"] == 3 and stage["max"] == 0.03
+    assert stage["mean"] == pytest.approx(0.02) and stage["p50"] == pytest.approx(0.02)
+    assert len(sink.events) == 5
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer("draw"):
+        pass
+    metrics.increment("frames_dropped")
+    assert metrics.snapshot() == {"counters": {}, "stages": {}}
+
+
+def test_prometheus_exposition_format():
+    metrics = Metrics()
+    metrics.increment("frames_dropped", 4)
+    metrics.observe("process.pose_1", 0.5)
+    text = metrics.prometheus()
+    lines = text.splitlines()
+    assert "# TYPE posture_frames_dropped_total counter" in lines
+    assert "posture_frames_dropped_total 4" in lines
+    assert "# TYPE posture_stage_seconds summary" in lines
+    assert 'posture_stage_seconds{stage="process.pose_1",quantile="0.95"} 0.5' in lines
+    assert 'posture_stage_seconds_sum{stage="process.pose_1"} 0.5' in lines
+    assert 'posture_stage_seconds_count{stage="process.pose_1"} 1' in lines
+    assert text.endswith("\n")
+
+
+def test_exporter_serves_metrics():
+    metrics = Metrics()
+    metrics.increment("cache_hits")
+    exporter = PrometheusExporter(metrics, port=0)
+    exporter.start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert b"posture_cache_hits_total 1" in response.read()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other", timeout=5)
+    finally:
+        exporter.stop()
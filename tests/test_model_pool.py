@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import ModelPool as model_pool
+from ModelPool import ModelPool
+
+
+class FakeModel:
+    def __init__(self, key):
+        self.key = key
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def clock(monkeypatch):
+    now = SimpleNamespace(t=0.0)
+    monkeypatch.setattr(model_pool.time, "monotonic", lambda: now.t)
+    return now
+
+
+def test_each_key_is_built_once():
+    pool = ModelPool(FakeModel)
+    assert pool.get(1) is pool.get(1)
+    pool.get(2)
+    assert pool.builds == 2 and len(pool) == 2
+
+
+def test_lru_eviction_closes_oldest():
+    pool = ModelPool(FakeModel, max_models=2)
+    first = pool.get(0)
+    pool.get(1)
+    pool.get(0)  # 0 redevient le plus récent
+    pool.get(2)
+    assert 1 not in pool and 0 in pool and not first.closed
+
+
+def test_idle_models_are_released(monkeypatch):
+    now = clock(monkeypatch)
+    pool = ModelPool(FakeModel, idle_timeout=60)
+    idle = pool.get(0)
+    now.t = 100
+    pool.get(1)
+    assert idle.closed and 0 not in pool
+
+
+def test_model_in_use_is_not_idle(monkeypatch):
+    # Un modèle récupéré à chaque frame reste chaud, même si une autre complexité est demandée
+    now = clock(monkeypatch)
+    pool = ModelPool(FakeModel, idle_timeout=60)
+    used = pool.get(1)
+    for now.t in range(1, 100):
+        pool.get(1)
+    pool.get(2)
+    assert pool.get(1) is used and not used.closed and pool.builds == 2
+
+
+def test_close_releases_everything():
+    pool = ModelPool(FakeModel)
+    models = [pool.get(key) for key in range(3)]
+    pool.close()
+    assert len(pool) == 0 and all(model.closed for model in models)
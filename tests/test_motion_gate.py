@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from MotionGate import REUSE, RUN, SKIP, MotionGate
+
+SHAPE = (240, 320, 3)
+
+
+def still():
+    return np.full(SHAPE, 80, dtype=np.uint8)
+
+
+def moving(x):
+    img = still()
+    img[60:180, x:x + 80] = 255
+    return img
+
+
+@pytest.mark.parametrize("method", ["mog2", "diff"])
+def test_static_scene_with_person_is_reused_then_refreshed(method):
+    gate = MotionGate(method=method, max_reuse=1.0)
+    assert gate.check(still(), 0.0)
+    gate.report(True)
+    decisions = []
+    for i in range(1, 30):
+        gate.check(still(), i / 20)
+        decisions.append(gate.decision)
+    assert decisions[:10] == [REUSE] * 10
+    assert decisions.count(RUN) == 1 and decisions[19] == RUN  # Rafraîchissement après max_reuse
+
+
+def test_empty_scene_is_skipped_until_interval():
+    gate = MotionGate(method="diff", empty_interval=0.5)
+    gate.check(still(), 0.0)
+    gate.report(False)
+    assert not gate.check(still(), 0.2) and gate.decision == SKIP
+    assert gate.check(still(), 0.6)
+
+
+def test_motion_always_runs():
+    gate = MotionGate(method="diff")
+    gate.check(still(), 0.0)
+    gate.report(True)
+    assert all(gate.check(moving(x), 0.01 * (x + 1)) for x in range(0, 200, 40))
+
+
+def test_skipped_ratio():
+    gate = MotionGate(method="diff")
+    assert gate.skippedRatio == 0.0
+    gate.check(still(), 0.0)
+    gate.report(True)
+    for i in range(3):
+        gate.check(still(), 0.1 * (i + 1))
+    assert gate.skippedRatio == pytest.approx(0.75)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        MotionGate(method="optical_flow")
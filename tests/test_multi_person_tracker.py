@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import PoseModule as pm
+from LandmarkArray import as_pose_results
+from MultiPersonTracker import MultiPersonTracker, iou, person_box_from_face
+
+SHAPE = (480, 640, 3)
+
+
+class CenteredPose:
+    """Faux modèle de pose : une personne occupant le centre de chaque région traitée"""
+
+    def process(self, rgb):
+        values = np.zeros((33, 4), dtype=np.float32)
+        values[:, 0] = np.linspace(0.3, 0.7, 33)
+        values[:, 1] = np.linspace(0.2, 0.8, 33)
+        values[:, 3] = 1.0
+        return as_pose_results(values)
+
+    def close(self):
+        pass
+
+
+def tracker(proposals, **kwargs):
+    detector = pm.poseDetector(capabilities=(pm.POSE,), headless=True)
+    detector.buildPoseModel = lambda complexity: CenteredPose()
+    return MultiPersonTracker(detector, proposer=lambda rgb: proposals, **kwargs)
+
+
+def test_iou():
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1
+    assert iou((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(50 / 150)
+    assert iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0
+
+
+def test_person_box_from_face_is_clamped():
+    x0, y0, x1, y1 = person_box_from_face((300, 50, 40, 40), SHAPE)
+    assert x0 == 220 and y0 == 30 and x1 == 420 and y1 == 370
+    assert person_box_from_face((639, 479, 0, 0), SHAPE) is None
+
+
+def test_associate_matches_overlapping_and_contained_proposals():
+    mpt = tracker([])
+    mpt.associate([(0, 0, 200, 400), (400, 0, 600, 400)])
+    assert sorted(mpt.tracks) == [0, 1]
+    # Même personne (IoU élevée ou centre dans la région) : pas de nouvelle piste
+    mpt.associate([(10, 10, 210, 410), (450, 100, 550, 200)])
+    assert sorted(mpt.tracks) == [0, 1]
+    mpt.associate([(250, 0, 350, 100)])
+    assert sorted(mpt.tracks) == [0, 1, 2]
+
+
+def test_max_people_limits_new_tracks():
+    mpt = tracker([], max_people=1)
+    mpt.associate([(0, 0, 200, 400), (400, 0, 600, 400)])
+    assert list(mpt.tracks) == [0]
+
+
+def test_update_keeps_ids_and_suppresses_duplicates():
+    img = np.zeros(SHAPE, dtype=np.uint8)
+    mpt = tracker([(0, 0, 300, 480), (340, 0, 640, 480)], detect_every=100)
+    first = mpt.update(img, timestamp=0.0)
+    assert [operator["id"] for operator in first] == [0, 1]
+    second = mpt.update(img, timestamp=0.1)
+    assert [operator["id"] for operator in second] == [0, 1]
+    assert all(operator["zones"] is not None for operator in second)
+
+    mpt.tracks[1].roi.box = mpt.tracks[0].box  # Deux pistes sur la même personne
+    mpt.suppressDuplicates()
+    assert list(mpt.tracks) == [0] and 1 in mpt.summaries()
@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+import pytest
+
+import PoseModule as pm
+from LandmarkArray import as_pose_results
+
+IMG = np.zeros((120, 160, 3), dtype=np.uint8)
+
+
+class FakePose:
+    """Faux modèle : détecte (avec la visibilité donnée) ou non, après un délai"""
+
+    def __init__(self, visibility=None, delay=0.0):
+        self.visibility = visibility
+        self.delay = delay
+        self.calls = 0
+
+    def process(self, rgb):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.visibility is None:
+            return as_pose_results(None)
+        values = np.full((33, 4), 0.5, dtype=np.float32)
+        values[:, 3] = self.visibility
+        return as_pose_results(values)
+
+    def close(self):
+        pass
+
+
+def detector(models, **kwargs):
+    detector = pm.poseDetector(capabilities=(pm.POSE,), headless=True, parallel_search=True, **kwargs)
+    detector.pose_pool.factory = models.__getitem__
+    return detector
+
+
+def test_by_detection_keeps_cheapest_detecting_complexity():
+    models = {0: FakePose(), 1: FakePose(0.6), 2: FakePose(0.9, delay=0.3)}
+    d = detector(models)
+    start = time.monotonic()
+    found, img = d.tryDifferentComplexities(IMG)
+    elapsed = time.monotonic() - start
+    assert found and img is IMG and d.model_complexity == 1
+    assert elapsed < 0.25  # La tentative la plus lente n'est pas attendue
+    assert d.landmarks.visibility[0] == pytest.approx(0.6)
+    d.close()
+
+
+def test_by_visibility_waits_for_best_landmarks():
+    models = {0: FakePose(0.4), 1: FakePose(0.9), 2: FakePose(0.7)}
+    d = detector(models, search_by=pm.BY_VISIBILITY)
+    found, _ = d.tryDifferentComplexities(IMG)
+    assert found and d.model_complexity == 1
+    assert all(model.calls == 1 for model in models.values())
+    d.close()
+
+
+def test_nobody_found_falls_back_to_max_complexity():
+    d = detector({c: FakePose() for c in range(3)})
+    found, _ = d.tryDifferentComplexities(IMG)
+    assert not found and d.model_complexity == 2 and not d.lmList
+    d.close()
+
+
+def test_sequential_search_agrees():
+    models = {0: FakePose(), 1: FakePose(0.6), 2: FakePose(0.9)}
+    d = pm.poseDetector(capabilities=(pm.POSE,), headless=True)
+    d.pose_pool.factory = models.__getitem__
+    assert d.tryDifferentComplexities(IMG)[0] and d.model_complexity == 1
+    assert models[2].calls == 0
+
+
+def test_parallel_search_needs_one_model_per_complexity():
+    with pytest.raises(ValueError):
+        pm.poseDetector(capabilities=(pm.POSE,), parallel_search=True, max_models=2)
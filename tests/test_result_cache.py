@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+
+from ResultCache import ResultCache
+
+
+def image(value=0):
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+
+def test_key_depends_on_pixels_shape_and_config():
+    config = {"complexities": [0, 2]}
+    key = ResultCache.key(image(), config)
+    assert key == ResultCache.key(image(), dict(config))
+    assert key != ResultCache.key(image(1), config)
+    assert key != ResultCache.key(np.zeros((4, 16, 3), dtype=np.uint8), config)
+    assert key != ResultCache.key(image(), {"complexities": [0, 1]})
+
+
+def test_sections_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.key(image(), {})
+    assert cache.get(key, "pose") is None
+    cache.put(key, "pose", {"complexity": 1, "landmarks": np.ones((33, 4))})
+    cache.put(key, "faces", [])
+    assert cache.get(key, "pose")["complexity"] == 1
+    assert cache.get(key, "faces") == [] and cache.get(key, "hands") is None
+    assert len(cache) == 2
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    with open(cache.path("abc", "pose"), "wb") as file:
+        file.write(b"not a pickle")
+    assert cache.get("abc", "pose") is None
+
+
+def test_lru_eviction_below_low_water(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=50_000, low_water=0.5)
+    payload = np.zeros(10_000, dtype=np.uint8)
+    for i in range(4):
+        cache.put(f"k{i}", "pose", payload)
+        os.utime(cache.path(f"k{i}", "pose"), (i, i))  # Dates d'accès distinctes
+    cache.get("k0", "pose")  # k0 redevient le plus récent
+    for i in range(4, 6):
+        cache.put(f"k{i}", "pose", payload)
+    assert cache.size <= 50_000
+    assert cache.get("k0", "pose") is not None and cache.get("k1", "pose") is None
+    assert cache.estimated_bytes == cache.size
+
+
+def test_clear(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("k", "pose", 1)
+    cache.clear()
+    assert len(cache) == 0 and cache.estimated_bytes == 0
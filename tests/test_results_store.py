@@ -0,0 +1,52 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import ResultsStore
+from ResultsStore import ResultsReader, ResultsWriter
+
+
+def write(path, timestamps):
+    with ResultsWriter(str(path), angle_names=["left_elbow", "right_elbow"], batch_size=4) as writer:
+        for i, timestamp in enumerate(timestamps):
+            writer.append(timestamp, frame=i, angles=[i, -i])
+
+
+def test_range_reads(tmp_path):
+    path = tmp_path / "session.bin"
+    write(path, np.arange(10, dtype=float))
+    reader = ResultsReader(str(path))
+    assert len(reader) == 10
+    assert reader.range(2, 5)["frame"].tolist() == [2, 3, 4]
+    assert reader.range(None, 1)["frame"].tolist() == [0]
+    assert reader.range(8.5)["frame"].tolist() == [9]
+    assert len(reader.range(20, 30)) == 0
+    timestamps, values = reader.angle("right_elbow", 3, 5)
+    assert timestamps.tolist() == [3, 4] and values.tolist() == [-3, -4]
+
+
+def test_missing_values_are_nan(tmp_path):
+    path = tmp_path / "empty.bin"
+    with ResultsWriter(str(path), angle_names=["left_elbow"]) as writer:
+        writer.append(1.0)
+    row = ResultsReader(str(path)).records[0]
+    assert np.isnan(row["landmarks"]).all() and np.isnan(row["angles"]).all()
+
+
+def test_timestamps_must_increase(tmp_path):
+    with ResultsWriter(str(tmp_path / "order.bin"), angle_names=["left_elbow"]) as writer:
+        writer.append(2.0)
+        with pytest.raises(ValueError):
+            writer.append(1.0)
+
+
+def test_wall_clock_step_back_is_clamped(tmp_path, monkeypatch):
+    path = tmp_path / "live.bin"
+    clock = iter([100.0, 99.0, 101.0])
+    monkeypatch.setattr(ResultsStore, "time", SimpleNamespace(time=lambda: next(clock), monotonic=time.monotonic))
+    with ResultsWriter(str(path), angle_names=["left_elbow"]) as writer:
+        for _ in range(3):
+            writer.append()
+    assert ResultsReader(str(path)).records["timestamp"].tolist() == [100.0, 100.0, 101.0]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from RiskEngine import GREEN, NO_ZONE, ORANGE, RED, RiskEngine
+
+
+@pytest.mark.parametrize("angle, zone", [(100, GREEN), (80, GREEN), (60, ORANGE), (150, ORANGE),
+                                         (30, RED), (170, RED)])
+def test_classify_elbow(angle, zone):
+    engine = RiskEngine(["left_elbow"])
+    assert engine.classify([angle])[0] == zone
+
+
+def test_classify_unknown_and_nan():
+    engine = RiskEngine(["left_elbow", "head_tilt"])
+    zones = engine.classify([np.nan, 90])
+    assert zones.tolist() == [NO_ZONE, NO_ZONE]
+
+
+def test_classify_batch():
+    engine = RiskEngine(["left_elbow", "right_elbow"])
+    zones = engine.classify(np.array([[100, 30], [60, 100]]))
+    assert zones.tolist() == [[GREEN, RED], [ORANGE, GREEN]]
+
+
+def test_update_accumulates_exposure():
+    engine = RiskEngine(["left_elbow"])
+    for angle in (100, 30, 30, 100, 30):
+        engine.update([angle], dt=1.0)
+    summary = engine.summary()["left_elbow"]
+    assert summary["green_s"] == 2 and summary["red_s"] == 3
+    assert summary["red_episodes"] == 2 and summary["longest_red_s"] == 2
+
+
+def test_custom_thresholds_green_outside_orange():
+    # Plage verte hors de la plage orange : le vert reste vert, jamais de zone négative
+    engine = RiskEngine(["joint"], thresholds={"joint": (100, 140, 40, 120)})
+    assert engine.classify([[130], [110], [60], [20]]).ravel().tolist() == [GREEN, GREEN, ORANGE, RED]
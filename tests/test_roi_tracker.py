@@ -0,0 +1,60 @@
+import numpy as np
+
+from LandmarkArray import LandmarkArray
+from RoiTracker import RoiTracker, crop, padded_box, to_full_frame
+
+SHAPE = (480, 640, 3)
+
+
+def person(offset=0.0):
+    """Landmarks visibles groupés dans le quart central de l'image"""
+    values = np.zeros((33, 4), dtype=np.float32)
+    values[:, 0] = np.linspace(0.4, 0.6, 33) + offset
+    values[:, 1] = np.linspace(0.3, 0.7, 33)
+    values[:, 3] = 1.0
+    return LandmarkArray().fillArray(values, SHAPE)
+
+
+def test_padded_box_is_clamped_to_the_image():
+    box = padded_box(np.array([[0, 0], [100, 50]]), SHAPE, padding=0.5)
+    assert box[0] == 0 and box[1] == 0 and box[2] > 100 and box[3] > 50
+
+
+def test_to_full_frame_maps_box_coordinates():
+    points = np.array([[0.0, 0.0, 0.1], [1.0, 1.0, 0.0]], dtype=np.float32)
+    to_full_frame(points, (160, 120, 480, 360), SHAPE)
+    np.testing.assert_allclose(points[:, :2], [[0.25, 0.25], [0.75, 0.75]])
+    assert points[0, 2] == np.float32(0.1 * 0.5)
+
+
+def test_box_follows_the_person_and_stays_stable():
+    tracker = RoiTracker()
+    box = tracker.update(person(), SHAPE)
+    assert box is not None and box[0] < 256 and box[2] > 384
+    assert tracker.update(person(0.01), SHAPE) == box  # Léger mouvement : même région
+    assert tracker.update(person(0.3), SHAPE) != box
+    assert tracker.update(LandmarkArray(), SHAPE) is None
+
+
+def test_crop_pose_and_accounting():
+    tracker = RoiTracker()
+    img = np.zeros(SHAPE, dtype=np.uint8)
+    assert tracker.cropPose(img) == (img, None)
+    tracker.update(person(), SHAPE)
+    sub, box = tracker.cropPose(img)
+    assert sub.shape[:2] == (box[3] - box[1], box[2] - box[0]) and sub.flags.c_contiguous
+    # Frame traitée sur la région puis en plein cadre : comptée une seule fois
+    tracker.account(SHAPE, sub.shape[0] * sub.shape[1] + SHAPE[0] * SHAPE[1])
+    assert tracker.pixels_total == SHAPE[0] * SHAPE[1]
+    assert tracker.pixels_processed > tracker.pixels_total
+
+
+def test_wrist_boxes_only_for_visible_wrists():
+    landmarks = person()
+    landmarks.data[16, 3] = 0.0
+    boxes = RoiTracker().wristBoxes(landmarks, SHAPE)
+    assert list(boxes) == ["left"]
+    x0, y0, x1, y1 = boxes["left"]
+    cx, cy = landmarks.pixels[15]
+    assert x0 <= cx <= x1 and y0 <= cy <= y1
+    assert crop(np.zeros(SHAPE), boxes["left"]).shape[:2] == (y1 - y0, x1 - x0)
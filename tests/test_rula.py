@@ -0,0 +1,54 @@
+import numpy as np
+
+from Rula import ACTION_LEVELS, TABLE_A, TABLE_B, TABLE_C, RulaScorer
+
+
+def upright_pose():
+    """Pose neutre en pixels : tronc vertical, bras le long du corps, avant-bras fléchis à 90°"""
+    points = np.zeros((33, 2), dtype=np.float32)
+    points[[7, 8]] = (95, 40), (105, 40)             # Oreilles
+    points[[11, 12]] = (80, 100), (120, 100)         # Épaules
+    points[[23, 24]] = (85, 250), (115, 250)         # Hanches
+    points[[13, 14]] = (80, 180), (120, 180)         # Coudes
+    points[[15, 16]] = (0, 180), (200, 180)          # Poignets (avant-bras à 90°)
+    points[[19, 20]] = (-20, 180), (220, 180)        # Index dans l'axe de l'avant-bras
+    return points
+
+
+def test_table_shapes():
+    assert TABLE_A.shape == (6, 3, 4, 2)
+    assert TABLE_B.shape == (6, 6, 2)
+    assert TABLE_C.shape == (8, 7)
+    assert ACTION_LEVELS[1] == 1 and ACTION_LEVELS[7] == 4
+
+
+def test_table_lookups_match_official_values():
+    # Bras 1, avant-bras 1, poignet 1, rotation 1 -> 1 ; bras 6, avant-bras 3, poignet 4, rotation 2 -> 9
+    assert TABLE_A[0, 0, 0, 0] == 1 and TABLE_A[5, 2, 3, 1] == 9
+    assert TABLE_B[0, 0, 0] == 1 and TABLE_B[5, 5, 1] == 9
+    assert TABLE_C[0, 0] == 1 and TABLE_C[7, 6] == 7
+
+
+def test_neutral_pose_scores_low():
+    result = RulaScorer().score(upright_pose())
+    assert result["upper_arm"].tolist() == [1, 1]
+    assert result["lower_arm"].tolist() == [1, 1]
+    assert int(result["neck"]) == 1 and int(result["trunk"]) == 1
+    assert int(result["score"]) <= 2 and int(result["action_level"]) == 1
+
+
+def test_raised_arm_raises_score():
+    points = upright_pose()
+    # Bras gauche levé à 60° vers l'avant, avant-bras toujours à 90° du bras
+    points[13] = (80 - 69.3, 140)
+    points[15], points[19] = (80 - 69.3 - 40, 140 - 69.3), (80 - 69.3 - 50, 140 - 86.6)
+    scorer = RulaScorer()
+    assert scorer.score(points)["upper_arm"][0] == 3
+    assert scorer.score(points)["score"] > scorer.score(upright_pose())["score"]
+
+
+def test_session_scores_invalid_frames_as_zero():
+    session = np.stack([upright_pose() / (200, 300), np.full((33, 2), np.nan)])
+    result = RulaScorer().scoreSession(session, (300, 200))
+    assert result["score"][0] > 0 and result["score"][1] == 0
+    assert result["action_level"][1] == 0
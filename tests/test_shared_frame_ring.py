@@ -0,0 +1,83 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from SharedFrameRing import SharedFrameRing
+
+SHAPE = (4, 6, 3)
+
+
+def frame(value):
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(SHAPE, slots=3)
+    yield ring
+    ring.close()
+
+
+def test_write_then_read_without_copy(ring):
+    assert ring.read() is None and ring.lastSeq == 0
+    seq = ring.write(frame(7), timestamp=1.5)
+    with ring.read() as lease:
+        assert lease.seq == seq == 1 and lease.timestamp == 1.5
+        assert (lease.frame == 7).all() and not lease.frame.flags.writeable
+        assert np.shares_memory(lease.frame, ring.frames)
+        assert lease.valid()
+    assert not lease.valid()
+
+
+def test_oldest_frames_are_overwritten(ring):
+    for value in range(1, 6):
+        ring.write(frame(value))
+    assert ring.read(1) is None and ring.oldestSeq() == 3
+    with ring.read(3) as lease:
+        assert (lease.frame == 3).all()
+
+
+def test_leased_slot_is_kept_and_read_after_skips_gaps(ring):
+    ring.write(frame(1))
+    lease = ring.read(1)
+    for value in range(2, 7):
+        ring.write(frame(value))
+    # Frame 1 prêtée : toujours intacte ; les numéros disponibles ne sont plus contigus
+    assert lease.valid() and (lease.frame == 1).all()
+    with ring.readAfter(1) as after:
+        assert after.seq == 5
+    lease.release()
+    assert ring.readAfter(6) is None
+
+
+def test_reader_counts_dropped_frames(ring):
+    reader = ring.reader(reader_id=0)
+    ring.write(frame(1))
+    with reader.next(timeout=0.1) as lease:
+        assert lease.seq == 1
+    for value in range(2, 7):
+        ring.write(frame(value))
+    with reader.next(timeout=0.1) as lease:
+        assert lease.seq == 4
+    assert reader.dropped == 2 and ring.reader_positions[0] == 4
+    assert [reader.next(timeout=0.01).seq for _ in range(2)] == [5, 6]
+    assert reader.next(timeout=0.01) is None
+
+
+def _write_in_child(ring, value):
+    ring.write(np.full(ring.shape, value, dtype=np.uint8))
+
+
+def test_frames_are_shared_across_processes():
+    ctx = multiprocessing.get_context("spawn")
+    ring = SharedFrameRing(SHAPE, slots=2, cond=ctx.Condition())
+    try:
+        process = ctx.Process(target=_write_in_child, args=(ring, 42))
+        process.start()
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        with ring.read() as lease:
+            assert lease.seq == 1 and (lease.frame == 42).all()
+    finally:
+        ring.close()